@@ -0,0 +1,158 @@
+"""Measures the speedup of cleaning whole columns (data/column_cleaner.py) over cleaning element by element with .apply()/.applymap(),
+on a generated orders sheet of 50k rows and an index sets sheet of the same length. The sheets are cleaned without a schema (data/data_schema.py),
+such that every column of the orders sheet is cleaned.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_cleaning
+    python benchmarks/benchmark_cleaning.py
+
+Fails (exit code 1) if the cleaned sheets are not identical to the sheets that are cleaned element by element, or if the speedup is below the minimum.
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import measure, get_exit_code
+from data.column_cleaner import Column_Cleaner
+from general_configuration import description_order_df
+
+number_of_rows = 50_000
+minimum_speedup = 1.5 # Column-wise cleaning should be at least this many times faster than element-wise cleaning.
+
+
+### ELEMENT-WISE CLEANING, as done before the Column_Cleaner.
+def clean_orders_element(element):
+    # Data_Cleaner.clean_order_df
+    if element:
+        if pd.notna(element) and isinstance(element, str):
+            return element.upper()
+        return element
+    return element
+
+def clean_orders_element_or_none(element):
+    # OrderDataframe.clean
+    if element:
+        if pd.notna(element) and isinstance(element, str):
+            return element.upper()
+        elif pd.notna(element):
+            return element
+
+def clean_index_sets_element(element):
+    # Data_Cleaner.clean_index_sets_df and IndexSetsDataframe.clean
+    if element:
+        if pd.notna(element) and isinstance(element, str):
+            return element.upper()
+        elif pd.notna(element) and isinstance(element, pd.Timestamp):
+            return element
+        elif pd.notna(element) and isinstance(element, float):
+            return int(element)
+    else:
+        return element
+
+
+### GENERATED SHEETS
+def create_orders_sheet(rows: int) -> pd.DataFrame:
+    """Creates an orders sheet like it is read by pandas and filled with '', with the columns of the Orders_dataframe sheet.
+    """
+    generator = np.random.default_rng(0)
+    suborders = np.array(['mag', 'smd', 'smd2', 'mont', 'none'])
+    orders = generator.integers(10_000, 99_999, rows)
+    suborder = suborders[generator.integers(0, len(suborders), rows)]
+    dates = pd.Timestamp('2023-08-21') + pd.to_timedelta(generator.integers(0, 30, rows), unit='D')
+
+    on_line = pd.Series(np.where(generator.random(rows) < 0.5, 1.0, np.nan)).fillna('')
+    specific_line = pd.Series(np.where(generator.random(rows) < 0.2, 'line_a', None)).fillna('')
+
+    return pd.DataFrame({
+        'Unique_Code': [f'{order}_{sub}' for order, sub in zip(orders, suborder)],
+        'Order_number': orders,
+        'Sub_order': suborder,
+        'Description': [f'Order {order} WawMan' for order in orders],
+        'Revenue': generator.integers(0, 1000, rows),
+        'On_line': on_line,
+        'Production_line_specific_line': specific_line,
+        'Time_required': generator.integers(0, 10, rows),
+        'Time_completed': generator.integers(0, 2, rows),
+        'Time_to_complete': generator.integers(0, 10, rows),
+        'Time_hours_lowerbound': generator.integers(0, 10, rows),
+        'Time_hours_upperbound': generator.integers(0, 10, rows),
+        'Quantity_required': generator.integers(0, 100, rows),
+        'Quantity_completed': generator.integers(0, 100, rows),
+        'Quantity_to_complete': generator.integers(0, 100, rows),
+        'Date_start': dates,
+        'Date_deadline': dates + pd.Timedelta('7D'),
+        'Previous_sub_order': np.roll(suborder, 1),
+        'Next_sub_order': np.roll(suborder, -1),
+        'Percentage_prev_sub_order_needed_before_next_sub_order': generator.integers(0, 2, rows),
+        'Manual_urgency': generator.integers(0, 2, rows)
+    }).set_index('Unique_Code')
+
+def create_index_sets_sheet(rows: int) -> pd.DataFrame:
+    """Creates an index sets sheet like it is read by pandas and filled with '', the columns have different lengths.
+    """
+    generator = np.random.default_rng(1)
+    def padded(values: list) -> pd.Series:
+        return pd.Series(values + [np.nan] * (rows - len(values)))
+
+    return pd.DataFrame({
+        'Orders_suborders': padded([f'{order}_mag' for order in range(rows)]),
+        'Orders': padded(list(generator.integers(10_000, 99_999, rows // 2).astype(float))),
+        'Sub_orders': padded(['none', 'mag', 'smd', 'smd2', 'mont']),
+        'Time_intervals': padded(list(pd.date_range('2023-08-21 08:00', periods=rows // 4, freq='H'))),
+        'Employee_line': padded([f'pers{number}' for number in range(100)]),
+        'Employees': padded([f'pers{number}' for number in range(90)]),
+        'Production_lines': padded([f'line_{number}' for number in range(10)])
+    }).fillna('')
+
+
+### MEASUREMENTS
+def identical(frame: pd.DataFrame, other: pd.DataFrame) -> bool:
+    return frame.equals(other) and frame.dtypes.equals(other.dtypes)
+
+def clean_columns(frame: pd.DataFrame, clean_column) -> pd.DataFrame:
+    frame = frame.copy()
+    for column in frame.columns.drop(description_order_df):
+        frame[column] = clean_column(frame[column])
+    return frame
+
+
+def main() -> int:
+    orders = create_orders_sheet(number_of_rows)
+    index_sets = create_index_sets_sheet(number_of_rows)
+
+    cases = {
+        'orders (Data_Cleaner)': (
+            lambda: clean_columns(orders, lambda column: column.apply(clean_orders_element)),
+            lambda: clean_columns(orders, Column_Cleaner.uppercase_strings)
+        ),
+        'orders (OrderDataframe)': (
+            lambda: clean_columns(orders, lambda column: column.apply(clean_orders_element_or_none)),
+            lambda: clean_columns(orders, Column_Cleaner.clean_orders_column)
+        ),
+        'index sets': (
+            lambda: index_sets.applymap(clean_index_sets_element),
+            lambda: Column_Cleaner.clean_index_sets_dataframe(index_sets)
+        )
+    }
+
+    checks = {}
+    for name, (clean_elements, clean_columns_at_once) in cases.items():
+        expected, duration_elements = measure(clean_elements)
+        result, duration_columns = measure(clean_columns_at_once)
+
+        speedup = duration_elements / duration_columns
+        is_identical = identical(expected, result)
+        checks[f'{name} identical'] = is_identical
+        checks[f'{name} speedup'] = speedup >= minimum_speedup
+
+        print(f'Cleaning {name}, {number_of_rows} rows: element-wise {duration_elements:.3f}s, column-wise {duration_columns:.3f}s, speedup {speedup:.1f}x, identical: {is_identical}')
+
+    return get_exit_code(**checks)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
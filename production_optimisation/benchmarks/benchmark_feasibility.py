@@ -0,0 +1,86 @@
+"""Measures finding the feasible allocations (order_suborder, time, employee_line) with the bitsets of the Data_Feasibility (data/data_feasibility.py)
+against checking every allocation on its own, like the rules of the model check the availability, skills and lines per index.
+The availability, skills and orders are generated: 200 order_suborders, 240 time intervals and 48 employee_lines (of which 8 lines).
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_feasibility
+    python benchmarks/benchmark_feasibility.py
+
+Fails (exit code 1) if the feasible allocations or the capacities differ, or if the speedup is below the minimum.
+"""
+import os
+import sys
+import numpy as np
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import measure, get_exit_code
+from data.data_feasibility import Data_Feasibility
+
+number_of_order_suborders = 200
+number_of_times = 240
+number_of_employee_lines = 48
+number_of_lines = 8
+number_of_suborders = 5
+minimum_speedup = 100 # Finding the feasible allocations with bitsets should be at least this many times faster than one by one.
+
+
+def create_data(seed: int = 0) -> dict:
+    random = np.random.default_rng(seed)
+    is_line = np.arange(number_of_employee_lines) >= number_of_employee_lines - number_of_lines
+    has_specific_line = random.random(number_of_order_suborders) < 0.2
+    return dict(
+        availability_array=(random.random((number_of_times, number_of_employee_lines)) < 0.7).astype(float),
+        skills_array=(random.random((number_of_employee_lines, number_of_suborders)) < 0.5).astype(float),
+        suborder_code_array=random.integers(0, number_of_suborders, number_of_order_suborders),
+        exec_on_line_array=random.random(number_of_order_suborders) < 0.3,
+        is_line_array=is_line,
+        is_employee_array=~is_line,
+        has_specific_line_array=has_specific_line,
+        specific_line_code_array=np.where(has_specific_line, random.choice(np.flatnonzero(is_line), number_of_order_suborders), -1)
+        )
+
+
+def find_feasible_one_by_one(data: dict) -> np.ndarray:
+    # As the rules of the model do: availability, skills, lines, employees and specific lines are checked per allocation.
+    feasible = np.zeros((number_of_order_suborders, number_of_times, number_of_employee_lines), dtype=bool)
+    for i in range(number_of_order_suborders):
+        on_line = data['exec_on_line_array'][i]
+        suborder = data['suborder_code_array'][i]
+        for j in range(number_of_times):
+            for k in range(number_of_employee_lines):
+                if data['availability_array'][j, k] == 0 or data['skills_array'][k, suborder] == 0:
+                    continue
+                if (on_line and data['is_employee_array'][k]) or (not on_line and data['is_line_array'][k]):
+                    continue
+                if data['has_specific_line_array'][i] and data['specific_line_code_array'][i] != k:
+                    continue
+                feasible[i, j, k] = True
+    return feasible
+
+
+def main() -> int:
+    data = create_data()
+
+    expected, duration_one_by_one = measure(lambda: find_feasible_one_by_one(data))
+    feasibility, duration_bitsets = measure(lambda: Data_Feasibility(**data))
+    feasible_bits, duration_and = measure(feasibility.get_feasible_bits)
+    duration_bitsets += duration_and
+
+    identical = np.array_equal(feasibility.unpack(feasible_bits), expected)
+    identical_capacities = (
+        np.array_equal(feasibility.get_capacity_per_order_suborder(), expected.sum(axis=(1, 2)))
+        and np.array_equal(feasibility.get_capacity_per_suborder(), data['availability_array'].dot(data['skills_array']).sum(axis=0))
+        )
+    speedup = duration_one_by_one / duration_bitsets
+
+    print(f'Feasible allocations of {expected.size} (order_suborder, time, employee_line) combinations: one by one {duration_one_by_one:.2f}s, '
+          f'bitsets {duration_bitsets:.4f}s, speedup {speedup:.0f}x, mask {expected.nbytes / 2**10:.0f} KiB vs bitset {feasible_bits.nbytes / 2**10:.0f} KiB, '
+          f'identical: {identical}, capacities identical: {identical_capacities}')
+
+    return get_exit_code(identical=identical, identical_capacities=identical_capacities, speedup=speedup >= minimum_speedup)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
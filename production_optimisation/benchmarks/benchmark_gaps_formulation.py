@@ -0,0 +1,134 @@
+"""Measures the size and build time of the EWOptimisation model (problem_declaration/models.py) with each gaps formulation: 'sum', which sums the allocations
+before and after a time again for every time, 'cumulative', which counts them from a running total per (order_suborder, time), and 'start_end', which ties
+the before and after variables to the allocations with per-period start and end indicators instead of big-M rules, such that only the allocations are binary.
+The instances are generated (see benchmarks/model_instance.py): 3 orders of 4 suborders on horizons of one, two and four weeks (5, 10 and 20 working days),
+with sparse allocation and three random instances (seeds) per horizon.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_gaps_formulation
+    python benchmarks/benchmark_gaps_formulation.py
+
+Fails (exit code 1) if the formulations give a different objective value or violate different constraints for the same allocations,
+or if the number of nonzeros of the cumulative or start_end formulation grows faster than linear with the horizon,
+or if the start_end formulation has binary variables besides the allocations.
+
+The bound of the LP relaxation (the integer variables relaxed to their bounds) of every formulation is reported for every instance, and the optimal objective value
+and solve time on the shortest horizon. This needs an LP/MIP solver (HiGHS, CBC or GLPK), without one the bounds are skipped. Fails if a bound is above the optimal
+objective value, if the bounds of 'sum' and 'cumulative' differ (they only differ in how the allocations before and after a time are counted), or if the bound of
+'start_end' is below that of 'sum'. The optimal objective value of 'start_end' can be higher than that of the other formulations: they do not have gaps_gaps2,
+so their indicator of the allocations can be 1 without an allocation, which hides the gaps.
+"""
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyo
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import create_instance, get_model_size, set_allocation, get_violated_constraints, measure, build_model, get_exit_code
+
+number_of_orders = 3
+horizons = [5, 10, 20] # Days
+seeds = [0, 1, 2] # Random instances per horizon, the sizes are measured and the formulations are compared on the first one.
+formulations = ['sum', 'cumulative', 'start_end']
+number_of_allocations_checked = 10 # Random allocations on which the formulations are compared, on the shortest horizon.
+maximum_growth = 1.5 # The nonzeros of the cumulative and start_end formulations may grow at most this many times faster than the horizon.
+
+solvers = ['appsi_highs', 'highs', 'cbc', 'glpk'] # The first available solver computes the bounds of the LP relaxation and the optimal objective values.
+solver_time_limit = 60 # Seconds per solve.
+
+# The rules of the gaps (and the running totals), which hold for the values of the gaps variables that follow from the allocations.
+gaps_constraints = ['gaps_', 'constr_cumulativeAlloc']
+
+
+def get_solver():
+    """Returns the first available solver, None if no solver is available.
+    """
+    for name in solvers:
+        solver = pyo.SolverFactory(name)
+        if solver.available(exception_flag=False):
+            solver.options['time_limit' if 'highs' in name else 'sec' if name == 'cbc' else 'tmlim'] = solver_time_limit
+            return solver
+    return None
+
+def solve(model, solver, relax: bool) -> float:
+    """Returns the optimal objective value of (a copy of) the model, or of its LP relaxation if relax is True. None if no optimal solution is found.
+    """
+    instance = model.m.clone()
+    if relax:
+        pyo.TransformationFactory('core.relax_integer_vars').apply_to(instance)
+    results = solver.solve(instance, load_solutions=False)
+    if results.solver.termination_condition != pyo.TerminationCondition.optimal:
+        return None
+    instance.solutions.load_from(results)
+    return pyo.value(instance.objectiveFunction)
+
+def compare_formulations(models: dict, seed: int = 0) -> bool:
+    """Sets the models to the same random allocations, and compares their objective value and violated constraints. The gaps rules should never be violated,
+    since the variables of the gaps are set to the values that follow from the allocations.
+    """
+    random = np.random.default_rng(seed)
+    allocation_index = list(models[formulations[0]].m.set_alloc_index)
+    for check in range(number_of_allocations_checked):
+        allocations = {index for index in allocation_index if random.random() < (0.03 if check % 2 else 0.2)}
+        results = []
+        for model in models.values():
+            set_allocation(model, allocations)
+            violated = get_violated_constraints(model)
+            gaps_violated = [name for name in violated if name.startswith(tuple(gaps_constraints))]
+            other_violated = {name: indexes for name, indexes in violated.items() if name not in gaps_violated}
+            results.append((round(model.m.objectiveFunction(), 6), gaps_violated, other_violated))
+        if any(result[0] != results[0][0] or result[1] or result[2] != results[0][2] for result in results):
+            return False
+    return True
+
+
+def main() -> int:
+    solver = get_solver()
+    if solver is None:
+        print(f'No solver available ({", ".join(solvers)}), the bounds of the LP relaxation are skipped.')
+    sizes = {formulation: [] for formulation in formulations}
+    identical = True
+    only_allocation_binaries = True
+    valid_bounds = True
+    tighter_bounds = True
+    for days in horizons:
+        for seed in seeds:
+            dataframes = create_instance(number_of_orders, days, seed=seed)
+            models = {}
+            for formulation in formulations:
+                models[formulation], duration = build_model(dataframes, sparse_allocation=True, time_window_slack=None, gaps_formulation=formulation)
+                if seed == seeds[0]:
+                    size = get_model_size(models[formulation])
+                    sizes[formulation].append(size['nonzeros'])
+                    if formulation == 'start_end':
+                        only_allocation_binaries &= size['binaries'] == len(models[formulation].m.var_alloc)
+                    print(f'{days} days ({len(models[formulation].list_time)} time intervals), {formulation}: {size["variables"]} variables ({size["binaries"]} binary), {size["constraints"]} constraints, '
+                          f'{size["nonzeros"]} nonzeros, build {duration:.2f}s')
+            if solver is not None:
+                bounds = {formulation: solve(model, solver, relax=True) for formulation, model in models.items()}
+                optima = {formulation: measure(lambda: solve(model, solver, relax=False)) for formulation, model in models.items()} if days == horizons[0] else {}
+                for formulation in formulations:
+                    bound = f'{bounds[formulation]:.1f}' if bounds[formulation] is not None else 'not found'
+                    optimum, duration = optima.get(formulation, (None, None))
+                    optimum = f', optimal objective value {optimum:.1f} in {duration:.1f}s' if optimum is not None else f', no optimum within {solver_time_limit}s' if days == horizons[0] else ''
+                    print(f'{days} days, seed {seed}, {formulation}: bound of the LP relaxation {bound}{optimum}')
+                valid_bounds &= None not in bounds.values() and abs(bounds['sum'] - bounds['cumulative']) <= 1e-4 * max(1, abs(bounds['sum']))
+                valid_bounds &= all(bounds[formulation] <= optimum + 1e-4 * max(1, abs(optimum)) for formulation, (optimum, _) in optima.items() if optimum is not None and bounds[formulation] is not None)
+                tighter_bounds &= None not in bounds.values() and bounds['start_end'] >= bounds['sum'] - 1e-4 * max(1, abs(bounds['sum']))
+            if days == horizons[0] and seed == seeds[0]:
+                identical = compare_formulations(models)
+
+    growth_horizon = horizons[-1] / horizons[0]
+    growth = {formulation: nonzeros[-1] / nonzeros[0] for formulation, nonzeros in sizes.items()}
+    print(f'Growth of the nonzeros from {horizons[0]} to {horizons[-1]} days ({growth_horizon:.0f}x the horizon): '
+          + ', '.join(f'{formulation} {growth[formulation]:.1f}x' for formulation in formulations)
+          + f', same objective value and violated constraints: {identical}, start_end only has binary allocation variables: {only_allocation_binaries}')
+
+    is_linear = all(growth[formulation] <= maximum_growth * growth_horizon for formulation in ['cumulative', 'start_end'])
+    return get_exit_code(identical=identical, only_allocation_binaries=only_allocation_binaries, is_linear=is_linear, valid_bounds=valid_bounds, tighter_bounds=tighter_bounds)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Measures building an indicator at once (data/data_indicator.py) against building it row by row with .loc, like Data_Builder.build_indicator did,
+for the On_line and Manual_urgency columns of a generated orders sheet of 20k rows. The columns are filled like the orders_df, so missing values are 2.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_indicator
+    python benchmarks/benchmark_indicator.py
+
+Fails (exit code 1) if an indicator differs from the one that is built row by row, or if the speedup is below the minimum.
+"""
+import os
+import sys
+import pandas as pd
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_cleaning import create_orders_sheet
+from benchmarks.model_instance import measure, get_exit_code
+from data.data_indicator import Data_Indicator
+
+number_of_rows = 20_000
+minimum_speedup = 100 # Building an indicator at once should be at least this many times faster than row by row.
+indicator_columns = ['On_line', 'Manual_urgency']
+
+
+def build_rows(view: pd.DataFrame) -> pd.DataFrame:
+    # As done before the Data_Indicator, on a copy of the column.
+    new_pandas_dataframe = view.copy()
+    for idx in new_pandas_dataframe.index:
+        if new_pandas_dataframe.loc[idx].iloc[0] == 1 or new_pandas_dataframe.loc[idx].iloc[0] == True:
+            new_pandas_dataframe.loc[idx] = True
+        else:
+            new_pandas_dataframe.loc[idx] = False
+    return new_pandas_dataframe.astype(bool)
+
+
+def main() -> int:
+    orders = create_orders_sheet(number_of_rows)
+    orders = orders[~orders.index.duplicated()].replace('', None).fillna(2)
+
+    checks = {}
+    for column in indicator_columns:
+        view = orders[[column]]
+        expected, duration_rows = measure(lambda: build_rows(view))
+        result, duration_column = measure(lambda: Data_Indicator.calc_indicator_dataframe(view))
+
+        speedup = duration_rows / duration_column
+        identical = result.equals(expected)
+        checks[f'{column} identical'] = identical
+        checks[f'{column} speedup'] = speedup >= minimum_speedup
+
+        print(f'Indicator of {column}, {len(orders)} rows: row by row {duration_rows:.3f}s, at once {duration_column:.5f}s, speedup {speedup:.0f}x, identical: {identical}')
+
+    return get_exit_code(**checks)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Measures the memory of the dataframes that are built from the columns of the orders_df (dfs_to_build_columnBased), on a generated orders sheet of 50k rows.
+Before the Data_Columns store (data/data_columns.py) every built dataframe started as a filled copy of the whole orders_df, of which all but its columns were dropped.
+Now every built dataframe is a view on the columns of the orders_df, so the orders are held once.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_order_views
+    python benchmarks/benchmark_order_views.py
+
+Fails (exit code 1) if the views are not identical to the copies, if a view does not share its columns with the orders_df,
+or if building the views allocates more than the maximum share of the memory of the copies.
+"""
+import os
+import sys
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.benchmark_cleaning import create_orders_sheet
+from benchmarks.model_instance import get_exit_code
+from data.data_columns import Data_Columns
+
+number_of_rows = 50_000
+maximum_memory_share = 0.05 # The views should allocate at most this share of the memory that the copies allocate.
+
+columns_per_dataframe = { # Like Data_Builder.build_new_df_column_based is called for each of the dfs_to_build_columnBased.
+    'time_req_df': ['Time_hours_lowerbound', 'Time_hours_upperbound'],
+    'specific_line_df': ['Production_line_specific_line'],
+    'dates_df': ['Date_start', 'Date_deadline'],
+    'next_prev_suborder_df': ['Previous_sub_order', 'Next_sub_order'],
+    'revenue_df': ['Revenue'],
+    'order_specific_df': ['Order_number', 'Sub_order'],
+    'percentage_df': ['Percentage_prev_sub_order_needed_before_next_sub_order']
+}
+
+
+### BUILDING THE DATAFRAMES
+def build_copies(orders: pd.DataFrame) -> dict:
+    # As done before the Data_Columns store: a filled copy of the orders_df (create_copy_for_new_dataframe), without the other columns.
+    built_dataframes = {}
+    for name, keep_cols in columns_per_dataframe.items():
+        copy_orders = orders.fillna(2)
+        drop_cols = [col for col in copy_orders.columns if col not in keep_cols]
+        built_dataframes[name] = copy_orders.drop(columns=drop_cols).fillna(2)
+    return built_dataframes
+
+def build_views(orders: pd.DataFrame) -> dict:
+    data_columns = Data_Columns(orders)
+    return {
+        name: data_columns.get_view([col for col in orders.columns if col in keep_cols])
+        for name, keep_cols in columns_per_dataframe.items()
+        }
+
+
+### MEASUREMENTS
+def measure_memory(function) -> tuple:
+    # Peak of the memory that is allocated while building, in bytes.
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+def shares_columns(view: pd.DataFrame, orders: pd.DataFrame) -> bool:
+    return all(np.shares_memory(view[col].to_numpy(), orders[col].to_numpy()) for col in view.columns)
+
+
+def main() -> int:
+    orders = create_orders_sheet(number_of_rows)
+
+    copies, memory_copies = measure_memory(lambda: build_copies(orders))
+    views, memory_views = measure_memory(lambda: build_views(orders))
+
+    identical = all(views[name].equals(copies[name]) and views[name].dtypes.equals(copies[name].dtypes) for name in columns_per_dataframe)
+    shared = all(shares_columns(view, orders) for view in views.values())
+    memory_share = memory_views / memory_copies
+
+    print(f'Building {len(columns_per_dataframe)} dataframes from an orders_df of {number_of_rows} rows ({orders.memory_usage(deep=True).sum() / 2**20:.1f} MiB): '
+          f'copies {memory_copies / 2**20:.1f} MiB, views {memory_views / 2**20:.3f} MiB ({memory_share:.2%}, maximum: {maximum_memory_share:.0%}), '
+          f'identical: {identical}, columns shared with the orders_df: {shared}')
+
+    return get_exit_code(identical=identical, shared=shared, memory_share=memory_share <= maximum_memory_share)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
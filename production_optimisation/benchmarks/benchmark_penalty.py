@@ -0,0 +1,117 @@
+"""Measures building the penalty matrix at once (data/data_penalty.py) against building it cell by cell with Data_Builder.calc_penalty,
+for a generated horizon of 2,000 hours and 2,000 order_suborders. Building all 4 million cells one by one takes minutes, so the cell by cell time
+is measured on a sample of cells and extrapolated to the whole matrix.
+
+It also measures a re-plan with the penalty cache (Penalty_Column_Cache): after the first build, a handful of orders are added or changed and a day
+of time intervals is appended, so only those columns and rows are calculated again.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_penalty
+    python benchmarks/benchmark_penalty.py
+
+Fails (exit code 1) if a sampled cell differs from calc_penalty, if the re-plan with the cache differs from building it without the cache,
+or if building the whole matrix takes longer than the budget.
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import measure, get_exit_code
+from data.data_builder import Data_Builder
+from data.data_penalty import Data_Penalty, Penalty_Column_Cache
+
+number_of_hours = 2_000
+number_of_orders = 2_000
+number_of_sampled_cells = 2_000
+number_of_changed_orders = 10 # Orders that are added or changed in the re-plan.
+number_of_appended_hours = 24 # Time intervals that are appended in the re-plan.
+matrix_budget = 5.0 # Seconds, for building the whole penalty matrix.
+
+
+### GENERATED ORDERS
+def create_orders(rows: int) -> tuple:
+    """Creates the dates_df, revenue_df and time_req_df of generated orders, like they are built from the orders_df.
+    """
+    generator = np.random.default_rng(0)
+    index = pd.Index([f'{order}_MAG' for order in range(rows)], name='Unique_Code')
+
+    date_start = pd.Timestamp('2023-08-21') + pd.to_timedelta(generator.integers(0, 120 * 24, rows), unit='H')
+    date_deadline = date_start + pd.to_timedelta(generator.integers(24, 60 * 24, rows), unit='H')
+
+    dates_df = pd.DataFrame({'Date_start': date_start, 'Date_deadline': date_deadline}, index=index)
+    revenue_df = pd.DataFrame({'Revenue': generator.integers(1, 100_000, rows).astype('float64')}, index=index)
+    time_req_df = pd.DataFrame({'Time_hours_lowerbound': np.ones(rows), 'Time_hours_upperbound': np.ones(rows)}, index=index)
+    return dates_df, revenue_df, time_req_df
+
+
+def build_penalty_df(time_index, dates_df: pd.DataFrame, revenue_df: pd.DataFrame, penalty_cache: Penalty_Column_Cache = None) -> pd.DataFrame:
+    return Data_Penalty.calc_penalty_dataframe(
+        time_index=time_index,
+        order_suborder_index=dates_df.index,
+        date_start=dates_df.iloc[:, 0],
+        date_deadline=dates_df.iloc[:, 1],
+        revenue=revenue_df.iloc[:, 0],
+        penalty_cache=penalty_cache
+        )
+
+def measure_replan(time_index, dates_df: pd.DataFrame, revenue_df: pd.DataFrame) -> bool:
+    """Builds the penalty matrix with a filled cache after changing a few orders and appending time intervals, and compares it with building it without the cache.
+    """
+    penalty_cache = Penalty_Column_Cache()
+    build_penalty_df(time_index, dates_df, revenue_df, penalty_cache)
+
+    # Half of the changed orders are new, the other half get a new revenue.
+    new_dates_df, new_revenue_df, _ = create_orders(number_of_changed_orders // 2)
+    new_dates_df.index = new_revenue_df.index = 'NEW_' + new_dates_df.index
+    replan_dates_df = pd.concat([dates_df, new_dates_df])
+    replan_revenue_df = pd.concat([revenue_df, new_revenue_df])
+    replan_revenue_df.iloc[:number_of_changed_orders // 2, 0] += 1
+    replan_time_index = time_index.append(pd.date_range(time_index[-1] + pd.Timedelta('1H'), periods=number_of_appended_hours, freq='H'))
+
+    cached_df, duration_cached = measure(lambda: build_penalty_df(replan_time_index, replan_dates_df, replan_revenue_df, penalty_cache))
+    uncached_df, duration_uncached = measure(lambda: build_penalty_df(replan_time_index, replan_dates_df, replan_revenue_df))
+
+    identical = cached_df.equals(uncached_df)
+    print(f'Re-plan with {number_of_changed_orders} new or changed orders and {number_of_appended_hours} appended hours: without cache {duration_uncached:.3f}s, '
+          f'with cache {duration_cached:.3f}s ({penalty_cache.calculated_columns} columns and {penalty_cache.calculated_rows} rows calculated), identical: {identical}')
+    return identical
+
+
+def main() -> int:
+    time_index = pd.date_range('2023-08-21 08:00', periods=number_of_hours, freq='H')
+    dates_df, revenue_df, time_req_df = create_orders(number_of_orders)
+
+    # The whole matrix at once.
+    penalty_df, duration_matrix = measure(lambda: build_penalty_df(time_index, dates_df, revenue_df))
+
+    # A sample of cells one by one, written into the dataframe like Data_Builder.build_penalty_df did.
+    generator = np.random.default_rng(1)
+    sampled_times = time_index[generator.integers(0, number_of_hours, number_of_sampled_cells)]
+    sampled_orders = dates_df.index[generator.integers(0, number_of_orders, number_of_sampled_cells)]
+    sampled_df = pd.DataFrame(index=time_index, columns=dates_df.index)
+
+    def calc_sampled_cells():
+        for ti, order in zip(sampled_times, sampled_orders):
+            sampled_df.loc[ti, order] = Data_Builder.calc_penalty(ti=ti, order=order, dates_df=dates_df, revenue_df=revenue_df, time_req_df=time_req_df)
+    _, duration_sampled_cells = measure(calc_sampled_cells)
+    duration_cells = duration_sampled_cells / number_of_sampled_cells * number_of_hours * number_of_orders
+
+    identical = all(
+        penalty_df.at[ti, order] == sampled_df.at[ti, order]
+        for ti, order in zip(sampled_times, sampled_orders)
+        )
+
+    print(f'Penalty matrix of {number_of_hours} hours x {number_of_orders} order_suborders: at once {duration_matrix:.3f}s (budget: {matrix_budget:.3f}s), '
+          f'cell by cell {duration_cells:.0f}s (extrapolated from {number_of_sampled_cells} cells), speedup {duration_cells / duration_matrix:.0f}x, identical: {identical}')
+
+    identical_replan = measure_replan(time_index, dates_df, revenue_df)
+
+    return get_exit_code(identical=identical, identical_replan=identical_replan, matrix_budget=duration_matrix <= matrix_budget)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Measures the speedup of looking up the previous order_suborder in the precedence graph (data/data_routing.py), which is built once, over walking back through
+the suborders of the order for every lookup, as the precedence rules of the model did for every (order_suborder, time). The routings are generated and long:
+2000 orders that go through a random part of 40 suborders, looked up for 45 time intervals.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_routing
+    python benchmarks/benchmark_routing.py
+
+Fails (exit code 1) if the previous order_suborder, percentage or lowerbound of the required hours of the previous order_suborder differ from the walk back,
+or if the speedup is below the minimum.
+"""
+import os
+import sys
+import numpy as np
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import measure, get_exit_code
+from data.data_routing import Data_Routing
+
+number_of_orders = 2000
+number_of_suborders = 40
+number_of_times = 45 # The precedence rules look up the previous order_suborder for every time.
+minimum_speedup = 2 # Building the precedence graph and looking up the arrays should be at least this many times faster than walking back for every lookup.
+
+
+### WALK BACK, as done before the Data_Routing.
+def get_previous_suborder(code_i, order_code_array, suborder_code_array, percentage_array, time_req_lb_array, order_suborder_code_array):
+    order_code = order_code_array[code_i]
+    prev_suborder_index = int(suborder_code_array[code_i]) - 1
+    while prev_suborder_index > 0:
+        prev_order_suborder_code = order_suborder_code_array[order_code, prev_suborder_index]
+        if prev_order_suborder_code != -1:
+            return prev_order_suborder_code, percentage_array[code_i], time_req_lb_array[prev_order_suborder_code]
+        prev_suborder_index -= 1
+    return None
+
+
+def create_routings(seed: int = 0) -> tuple:
+    """Creates the order and suborder code of every order_suborder, where every order goes through about a third of the suborders (except the first one).
+    """
+    random = np.random.default_rng(seed)
+    is_present = random.random((number_of_orders, number_of_suborders)) < 0.3
+    is_present[:, 0] = False
+    order_code_array, suborder_code_array = np.nonzero(is_present)
+    percentage_array = random.random(len(order_code_array))
+    time_req_lb_array = random.integers(0, 10, len(order_code_array)).astype('float64')
+    return order_code_array, suborder_code_array, percentage_array, time_req_lb_array
+
+
+def main() -> int:
+    order_code_array, suborder_code_array, percentage_array, time_req_lb_array = create_routings()
+    number_of_order_suborders = len(order_code_array)
+
+    def look_up_graph():
+        routing = Data_Routing(order_code_array, suborder_code_array, percentage_array, time_req_lb_array, number_of_orders, number_of_suborders)
+        graph = [
+            (routing.previous_code_array[code_i], routing.percentage_array[code_i], routing.previous_time_req_lb_array[code_i]) if routing.has_previous_array[code_i] else None
+            for code_i in range(number_of_order_suborders) for _ in range(number_of_times)
+            ]
+        return routing, graph
+    (routing, graph), duration_graph = measure(look_up_graph)
+
+    walk_back, duration_walk_back = measure(lambda: [
+        get_previous_suborder(code_i, order_code_array, suborder_code_array, percentage_array, time_req_lb_array, routing.order_suborder_code_array)
+        for code_i in range(number_of_order_suborders) for _ in range(number_of_times)
+        ])
+
+    identical = graph == walk_back
+    speedup = duration_walk_back / duration_graph
+    print(f'{number_of_order_suborders} order_suborders over {number_of_suborders} suborders, {number_of_times} lookups each: '
+          f'walk back {duration_walk_back:.2f}s, precedence graph {duration_graph:.2f}s, speedup {speedup:.1f}x, identical: {identical}')
+
+    return get_exit_code(identical=identical, speedup=speedup >= minimum_speedup)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Measures building the EWOptimisation model (problem_declaration/models.py) with sparse allocation, that is with allocation variables only for the
+feasible (order_suborder, time, employee_line) combinations, against building it with a variable for every combination.
+The instance is generated (see benchmarks/model_instance.py): 6 orders of 4 suborders, 3 days of 9 hours, 8 employees and 4 lines.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_sparse_allocation
+    python benchmarks/benchmark_sparse_allocation.py
+
+Fails (exit code 1) if the sparse model leaves out an allocation that the dense model does not restrict to zero (or keeps one that it does),
+or if the number of allocation variables is not reduced by at least the minimum factor.
+"""
+import os
+import sys
+import pyomo.environ as pyo
+from pyomo.core.expr.visitor import identify_variables
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import create_instance, build_model, get_exit_code
+from problem_declaration.models import EWOptimisation
+
+number_of_orders = 6
+number_of_days = 3
+minimum_reduction = 3 # The sparse model should have at least this many times fewer allocation variables than the dense model.
+
+# The rules of the dense model that restrict the allocations that are not feasible to zero.
+restricting_constraints = [
+    'constr_onlyAllocIfEmpl_lineSkilled', 'constr_onlyAllocIfEmpl_lineAvailable', 'constr_lineOrdersOnLine', 'constr_ordersOnSpecificLine', 'constr_manualOrdersForEmployee'
+    ]
+
+
+def get_restricted_allocations(model: EWOptimisation) -> set:
+    """Gets the allocations that the dense model restricts to zero.
+    """
+    restricted = set()
+    for name in restricting_constraints:
+        for constraint in getattr(model.m, name).values():
+            if constraint.has_ub() and pyo.value(constraint.upper) == 0:
+                restricted.update(variable.index() for variable in identify_variables(constraint.body))
+    return restricted
+
+
+def main() -> int:
+    dataframes = create_instance(number_of_orders, number_of_days)
+
+    dense, duration_dense = build_model(dataframes, sparse_allocation=False)
+    sparse, duration_sparse = build_model(dataframes, sparse_allocation=True)
+    speedup = duration_dense / duration_sparse
+    reduction = len(dense.m.var_alloc) / len(sparse.m.var_alloc)
+
+    left_out = set(dense.m.set_alloc_index) - set(sparse.m.set_alloc_index)
+    restricted = get_restricted_allocations(dense) - set(sparse.m.set_infeasible_alloc_index)
+    identical = left_out == restricted
+
+    print(f'Allocation variables: dense {len(dense.m.var_alloc)}, sparse {len(sparse.m.var_alloc)} ({sparse.allocation_index.density:.0%}), '
+          f'left out allocations are the ones restricted to zero: {identical}')
+    print(f'Model: dense {dense.m.nvariables()} variables and {dense.m.nconstraints()} constraints in {duration_dense:.2f}s, '
+          f'sparse {sparse.m.nvariables()} variables and {sparse.m.nconstraints()} constraints in {duration_sparse:.2f}s, speedup {speedup:.1f}x')
+
+    return get_exit_code(identical=identical, reduction=reduction >= minimum_reduction)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
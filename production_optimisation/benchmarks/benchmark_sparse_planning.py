@@ -0,0 +1,85 @@
+"""Measures combining the old and manual planning with the Sparse_Planning (data/data_sparse_planning.py) against combining them with pandas,
+like CombinedPlanningDataframe.build did: filtering the old planning on the old_planning_limit after a reset_index, pd.concat and drop_duplicates on the index columns.
+The plannings are generated: an old planning of 200k allocations and a manual planning of 50k allocations, of which half are also in the old planning.
+The sums per (empl_line, time) of the solvability checks are measured as well, against groupby.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_sparse_planning
+    python benchmarks/benchmark_sparse_planning.py
+
+Fails (exit code 1) if a result differs from the one of pandas, or if the speedup of combining is below the minimum.
+"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import measure, get_exit_code
+from data.data_sparse_planning import Sparse_Planning
+
+number_of_old_allocations = 200_000
+number_of_manual_allocations = 50_000
+minimum_speedup = 2 # Combining with the Sparse_Planning should be at least this many times faster than with pandas.
+
+index_names = ['order_suborder', 'time', 'empl_line']
+old_planning_limit = pd.Timestamp('2023-08-25 12:00:00')
+
+
+### PLANNINGS
+def create_plannings(seed: int = 0) -> tuple:
+    random = np.random.default_rng(seed)
+    orders = pd.Index([f'{order}_{suborder}' for order in range(51000, 51500) for suborder in ['MAG', 'SMD', 'MONT', 'SMD2']])
+    times = pd.date_range('2023-08-21 08:00:00', periods=24 * 10, freq='h')
+    empl_lines = pd.Index([f'PERS{person}' for person in range(40)] + [f'LINE_{line}' for line in 'ABCDEFGH'])
+
+    # Unique (order_suborder, time, empl_line) combinations.
+    combinations = random.choice(len(orders) * len(times) * len(empl_lines), number_of_old_allocations + number_of_manual_allocations // 2, replace=False)
+    order_codes, time_codes, empl_line_codes = np.unravel_index(combinations, (len(orders), len(times), len(empl_lines)))
+    index = pd.MultiIndex.from_arrays([orders[order_codes], times[time_codes], empl_lines[empl_line_codes]], names=index_names)
+
+    old = pd.Series(1, index=index[:number_of_old_allocations], name='allocation')
+    manual_index = index[number_of_old_allocations - number_of_manual_allocations // 2:] # Half of the manual allocations are in the old planning.
+    manual = pd.Series(1.0, index=manual_index[random.permutation(len(manual_index))], name='allocation')
+    return old, manual
+
+
+### COMBINING
+def combine_pandas(old: pd.Series, manual: pd.Series) -> pd.Series:
+    # As done before the Sparse_Planning.
+    old = old.reset_index()
+    old = old[old['time'] <= old_planning_limit].set_index(index_names)['allocation']
+    combined = pd.concat([manual, old], join='outer')
+    return combined.reset_index().drop_duplicates(subset=index_names, keep='first').set_index(index_names)['allocation']
+
+def combine_sparse(old: pd.Series, manual: pd.Series) -> pd.Series:
+    old_planning = Sparse_Planning.from_series(old).filter_time(old_planning_limit)
+    return Sparse_Planning.from_series(manual).merge(old_planning).to_series()
+
+
+def main() -> int:
+    old, manual = create_plannings()
+
+    expected, duration_pandas = measure(lambda: combine_pandas(old, manual))
+    result, duration_sparse = measure(lambda: combine_sparse(old, manual))
+    speedup = duration_pandas / duration_sparse
+    identical = result.equals(expected) and result.index.equals(expected.index)
+
+    print(f'Combining an old planning of {len(old)} and a manual planning of {len(manual)} allocations into {len(expected)} allocations: '
+          f'pandas {duration_pandas:.3f}s, sparse {duration_sparse:.3f}s, speedup {speedup:.1f}x, identical: {identical}')
+
+    expected_sums, duration_groupby = measure(lambda: expected.reset_index().groupby(['empl_line', 'time'])[['allocation']].sum().iloc[:, 0])
+    combined = Sparse_Planning.from_series(expected)
+    sums, duration_group_sum = measure(lambda: combined.group_sum(['empl_line', 'time']))
+    identical_sums = sums.equals(expected_sums)
+
+    print(f'Sums per (empl_line, time) of {len(expected)} allocations: groupby {duration_groupby:.3f}s, sparse {duration_group_sum:.3f}s, '
+          f'speedup {duration_groupby / duration_group_sum:.1f}x, identical: {identical_sums}')
+
+    return get_exit_code(identical=identical, identical_sums=identical_sums, speedup=speedup >= minimum_speedup)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Measures the startup time of main.py, that is the time until the data processing can start, in a fresh interpreter.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_startup
+    python benchmarks/benchmark_startup.py
+
+Fails (exit code 1) if the median startup time exceeds the budget, or if a plotting, GUI or debug package is loaded at startup.
+"""
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import get_exit_code
+
+startup_budget = 0.8 # Seconds, for importing main (and its data processing) in a fresh interpreter.
+number_of_runs = 5
+
+# Packages that should only be loaded once their feature is used, never at startup.
+deferred_packages = ['matplotlib', 'plotly', 'tkinter', 'icecream', 'pyomo']
+
+measure_script = f"""
+import sys, time, json
+start = time.perf_counter()
+import main
+duration = time.perf_counter() - start
+print(json.dumps({{'duration': duration, 'loaded': [package for package in {deferred_packages!r} if package in sys.modules]}}))
+"""
+
+
+def measure_startup() -> dict:
+    """Imports main in a fresh interpreter and measures how long it takes.
+
+    Returns:
+        dict: The 'duration' in seconds and the deferred packages that were 'loaded'.
+    """
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', measure_script],
+        cwd=directory, capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    results = [measure_startup() for _ in range(number_of_runs)]
+
+    median_duration = statistics.median(result['duration'] for result in results)
+    loaded_packages = sorted({package for result in results for package in result['loaded']})
+
+    print(f'Startup (import main), median of {number_of_runs} runs: {median_duration:.3f}s (budget: {startup_budget:.3f}s)')
+    if loaded_packages:
+        print(f'Packages loaded at startup that should be deferred: {loaded_packages}')
+
+    return get_exit_code(startup_budget=median_duration <= startup_budget, deferred_packages=not loaded_packages)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
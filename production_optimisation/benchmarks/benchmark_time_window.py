@@ -0,0 +1,56 @@
+"""Measures the size and build time of the EWOptimisation model (problem_declaration/models.py) with the time windows of the order_suborders
+(time_window_slack), against the model over the whole horizon, both with sparse allocation. The instances are generated (see benchmarks/model_instance.py):
+6 orders of 4 suborders with a deadline of 1 or 2 days after their start date, on horizons of 5, 10 and 15 days.
+
+Run from the production_optimisation directory, as a module or as a script:
+    python -m benchmarks.benchmark_time_window
+    python benchmarks/benchmark_time_window.py
+
+Fails (exit code 1) if the model with time windows does not have exactly the allocation variables of the whole horizon that are within the windows,
+or if the number of variables on the longest horizon is not reduced by at least the minimum factor.
+"""
+import os
+import sys
+
+if not __package__: # Run as a script, then the modules of the project are imported from the production_optimisation directory.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.model_instance import create_instance, build_model, get_exit_code
+from problem_declaration.models import EWOptimisation
+
+number_of_orders = 6
+horizons = [5, 10, 15] # Days
+time_window_slack = 9 # Time intervals after the deadline, a working day.
+minimum_reduction = 4 # The model with time windows on the longest horizon should have at least this many times fewer variables than without.
+
+
+def get_allocations_within_windows(model: EWOptimisation, windowed: EWOptimisation) -> set:
+    """Gets the allocation variables of a model over the whole horizon that are within the time windows of another model.
+    """
+    order_suborder_codes, time_codes = windowed.codes.get_codes('order_suborder'), windowed.codes.get_codes('time')
+    return {
+        (i, j, k) for (i, j, k) in model.m.set_alloc_index
+        if windowed.window_start_array[order_suborder_codes[i]] <= time_codes[j] < windowed.window_stop_array[order_suborder_codes[i]]
+        }
+
+
+def main() -> int:
+    identical = True
+    for days in horizons:
+        dataframes = create_instance(number_of_orders, days)
+        whole, duration_whole = build_model(dataframes, sparse_allocation=True, time_window_slack=None)
+        windowed, duration_windowed = build_model(dataframes, sparse_allocation=True, time_window_slack=time_window_slack)
+        speedup = duration_whole / duration_windowed
+        reduction = whole.m.nvariables() / windowed.m.nvariables()
+        identical &= set(windowed.m.set_alloc_index) == get_allocations_within_windows(whole, windowed)
+
+        print(f'{days} days ({len(whole.list_time)} time intervals): (order_suborder, time) combinations {len(whole.m.set_gaps_index)} -> {len(windowed.m.set_gaps_index)}, '
+              f'variables {whole.m.nvariables()} -> {windowed.m.nvariables()}, constraints {whole.m.nconstraints()} -> {windowed.m.nconstraints()}, '
+              f'build {duration_whole:.2f}s -> {duration_windowed:.2f}s, speedup {speedup:.1f}x')
+
+    print(f'Allocation variables with time windows are the ones within the windows: {identical}')
+    return get_exit_code(identical=identical, reduction=reduction >= minimum_reduction)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
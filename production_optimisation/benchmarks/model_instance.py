@@ -0,0 +1,216 @@
+"""Generated instances of the EWOptimisation model (problem_declaration/models.py), for the benchmarks that measure the size and build time of the model.
+
+The dataframes of the example workbook (EW_Optimisation.xlsm) are read and built once, after which the dataframes that the model uses are replaced by
+generated ones: orders that go through the suborders MAG, SMD, SMD2 and MONT (of which SMD2 and MONT on a line), a horizon of working days of 9 hours,
+employees and lines with an availability and skills, and a planning of a few allocations.
+
+It also measures the size of a created model, and sets the variables of a model to a given allocation, such that models can be compared on the same allocation.
+
+Besides the instances it holds what every benchmark shares: measure() times a function, build_model() creates a model without printing its progress,
+and get_exit_code() gives the exit code of a benchmark from its named checks.
+"""
+import io
+import os
+import time
+import contextlib
+import numpy as np
+import pandas as pd
+import pyomo.environ as pyo
+from pyomo.repn import generate_standard_repn
+
+from data.data_process import Data_process
+from data.dataframes import Dataframes
+from problem_declaration.models import EWOptimisation
+
+path_to_example = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'EW_Optimisation.xlsm')
+
+suborders = ['NONE', 'MAG', 'SMD', 'SMD2', 'MONT'] # The order of the suborders is their routing, 'NONE' is not a suborder of an order.
+line_suborders = ['SMD2', 'MONT']
+hours_per_day = 9
+
+_example_dataframes: Dataframes = None
+
+
+def read_example() -> Dataframes:
+    """Reads and builds the dataframes of the example workbook, once.
+    """
+    global _example_dataframes
+    if _example_dataframes is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_process = Data_process(pd.ExcelFile(path_to_example, engine='openpyxl'))
+            data_process.process_helper_read_sheets('helper_read_sheets')
+            data_process.process_read_dataframes()
+            data_process.process_build_dataframes()
+        _example_dataframes = data_process.dataframes
+    return _example_dataframes
+
+
+def create_instance(number_of_orders: int, number_of_days: int, number_of_employees: int = 8, number_of_lines: int = 4, seed: int = 0) -> Dataframes:
+    """Creates the dataframes of a generated instance of the model.
+
+    Args:
+        number_of_orders (int): Number of orders, every order has an order_suborder for each of the 4 suborders.
+        number_of_days (int): Number of working days of the horizon.
+        number_of_employees (int, optional): Number of employees. Defaults to 8.
+        number_of_lines (int, optional): Number of lines. Defaults to 4.
+        seed (int, optional): Seed of the random generator. Defaults to 0.
+
+    Returns:
+        Dataframes: The dataframes of the example workbook, where the dataframes that the model uses are replaced by the generated ones.
+    """
+    random = np.random.default_rng(seed)
+
+    ### INDEX SETS
+    orders = [60000 + order for order in range(number_of_orders)]
+    order_suborders = pd.Index([f'{order}_{suborder}' for order in orders for suborder in suborders[1:]], name='Unique_Code')
+    start = pd.Timestamp('2023-08-21 08:00:00')
+    times = pd.DatetimeIndex([start + pd.Timedelta(days=day, hours=hour) for day in range(number_of_days) for hour in range(hours_per_day)])
+    employees = [f'PERS{employee + 1}' for employee in range(number_of_employees)]
+    lines = [f'LINE_{chr(ord("A") + line)}' for line in range(number_of_lines)]
+    employee_lines = employees + lines
+
+    order_column = np.repeat(orders, len(suborders) - 1)
+    suborder_column = np.tile(suborders[1:], number_of_orders)
+    on_line = np.isin(suborder_column, line_suborders)
+
+    ### ORDERS
+    start_day = random.integers(0, max(number_of_days - 1, 1), number_of_orders)
+    start_day[0] = 0 # The first order_suborder is planned at the first time.
+    date_start = pd.Timestamp('2023-08-21') + pd.to_timedelta(np.repeat(start_day, len(suborders) - 1), unit='D')
+    date_deadline = date_start + pd.to_timedelta(np.repeat(random.integers(1, 3, number_of_orders), len(suborders) - 1), unit='D')
+    hours = np.repeat(random.integers(1, 4, number_of_orders), len(suborders) - 1).astype('float64')
+    specific_line = np.where(on_line & (random.random(len(order_suborders)) < 0.25), random.choice(lines, len(order_suborders)), '')
+
+    ### EMPLOYEES AND LINES
+    skills = (random.random((len(employee_lines), len(suborders))) < 0.6).astype('int32')
+    skills[len(employees):, :] = np.isin(suborders, line_suborders) # The lines can perform the line suborders.
+    availability = (random.random((len(times), len(employee_lines))) < 0.8).astype('int32')
+    skills[0, 1] = availability[0, 0] = 1 # The first employee can perform the planned allocation, such that the planning is feasible.
+
+    ### PLANNING
+    planning_index = pd.MultiIndex.from_tuples([(order_suborders[0], times[0], employees[0])], names=['order_suborder', 'time', 'empl_line'])
+    planning = pd.Series(1.0, index=planning_index, name='allocation')
+
+    generated = {
+        'index_sets_df': {
+            'order_suborder': order_suborders.to_list(), 'order': orders, 'suborder': suborders, 'time': times.to_list(),
+            'employee_line': employee_lines, 'employee': employees, 'line': lines
+            },
+        'dates_df': pd.DataFrame({'Date_start': date_start, 'Date_deadline': date_deadline}, index=order_suborders),
+        'revenue_df': pd.DataFrame({'Revenue': np.repeat(random.integers(100, 10_000, number_of_orders), len(suborders) - 1).astype('float64')}, index=order_suborders),
+        'time_req_df': pd.DataFrame({'Time_hours_lowerbound': hours, 'Time_hours_upperbound': hours}, index=order_suborders),
+        'skills_df': pd.DataFrame(skills, index=pd.Index(employee_lines, name='Employee_line'), columns=suborders),
+        'availability_df': pd.DataFrame(availability, index=pd.Index(times, name='Time_intervals'), columns=employee_lines),
+        'order_specific_df': pd.DataFrame({'Order_number': order_column, 'Sub_order': suborder_column}, index=order_suborders),
+        'specific_line_df': pd.DataFrame({'Production_line_specific_line': specific_line}, index=order_suborders),
+        'line_indicator_df': pd.DataFrame({'On_line': on_line}, index=order_suborders),
+        'penalty_df': pd.DataFrame(random.random((len(times), len(order_suborders))) * 50, index=times, columns=order_suborders),
+        'percentage_df': pd.DataFrame({'Percentage_prev_sub_order_needed_before_next_sub_order': np.ones(len(order_suborders))}, index=order_suborders),
+        'old_planning_df': planning,
+        'manual_planning_df': planning,
+        'old_and_manual_planning_df': planning
+        }
+
+    example_dataframes = read_example()
+    dataframes = []
+    for dataframe in example_dataframes.dataframes:
+        if dataframe.df_standard_name in generated:
+            dataframe = dataframe.create_copy_for_new_dataframe(dataframe.dataframe_name)
+            dataframe.change_pandas_dataframe(generated[dataframe.df_standard_name])
+        dataframes.append(dataframe)
+    return Dataframes(dataframes)
+
+
+def get_model_size(model) -> dict:
+    """Gets the number of variables, binary variables, constraints and nonzeros (the coefficients of the variables in the constraints) of a created EWOptimisation model.
+    """
+    nonzeros = sum(
+        len(generate_standard_repn(constraint.body, compute_values=False, quadratic=False).linear_vars)
+        for constraint in model.m.component_data_objects(pyo.Constraint, active=True)
+        )
+    binaries = sum(variable.is_binary() for variable in model.m.component_data_objects(pyo.Var))
+    return {'variables': model.m.nvariables(), 'binaries': binaries, 'constraints': model.m.nconstraints(), 'nonzeros': nonzeros}
+
+
+def set_allocation(model, allocations: set):
+    """Sets the allocation variables of a created EWOptimisation model to the given allocations, and the variables of the gaps to the values that follow from them.
+
+    Args:
+        model (EWOptimisation): The created model.
+        allocations (set): The (order_suborder, time, employee_line) combinations that are allocated, the other allocation variables are set to 0.
+    """
+    m = model.m
+    for index in m.set_alloc_index:
+        m.var_alloc[index].value = int(index in allocations)
+
+    allocated = np.zeros((len(model.list_order_suborder), len(model.list_time)), dtype=int) # Number of allocated employee_lines, [order_suborder, time]
+    order_suborder_codes, time_codes = model.codes.get_codes('order_suborder'), model.codes.get_codes('time')
+    for (i, j, k) in allocations:
+        allocated[order_suborder_codes[i], time_codes[j]] += 1
+    cumulative_before = np.cumsum(allocated, axis=1)
+    cumulative_after = np.cumsum(allocated[:, ::-1], axis=1)[:, ::-1]
+
+    for (i, j) in m.set_gaps_index:
+        position = (order_suborder_codes[i], time_codes[j])
+        m.var_indicator_alloc_sum_employee_line[(i, j)].value = int(allocated[position] > 0)
+        if hasattr(m, 'var_cumulative_alloc'):
+            m.var_cumulative_alloc[(i, j)].value = cumulative_before[position]
+        if hasattr(m, 'var_gaps'):
+            before, after, is_allocated = int(cumulative_before[position] > 0), int(cumulative_after[position] > 0), int(allocated[position] > 0)
+            m.var_before[(i, j)].value = before
+            m.var_after[(i, j)].value = after
+            m.var_during[(i, j)].value = before * after
+            m.var_gaps[(i, j)].value = before * after - is_allocated
+
+
+def get_violated_constraints(model, tolerance: float = 1e-6) -> dict:
+    """Gets the constraints of a created EWOptimisation model that are violated by the current values of its variables, per constraint name.
+    """
+    violated = {}
+    for constraint in model.m.component_objects(pyo.Constraint, active=True):
+        for index, constraint_data in constraint.items():
+            value = pyo.value(constraint_data.body)
+            if (constraint_data.has_lb() and value < pyo.value(constraint_data.lower) - tolerance) or (constraint_data.has_ub() and value > pyo.value(constraint_data.upper) + tolerance):
+                violated.setdefault(constraint.name, set()).add(index)
+    return violated
+
+
+### BENCHMARK HELPERS
+def measure(function) -> tuple:
+    """Calls a function and measures how long it takes.
+
+    Returns:
+        tuple: The result of the function and its duration in seconds.
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def build_model(dataframes: Dataframes, **model_options) -> tuple:
+    """Creates the EWOptimisation model of the dataframes, without printing its progress.
+
+    Args:
+        dataframes (Dataframes): The dataframes, like a generated instance.
+        **model_options: Options of EWOptimisation.createModel(), like sparse_allocation=True.
+
+    Returns:
+        tuple: The model and the duration of creating it in seconds.
+    """
+    model = EWOptimisation(dataframes)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, duration = measure(lambda: model.createModel(**model_options))
+    return model, duration
+
+def get_exit_code(**checks: bool) -> int:
+    """Gets the exit code of a benchmark from its checks, and prints the checks that failed.
+
+    Args:
+        **checks (bool): Whether a check passed, per name of the check, like identical=True.
+
+    Returns:
+        int: 0 if every check passed, otherwise 1.
+    """
+    failed_checks = [name for name, passed in checks.items() if not passed]
+    if failed_checks:
+        print(f'Failed: {", ".join(failed_checks)}')
+    return 1 if failed_checks else 0
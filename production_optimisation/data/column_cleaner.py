@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+
+class Column_Cleaner:
+    """The Column_Cleaner class cleans whole columns at once, instead of calling a Python function for every element with .apply() or .applymap().
+    Numeric and timestamp columns are cleaned with numpy, without creating an object per element. For the other columns the types and truthiness
+    of the elements are determined with builtins that loop in C, the strings are changed to uppercase in one go and the types of the cleaned columns
+    are inferred like .apply() does. So, the cleaned columns are identical to those of the element-wise cleaning.
+
+    The cleaning rules (per element) are:
+        - uppercase_strings: str -> uppercase, else -> element.
+        - clean_orders_column: str -> uppercase, empty or missing -> None, else -> element.
+        - clean_index_sets_column: str -> uppercase, pd.Timestamp -> element, float -> int, other non-empty elements -> None, empty elements -> element.
+    """
+
+    @classmethod
+    def uppercase_strings(cls, series: pd.Series) -> pd.Series:
+        """Changes the strings in a column to uppercase, all other elements are kept.
+
+        Args:
+            series (pd.Series): Column to clean.
+
+        Returns:
+            pd.Series: The cleaned column.
+        """
+        if series.empty:
+            return series.copy()
+
+        # Numbers and timestamps are kept as they are, only the dtype is widened like .apply() does.
+        if series.dtype.kind in 'if' or series.dtype == 'datetime64[ns]':
+            return series.astype(cls._get_widened_dtype(series))
+
+        values = series.to_numpy(dtype=object, copy=True)
+        is_str, = cls._is_instance(values, str)
+        cls._to_uppercase(values, is_str)
+
+        return cls._to_series(values, series)
+
+    @classmethod
+    def clean_orders_column(cls, series: pd.Series) -> pd.Series:
+        """Cleans a column of the orders dataframe: strings are changed to uppercase and empty (falsy) or missing elements become None.
+
+        Args:
+            series (pd.Series): Column to clean.
+
+        Returns:
+            pd.Series: The cleaned column.
+        """
+        if series.empty:
+            return series.copy()
+
+        # Zeros and missing numbers or timestamps become None.
+        if series.dtype.kind in 'if' or series.dtype == 'datetime64[ns]':
+            keep = series.notna().to_numpy() & (series.to_numpy() != 0 if series.dtype.kind in 'if' else True)
+            return cls._keep_or_none(series, keep)
+
+        values = series.to_numpy(dtype=object, copy=True)
+        keep = cls._is_truthy(values) & pd.notna(values)
+
+        is_str, = cls._is_instance(values, str)
+        cls._to_uppercase(values, keep & is_str)
+        values[~keep] = None
+
+        return cls._to_series(values, series)
+
+    @classmethod
+    def clean_index_sets_column(cls, series: pd.Series) -> pd.Series:
+        """Cleans a column of the index sets dataframe: strings are changed to uppercase, timestamps are kept and floats become integers.
+        Other non-empty elements (and missing values) become None, empty (falsy) elements are kept.
+
+        Args:
+            series (pd.Series): Column to clean.
+
+        Returns:
+            pd.Series: The cleaned column.
+        """
+        if series.empty:
+            return series.copy()
+
+        # Non-zero integers become None and zeros are kept. Timestamps are kept and missing timestamps become None.
+        if series.dtype.kind == 'i':
+            return cls._keep_or_none(series, series.to_numpy() == 0)
+        if series.dtype == 'datetime64[ns]':
+            return cls._keep_or_none(series, series.notna().to_numpy())
+
+        values = series.to_numpy(dtype=object, copy=True)
+        truthy = cls._is_truthy(values)
+        non_empty = truthy & pd.notna(values)
+
+        is_str, is_timestamp, is_float = (non_empty & is_type for is_type in cls._is_instance(values, str, pd.Timestamp, float))
+
+        cls._to_uppercase(values, is_str)
+        if is_float.any():
+            values[is_float] = list(map(int, values[is_float]))
+        values[truthy & ~(is_str | is_timestamp | is_float)] = None
+
+        return cls._to_series(values, series)
+
+    @classmethod
+    def clean_index_sets_dataframe(cls, pandas_dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cleans all columns of the index sets dataframe, see clean_index_sets_column().
+
+        Args:
+            pandas_dataframe (pd.DataFrame): Dataframe to clean.
+
+        Returns:
+            pd.DataFrame: The cleaned dataframe.
+        """
+        cleaned_dataframe = pandas_dataframe.copy()
+        for position in range(pandas_dataframe.shape[1]):
+            cleaned_dataframe.isetitem(position, cls.clean_index_sets_column(pandas_dataframe.iloc[:, position]))
+        return cleaned_dataframe
+
+
+    ### HELPER FUNCTIONS
+    @staticmethod
+    def _is_instance(values: np.ndarray, *element_types: type) -> List[np.ndarray]:
+        # isinstance() of every element for every type, by checking the few distinct types of the elements only once.
+        codes, unique_types = pd.factorize(np.fromiter(map(type, values), dtype=object, count=len(values)))
+        return [
+            np.isin(codes, [code for code, unique_type in enumerate(unique_types) if issubclass(unique_type, element_type)])
+            for element_type in element_types
+            ]
+
+    @staticmethod
+    def _is_truthy(values: np.ndarray) -> np.ndarray:
+        return np.fromiter(map(bool, values), dtype=bool, count=len(values))
+
+    @staticmethod
+    def _to_uppercase(values: np.ndarray, is_str: np.ndarray):
+        if is_str.any():
+            values[is_str] = list(map(str.upper, values[is_str]))
+
+    @staticmethod
+    def _get_widened_dtype(series: pd.Series) -> str:
+        # .apply() gives Python integers/floats to the function, which are inferred as int64/float64 again.
+        if series.dtype.kind == 'i':
+            return 'int64'
+        if series.dtype.kind == 'f':
+            return 'float64'
+        return series.dtype
+
+    @classmethod
+    def _keep_or_none(cls, series: pd.Series, keep: np.ndarray) -> pd.Series:
+        # Numeric or timestamp column where the elements that are not kept become None, inferred like .apply() does:
+        # nothing kept -> only None (object), integers and None -> floats and NaN, floats or timestamps and None -> NaN/NaT.
+        if keep.all():
+            return series.astype(cls._get_widened_dtype(series))
+        if not keep.any():
+            return pd.Series([None] * len(series), index=series.index, name=series.name, dtype=object)
+
+        dtype = cls._get_widened_dtype(series)
+        return series.astype('float64' if dtype == 'int64' else dtype).where(keep)
+
+    @staticmethod
+    def _to_series(values: np.ndarray, series: pd.Series) -> pd.Series:
+        # Infer the type of the cleaned column from its elements, like .apply() does.
+        return pd.Series(values, index=series.index, name=series.name).infer_objects()
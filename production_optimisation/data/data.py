@@ -2,15 +2,25 @@ from __future__ import annotations
 # Used in building dataframes, since the ManagerDataframes is located at the end of the file. 
 # Subsequent of all DF's that are build and need a ManagerDataframe as input
 
+import os
+import threading
 import pandas as pd
 import numpy as np
 
-import openpyxl
-
-from icecream import ic
 from typing import Union, TypeVar
 
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+from data.planning_reader import Planning_Reader
+from data.data_schema import SheetSchema
+from data.column_cleaner import Column_Cleaner
+from data.data_codes import Data_Codes
+from data.data_sparse_planning import Sparse_Planning
+from data.data_columns import Data_Columns
+from data.data_indicator import Data_Indicator
+from data.data_build_graph import Data_Build_Graph
+from data.data_penalty import Data_Penalty, Penalty_Column_Cache
 
 T = TypeVar('T', bound='BaseDataframe')
 
@@ -41,6 +51,9 @@ class BaseDataframe:
 
         self._status_cleaned: bool = False
 
+        # Schema of the sheet (see data/data_schema.py), set by the ManagerDataframes using the configuration of the dataframe.
+        self._schema: SheetSchema = None
+
         if not _read_fillna_value:
             self._read_fillna_value = ''
         else:
@@ -131,6 +144,13 @@ class BaseDataframe:
         """
         self._status_cleaned = new_status
 
+    @property
+    def schema(self) -> SheetSchema:
+        return self._schema
+    @schema.setter
+    def schema(self, new_schema: SheetSchema):
+        self._schema = new_schema
+
     @property
     def bool_read_df(self) -> bool:
         return self._bool_read_df
@@ -198,11 +218,16 @@ class BaseDataframe:
         if self._bool_read_df:
             self._validate_name_ExcelSheet()
             
-            self._pandas_Dataframe = pd.read_excel(
-                io=self._pandas_ExcelFile.io,
-                sheet_name=self._name_ExcelSheet,
-                engine='openpyxl'
-            ).fillna(self._read_fillna_value)
+            # Parse from the opened ExcelFile, such that the workbook is not reopened for every sheet.
+            read_pandas_Dataframe = self._pandas_ExcelFile.parse(
+                sheet_name=self._name_ExcelSheet
+            )
+
+            # The schema gives typed columns, otherwise the empty cells are only filled.
+            if self._schema is not None:
+                self._pandas_Dataframe = self._schema.apply(read_pandas_Dataframe, self._read_fillna_value)
+            else:
+                self._pandas_Dataframe = read_pandas_Dataframe.fillna(self._read_fillna_value)
 
     #FIXME: Create VBA file that communicates with python to indicate whether a file is opened by the user, then the dataframe will not be written to excel until the file is closed. otherwise there will be alot of corrupt files.
     def write_Dataframe_toExcel(self):
@@ -230,6 +255,7 @@ class BaseDataframe:
                 index=True
                 )
         
+        from icecream import ic # Debug dependency, only loaded when it is used.
         ic(f'Dataframe ({self._name_Dataframe}) written to ExcelFile in sheet ({self._name_ExcelSheet}) correctly.')
 
     ### DATA VALIDATION.
@@ -322,6 +348,9 @@ class OrderDataframe(BaseDataframe):
         self._description = None
         self._manual_urgency = None
 
+        # Columnar store of the orders, the column properties are views on its columns instead of copies.
+        self._data_columns = None
+
     ### PROPERTIES: 
     #FIXME: Based on needs in models also 'clean' the return value, that is remove 'None' values in e.g. specific_line_df
     # check if possible, because this could hinder .loc[] since it could result in errors.
@@ -409,44 +438,27 @@ class OrderDataframe(BaseDataframe):
             # During cleaning the description column is excluded to preserve the format.
             columns_to_exclude_cleaning = ['Description']
             columns_to_clean = self._pandas_Dataframe.columns.drop(columns_to_exclude_cleaning)
+
+            # The columns that are typed and normalised by the schema are already clean.
+            if self._schema is not None:
+                columns_to_clean = [col for col in columns_to_clean if not self._schema.is_normalised(col)]
             
-            # Clean individual column elements
+            # Clean the columns as a whole: str -> uppercase, empty or missing -> None, else -> element.
             for col in columns_to_clean:
-                self._pandas_Dataframe[col] = self._pandas_Dataframe[col].apply(
-                        lambda x: self._clean_orderDF_elements(x)
-                        )
+                self._pandas_Dataframe[col] = Column_Cleaner.clean_orders_column(self._pandas_Dataframe[col])
             
             # Remove empty rows
             self._pandas_Dataframe = self._pandas_Dataframe[self._pandas_Dataframe != '']
-            self._pandas_Dataframe.fillna(self._read_fillna_value)
             
             self._status_cleaned = True
 
     ### HELPER FUNCTIONS
-    def _clean_orderDF_elements(self, element):
-        """This function cleans the actual elements of each column based on the datatype of the column.
-        \n
-        String -> uppercase String
-        Else -> No change
-
-        Args:
-            element (_type_): elements of the ordersDF
-
-        Returns:
-            _type_: The cleaned element
-        """
-        if element:
-            if pd.notna(element) and isinstance(element, str):
-                return element.upper()
-            
-            elif pd.notna(element):
-                return element
-    
     def _column_property_finder(self, property_name: str) -> pd.DataFrame:
         # Obtain the property value only if the corresponding variable is empty
         if getattr(self, f'_{property_name}', None) is None:
             cols_to_keep = self.orderBased[property_name].keepCols
-            property_value = self._pandas_Dataframe[cols_to_keep]
+            data_columns = self._get_data_columns()
+            property_value = data_columns.get_column(cols_to_keep) if isinstance(cols_to_keep, str) else data_columns.get_view(cols_to_keep)
 
             # Set the corresponding variable dynamically
             setattr(self, f'_{property_name}', property_value)
@@ -461,15 +473,15 @@ class OrderDataframe(BaseDataframe):
         if getattr(self, f"_{property_name}", None) is None:
             cols_to_keep = self.orderBased[property_name].keepCols
 
-            # Get columns to drop.
-            drop_cols = [
-                col for col in self.pandas_Dataframe.copy().columns
-                if col not in cols_to_keep
+            # Get the columns to keep, in the order of the dataframe.
+            view_cols = [
+                col for col in self.pandas_Dataframe.columns
+                if col in cols_to_keep
                 ]
-            newDF = self.pandas_Dataframe.copy().drop(columns=drop_cols)
+            newDF = self._get_data_columns().get_view(view_cols)
 
             # Make indicator
-            property_value = (newDF == True) | (newDF == 1)
+            property_value = Data_Indicator.calc_indicator_dataframe(newDF)
 
             # Set the corresponding variable dynamically
             setattr(self, f'_{property_name}', property_value)
@@ -482,6 +494,12 @@ class OrderDataframe(BaseDataframe):
 
         return newDF
 
+    def _get_data_columns(self) -> Data_Columns:
+        # The store is renewed if the pandas dataframe is changed, like it is during cleaning.
+        if self._data_columns is None or self._data_columns.pandas_dataframe is not self._pandas_Dataframe:
+            self._data_columns = Data_Columns(self._pandas_Dataframe)
+        return self._data_columns
+
     def _set_column_property(self, property_name: str, value):
         # Implement any necessary validation or processing here
         # For now, assuming 'value' is a valid replacement for the property
@@ -543,6 +561,15 @@ class IndexSetsDataframe(BaseDataframe):
             series=self._pandas_Dataframe['Production_lines'], 
             value_to_replace=''
             ).to_list()
+
+        # Integer codes of the index sets, the code of a label is its position in the index set.
+        self._codes = Data_Codes({
+            'order_suborder': self._order_suborder,
+            'order': self._orders,
+            'suborder': self._suborders,
+            'time': self._time_intervals,
+            'employee_line': self._employee_line
+            })
    
     ### PROPTERTIES OF INDEX SETS: SPECIFIC INDEX SETS
     @property
@@ -573,6 +600,10 @@ class IndexSetsDataframe(BaseDataframe):
     def line(self):
         return self._lines
     
+    @property
+    def codes(self) -> Data_Codes:
+        return self._codes
+    
     ### CLEAN FUNCTION
     def clean(self):
         """Clean the indexDF by changing all strings to uppercase, timestamp is left as it is, floats are made to integer.
@@ -582,38 +613,14 @@ class IndexSetsDataframe(BaseDataframe):
         float -> int
         """
         if not self._status_cleaned:
+            # Clean the columns as a whole, see Column_Cleaner.
             for col in self._pandas_Dataframe.columns:
-                self._pandas_Dataframe[col] = self._pandas_Dataframe[col].apply(
-                    lambda x: self._clean_indexDF_elements(x)
-                    )
+                self._pandas_Dataframe[col] = Column_Cleaner.clean_index_sets_column(self._pandas_Dataframe[col])
             
             self.__post_cleaning__()
             self._status_cleaned = True  
 
     ### HELPER FUNCTIONS
-    def _clean_indexDF_elements(self, element):
-        """This function cleans all the actual elements based on their datatype
-        \n
-        str -> uppercase
-        pd.Timestamp -> same
-        float -> int
-
-        Args:
-            element (_type_): elements of the indexDF
-
-        Returns:
-            _type_: The cleaned element
-        """
-        if element:
-            if isinstance(element, str):
-                return element.upper()
-            elif isinstance(element, pd.Timestamp):
-                return element
-            elif isinstance(element, float):
-                return int(element)
-        else:
-            return element
-
     def _remove_values_from_series(
             self, 
             series: pd.Series, 
@@ -657,6 +664,16 @@ class OldPlanningDataframe(BaseDataframe):
             _read_fillna_value
             )
 
+    def read_Dataframe_fromExcel(self):
+        """Stream the oldPlanningDF from excel row by row, only keeping the non-zero allocations. 
+        \n The result is already in the cleaned format, so it is marked as cleaned.
+        """
+        if self._bool_read_df:
+            self._validate_name_ExcelSheet()
+
+            self._pandas_Dataframe = Planning_Reader(self._pandas_ExcelFile).read_planning(self._name_ExcelSheet)
+            self._status_cleaned = True
+
     def clean(self):
         """Clean the oldPlanningDF by changing all strings to uppercase, timestamp is left as it is, floats are made to integer.
 
@@ -706,6 +723,16 @@ class ManualPlanningDataframe(BaseDataframe):
             _read_fillna_value
             )
 
+    def read_Dataframe_fromExcel(self):
+        """Stream the manualPlanningDF from excel row by row, only keeping the non-zero allocations. 
+        \n The result is already in the cleaned format, so it is marked as cleaned.
+        """
+        if self._bool_read_df:
+            self._validate_name_ExcelSheet()
+
+            self._pandas_Dataframe = Planning_Reader(self._pandas_ExcelFile).read_manual_planning(self._name_ExcelSheet)
+            self._status_cleaned = True
+
     def clean(self):
         """Clean the manualPlanningDataframe by changing all strings to uppercase, timestamp is left as it is, floats are made to integer.
 
@@ -854,20 +881,12 @@ class CombinedPlanningDataframe(BaseDataframe):
         elif oldPlanningDF.empty:
             combinedPlanningDF = manualPlanningDF
 
-         # If both plannings are not empty, return the concatenated result, including both
+         # If both plannings are not empty, return the merged result, including both
         else: 
-            index_names_oldDF = oldPlanningDF.index.names
-            # Join both dataframes using set theory: (A U B), so in either A or B.
-            combinedPlanningDF = pd.concat(
-                [manualPlanningDF, oldPlanningDF], 
-                join='outer'
-                ) 
-
-            # Remove duplicates if combination is in both plannings.
-            combinedPlanningDF = combinedPlanningDF.reset_index().drop_duplicates(
-                subset=list(index_names_oldDF), 
-                keep='first'
-                ).set_index(index_names_oldDF) # drop_duplicates is column based, so reset index.
+            # Join both plannings using set theory: (A U B), so in either A or B. If a combination is in both plannings, the manual allocation is kept.
+            combinedPlanningDF = Sparse_Planning.from_series(manualPlanningDF).merge(
+                Sparse_Planning.from_series(oldPlanningDF)
+                ).to_series()
         
         self._pandas_Dataframe = combinedPlanningDF
 
@@ -888,18 +907,8 @@ class CombinedPlanningDataframe(BaseDataframe):
 
         if not oldPlanningDF.empty:
 
-            # Reset index for enabling conditioning on 'time' index/column
-            index_names_oldDF = oldPlanningDF.index.names
-            oldPlanningDF = oldPlanningDF.reset_index() 
-
-            # Only keep old allocations that happen before the 'limit_oldPlanning' value.
-            condition_oldDF = (oldPlanningDF['time'] <= pd.to_datetime(limit_OldPlanning))
-            
-            # Only keep rows that satisfy the condition
-            oldPlanningDF = oldPlanningDF[condition_oldDF]
-            
-            # Reformat to Series with correct index.
-            oldPlanningDF = oldPlanningDF.set_index(index_names_oldDF)['allocation']
+            # Only keep old allocations that happen before the 'limit_oldPlanning' value, the times are compared once per time instead of once per allocation.
+            oldPlanningDF = Sparse_Planning.from_series(oldPlanningDF).filter_time(pd.to_datetime(limit_OldPlanning)).to_series()
 
         return oldPlanningDF
     
@@ -925,6 +934,9 @@ class CombinedPlanningDataframe(BaseDataframe):
 
 
 class PenaltyDataframe(BaseDataframe):
+    # Penalty columns of the previous build, shared by all PenaltyDataframes. A new build only calculates the columns of new or changed orders.
+    penalty_cache = Penalty_Column_Cache()
+
     def __init__(
             self, _pandas_ExcelFile: pd.ExcelFile, 
             _name_Dataframe: str, 
@@ -956,41 +968,16 @@ class PenaltyDataframe(BaseDataframe):
         time_index = pd.to_datetime(indexDF.time_intervals)
         order_suborder_index = indexDF.order_suborder
 
-        penalty_df = pd.DataFrame(index=time_index, columns=order_suborder_index)
-
-        for order_suborder in order_suborder_index:
-            start_penalty = time_index >= date_start.loc[order_suborder].iloc[0] # Array of lenght: len(time_index)
-            penalty_df.loc[:, order_suborder] = 50  # Default value for cases where start_penalty is False
-
-            if np.any(start_penalty):
-                time_subset = time_index[start_penalty]
-                date_start_subset = date_start.loc[order_suborder].iloc[0]
-                date_deadline_subset = date_deadline.loc[order_suborder].iloc[0]
-                revenue_subset = revenue.loc[order_suborder].iloc[0]
-
-                penalty_df.loc[start_penalty, order_suborder] = self._calc_penalty(
-                    time_subset, date_start_subset, date_deadline_subset, revenue_subset
-                )
-
-        self.pandas_Dataframe = penalty_df
-
-    ### HELPER FUNCTIONS
-    @staticmethod
-    def _calc_penalty(
-        time_index, 
-        date_start, 
-        date_deadline, 
-        revenue
-        ):
-        start_now = (time_index - date_start) / pd.Timedelta('1D')
-        deadline_now = (date_deadline - time_index) / pd.Timedelta('1D')
-        multiply_now = 4 * ((time_index - pd.Timestamp('1900-01-01')) / pd.Timedelta('1D'))
-        exp_val = deadline_now / multiply_now
-
-        penalty = start_now + np.exp(exp_val) + np.log(revenue)
+        # The whole penalty matrix is calculated at once, only the columns and rows that are not in the penalty cache. See Data_Penalty.
+        self.pandas_Dataframe = Data_Penalty.calc_penalty_dataframe(
+            time_index=time_index, 
+            order_suborder_index=order_suborder_index, 
+            date_start=date_start.iloc[:, 0], 
+            date_deadline=date_deadline.iloc[:, 0], 
+            revenue=revenue.iloc[:, 0],
+            penalty_cache=self.penalty_cache
+            )
 
-        return penalty
-        
 
 
 class SolutionDataframe(BaseDataframe):
@@ -1010,6 +997,11 @@ class ManagerDataframes:
 
         self.validated_dfs = {}
 
+        # Schedules reading and building the dataframes, and keeps them between runs of process_data(). See data/data_build_graph.py.
+        self.build_graph: Data_Build_Graph = None
+        self._read_dataframes = {} # Future of the read and cleaned dataframe per name, while the dataframes are processed.
+        self._read_lock = threading.Lock()
+
     def store_Dataframe(
             self,
             dataframe_to_store: Union[
@@ -1166,47 +1158,96 @@ class ManagerDataframes:
 
             return results
     
-    def process_data(self):
+    def process_data(self, max_workers: int = None):
         """Reads the data from the dictionairy containing specific configurations for each dataframe and cleans and stores them.
+        \n The dataframes are processed in the order of their inputs, see data/data_build_graph.py: a dataframe that is read depends on its sheet and a dataframe that is build
+        on the dataframes in its 'build_inputs', it waits until these are stored. The dataframes that are read and cleaned are independent, so they are read and cleaned concurrently in a pool of processes.
+        The dataframes that are build and do not depend on each other are build concurrently in a pool of threads.
+        \n If the data is processed again, only the sheets that changed are read again and only the dataframes that depend on them are build again.
+
+        Args:
+            max_workers (int, optional): Maximum number of processes that read and clean sheets, 1 reads them one by one in this process. Defaults to general_configuration.max_workers_read, or the number of processors if that is None.
         """
-        for name, config in self.dfs.items():
-            # Unpack the configuration of individual dataframes.
-            excelFile = config.excelFile
-            sheet_name = config.name_excel_sheet
-            
-            class_name = config.class_type
+        from general_configuration import max_workers_read, max_workers_build
 
-            bool_read_sheet = config.read_sheet
-            read_fillna_value = config.read_fillna_value
+        if max_workers is None:
+            max_workers = max_workers_read or os.cpu_count() or 1
 
-            bool_build_df = config.build_df
+        if self.build_graph is None:
+            self.build_graph = self._create_build_graph(max_workers=max_workers_build or os.cpu_count() or 1)
+        source_keys = self._get_source_keys()
 
-            # Instanciate the dataframe instance. 
-            df_instance: type[BaseDataframe] = class_name(
-                _pandas_ExcelFile=excelFile,
-                _name_Dataframe=name,
-                _name_ExcelSheet=sheet_name,
+        # The dataframes that only need to be read and cleaned, because their sheet changed. 
+        names_to_read = [name for name, config in self.dfs.items() if config.read_sheet and not config.build_df and self.build_graph.is_changed(name, source_keys)]
 
-                _bool_read_df=bool_read_sheet,
-                _read_fillna_value = read_fillna_value
-            )
-            
-            # Read the dataframe from excel
-            df_instance.read_Dataframe_fromExcel()
-            
-            # Clean the data
-            df_instance.clean()
+        # A process can only open the ExcelFile itself if it is given a (lazy) handle that can be send to it, not an opened pd.ExcelFile.
+        can_read_concurrently = all(not isinstance(self.dfs[name].excelFile, pd.ExcelFile) for name in names_to_read)
 
-            # Build the dataframe if necessary. 
-            if bool_build_df:
-                df_instance.build(managerDF=self)
-            
-            #FIXME: If no longer needed in the dfs, then remove. 
-            if name == 'BaseDF':
-                df_instance.status_cleaned = True
-            
-            # Store the dataframe. 
-            self.store_Dataframe(df_instance)
+        if max_workers > 1 and len(names_to_read) > 1 and can_read_concurrently:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(names_to_read))) as executor:
+                self._read_dataframes = {name: executor.submit(_read_and_clean_Dataframe, name, self.dfs[name]) for name in names_to_read}
+                self.build_graph.run(source_keys)
+        else:
+            self.build_graph.run(source_keys)
+        self._read_dataframes = {}
+
+        # Keep the order of the dictionairy, independent of the order in which the dataframes are processed.
+        names_in_order = [name for name in self.dfs if name in self.stored_Dataframes] + [name for name in self.stored_Dataframes if name not in self.dfs]
+        self.stored_Dataframes = {name: self.stored_Dataframes[name] for name in names_in_order}
+
+    def _process_df(self, name: str) -> BaseDataframe:
+        """Processes the dataframe {name}, using the dataframe that is read and cleaned concurrently if it is given. A dataframe that is processed again replaces the stored dataframe.
+
+        Args:
+            name (str): Name of the dataframe.
+
+        Returns:
+            BaseDataframe: The processed and stored dataframe (subclass of BaseDataframe).
+        """
+        config = self.dfs[name]
+        if name in self._read_dataframes:
+            # Wait for the dataframe, and give it the ExcelFile of this process (the process that read it had its own).
+            df_instance: type[BaseDataframe] = self._read_dataframes[name].result()
+            df_instance.pandas_ExcelFile = config.excelFile
+        else:
+            # The ExcelFile is shared by the threads, so only one thread reads from it at a time.
+            with self._read_lock:
+                df_instance = _read_and_clean_Dataframe(name, config)
+
+        # Build the dataframe if necessary. 
+        if config.build_df:
+            df_instance.build(managerDF=self)
+        
+        #FIXME: If no longer needed in the dfs, then remove. 
+        if name == 'BaseDF':
+            df_instance.status_cleaned = True
+        
+        # Store the dataframe. 
+        self.stored_Dataframes.pop(name, None)
+        self.validated_dfs.pop(name, None)
+        self.store_Dataframe(df_instance)
+        return df_instance
+
+    def _create_build_graph(self, max_workers: int) -> Data_Build_Graph:
+        # Every dataframe is a node, that depends on its sheet if it is read and on its 'build_inputs' if it is build.
+        build_graph = Data_Build_Graph(max_workers=max_workers)
+        for name, config in self.dfs.items():
+            inputs = ([config.name_excel_sheet] if config.read_sheet else []) + list(config.build_inputs)
+            build_graph.add_node(name, inputs, lambda name=name: self._process_df(name))
+        return build_graph
+
+    def _get_source_keys(self) -> dict:
+        # The fingerprint of every sheet that is read, such that a sheet that did not change is not read again. The sheets of a data source without fingerprints are always read.
+        from data.data_cache import Data_Cache
+
+        data_sources = {id(config.excelFile): config.excelFile for config in self.dfs.values() if config.read_sheet and config.excelFile is not None}
+        source_keys = {}
+        for data_source in data_sources.values():
+            try:
+                source_keys.update(Data_Cache.get_data_source_fingerprints(data_source))
+            except Exception as e:
+                print(f'The sheets of the data source ({data_source}) have no fingerprints, so they are always read: {e}')
+        return source_keys
 
     ### HELPER FUNCTIONS
     def _validate_presence_Dataframe(
@@ -1352,4 +1393,36 @@ class ManagerDataframes:
             list[str]: names of stored dataframes.
         """
         return [df_name for df_name in self.stored_Dataframes]
-    
\ No newline at end of file
+    
+
+
+
+def _read_and_clean_Dataframe(name: str, config) -> BaseDataframe:
+    """Instanciates the dataframe {name} using its configuration, then reads it from excel and cleans it.
+    \n Defined on module level, such that it can be run in another process by ManagerDataframes.process_data().
+
+    Args:
+        name (str): Name of the dataframe.
+        config (ConfigBaseDataframe): Configuration of the dataframe, see gen_config.py.
+
+    Returns:
+        BaseDataframe: The read and cleaned dataframe (subclass of BaseDataframe).
+    """
+    # Instanciate the dataframe instance. 
+    df_instance: type[BaseDataframe] = config.class_type(
+        _pandas_ExcelFile=config.excelFile,
+        _name_Dataframe=name,
+        _name_ExcelSheet=config.name_excel_sheet,
+
+        _bool_read_df=config.read_sheet,
+        _read_fillna_value = config.read_fillna_value
+    )
+    df_instance.schema = config.schema
+    
+    # Read the dataframe from excel
+    df_instance.read_Dataframe_fromExcel()
+    
+    # Clean the data
+    df_instance.clean()
+
+    return df_instance
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+
+class Allocation_Index:
+    """The Allocation_Index class holds the (order_suborder, time, employee_line) combinations for which the model creates an allocation variable,
+    as a boolean mask indexed by codes (see Data_Codes): [order_suborder, time, employee_line]. A dense index holds every combination, a sparse index
+    only the combinations that can ever be allocated, see Data_Feasibility.get_feasible_mask().
+
+    The combinations are stored in the order of the codes (order_suborder, then time, then employee_line), which is the order of the product of the sets.
+    The combinations of an order_suborder within a range of time positions are therefore one slice of that list, such that the rules of the model sum
+    over the allocation variables that exist, without checking every combination.
+    """
+
+    def __init__(self, mask: np.ndarray, order_suborders: pd.Index, times: pd.Index, employee_lines: pd.Index):
+        """Constructor of the Allocation_Index.
+
+        Args:
+            mask (np.ndarray): Whether there is an allocation variable for a combination, [order_suborder, time, employee_line].
+            order_suborders (pd.Index): The order_suborder labels, the position of a label is its code.
+            times (pd.Index): The time labels, the position of a label is its code.
+            employee_lines (pd.Index): The employee_line labels, the position of a label is its code.
+        """
+        self.mask = np.asarray(mask, dtype=bool)
+        self.shape = self.mask.shape
+        self.is_dense = bool(self.mask.all())
+
+        # The codes of the combinations, in the order of (order_suborder, time, employee_line).
+        order_suborder_codes, time_codes, employee_line_codes = np.nonzero(self.mask)
+        self.codes: Tuple[np.ndarray, ...] = (order_suborder_codes, time_codes, employee_line_codes)
+        self.tuples: List[Tuple] = list(zip(
+            pd.Index(order_suborders).take(order_suborder_codes).to_list(),
+            pd.Index(times).take(time_codes).to_list(),
+            pd.Index(employee_lines).take(employee_line_codes).to_list()
+            ))
+
+        # Position of the first combination of every (order_suborder, time), keyed by order_suborder * number of times + time. The combinations of an order_suborder
+        # from time position a up to time position b are then tuples[offsets[key of a]:offsets[key of b]].
+        self.offsets = np.concatenate([[0], np.cumsum(self.mask.sum(axis=2).ravel())])
+
+        # The combinations ordered by (time, employee_line), created once they are needed by get_allocations_of_employee_line().
+        self._tuples_by_employee_line: List[Tuple] = None
+        self._offsets_by_employee_line: np.ndarray = None
+
+    @classmethod
+    def dense(cls, order_suborders: pd.Index, times: pd.Index, employee_lines: pd.Index) -> 'Allocation_Index':
+        """Creates the index with every (order_suborder, time, employee_line) combination.
+        """
+        return cls(np.ones((len(order_suborders), len(times), len(employee_lines)), dtype=bool), order_suborders, times, employee_lines)
+
+
+    ### PROPERTIES
+    def __len__(self) -> int:
+        return len(self.tuples)
+
+    @property
+    def density(self) -> float:
+        """The part of all (order_suborder, time, employee_line) combinations that has an allocation variable.
+        """
+        return len(self) / self.mask.size if self.mask.size else 1.0
+
+
+    ### LOOKUP
+    def get_allocations(self, order_suborder_code: int, time_slice: slice = slice(None)) -> List[Tuple]:
+        """Gets the (order_suborder, time, employee_line) combinations of an order_suborder within a range of time positions, like a slice of the Time_Grid.
+
+        Args:
+            order_suborder_code (int): Code of the order_suborder.
+            time_slice (slice, optional): The time positions, a slice with a step of 1. Defaults to slice(None), all time positions.
+
+        Returns:
+            List[Tuple]: The combinations, ordered by time and employee_line.
+        """
+        start, stop, _ = time_slice.indices(self.shape[1])
+        if stop <= start:
+            return []
+        key = order_suborder_code * self.shape[1]
+        return self.tuples[self.offsets[key + start]:self.offsets[key + stop]]
+
+    def get_allocations_at(self, order_suborder_code: int, time_code: int) -> List[Tuple]:
+        """Gets the (order_suborder, time, employee_line) combinations of an order_suborder at a single time, see get_allocations().
+        """
+        return self.get_allocations(order_suborder_code, slice(time_code, time_code + 1))
+
+    def get_allocations_of(self, order_suborder_code: int, employee_line_code: int) -> List[Tuple]:
+        """Gets the (order_suborder, time, employee_line) combinations of an order_suborder and an employee_line, ordered by time.
+        """
+        time_codes = np.flatnonzero(self.mask[order_suborder_code, :, employee_line_code])
+        positions = self.offsets[order_suborder_code * self.shape[1] + time_codes] + self.mask[order_suborder_code, time_codes, :employee_line_code].sum(axis=1)
+        return [self.tuples[position] for position in positions]
+
+    def get_allocations_of_employee_line(self, time_code: int, employee_line_code: int) -> List[Tuple]:
+        """Gets the (order_suborder, time, employee_line) combinations of an employee_line at a single time, ordered by order_suborder.
+        """
+        if self._tuples_by_employee_line is None:
+            _, time_codes, employee_line_codes = self.codes
+            order = np.argsort(time_codes * self.shape[2] + employee_line_codes, kind='stable')
+            self._tuples_by_employee_line = [self.tuples[position] for position in order]
+            self._offsets_by_employee_line = np.concatenate([[0], np.cumsum(self.mask.sum(axis=0).ravel())])
+        key = time_code * self.shape[2] + employee_line_code
+        return self._tuples_by_employee_line[self._offsets_by_employee_line[key]:self._offsets_by_employee_line[key + 1]]
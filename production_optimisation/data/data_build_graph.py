@@ -0,0 +1,166 @@
+import hashlib
+from graphlib import TopologicalSorter, CycleError
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Union
+
+
+class Data_Build_Graph:
+    """The Data_Build_Graph schedules the steps that read and build dataframes. Every step is a node that declares its inputs: the names of other nodes
+    or of sources (like the sheets that are read). A node is build once all the nodes that are its inputs are build, so the order of the steps follows
+    from the inputs instead of from the order of a configuration. Nodes that do not depend on each other are build in parallel, in a pool of threads.
+
+    The result of every node is kept together with a key of its inputs: the key of a source is given when the graph is run, the key of a node is a hash
+    of its name and the keys of its inputs. If the graph is run again, a node of which the key did not change is skipped and keeps its previous result.
+    A node without inputs, or with an input of which the key is unknown (None), is always build.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        """Constructor of the Data_Build_Graph, which starts without nodes.
+
+        Args:
+            max_workers (int, optional): Maximum number of nodes that are build at the same time, 1 builds the nodes one by one in this thread. Defaults to 1.
+        """
+        self.max_workers = max(max_workers, 1)
+
+        self.nodes: Dict[str, List[str]] = {} # name -> inputs
+        self.build_functions: Dict[str, Callable[[], Any]] = {}
+
+        self.results: Dict[str, Any] = {} # Result of every node of the previous runs.
+        self.keys: Dict[str, str] = {} # Key of the inputs with which the result of a node was build.
+        self.built_nodes: List[str] = [] # Nodes that were build in the last run, the other nodes were skipped.
+
+    def add_node(self, name: str, inputs: List[str], build_function: Callable[[], Any]):
+        """Adds a node to the graph. If several nodes can be build at the same time, they are started in the order in which they are added.
+
+        Args:
+            name (str): Name of the node.
+            inputs (List[str]): Names of the nodes and sources that the node is build from. A node that changes a source with its own name (like a dataframe that
+                is completed from its read version) can list its own name, which then refers to the source.
+            build_function (Callable[[], Any]): Function that builds the node, its return value is the result of the node.
+
+        Raises:
+            ValueError: There is already a node with the name.
+        """
+        if name in self.nodes:
+            raise ValueError(f'There is already a node with the name ({name}) in the build graph: {list(self.nodes)}')
+        self.nodes[name] = list(inputs)
+        self.build_functions[name] = build_function
+
+
+    ### ORDER AND KEYS OF THE NODES
+    def get_node_inputs(self, name: str) -> List[str]:
+        """Gets the inputs of a node that are nodes themselves, so not the sources.
+        """
+        return [input_name for input_name in self.nodes[name] if input_name != name and input_name in self.nodes]
+
+    def get_order(self) -> List[str]:
+        """Gets the order in which the nodes are build one by one: every node comes after its inputs, and otherwise the nodes keep the order in which they are added.
+
+        Raises:
+            ValueError: The inputs of the nodes contain a cycle, so there is no order.
+
+        Returns:
+            List[str]: The names of the nodes in build order.
+        """
+        sorter = self._get_sorter()
+        order = []
+        ready_nodes = []
+        while sorter.is_active():
+            ready_nodes = sorted(ready_nodes + list(sorter.get_ready()), key=self._get_position)
+            name = ready_nodes.pop(0)
+            order.append(name)
+            sorter.done(name)
+        return order
+
+    def get_keys(self, source_keys: Dict[str, str]) -> Dict[str, Union[str, None]]:
+        """Gets the key of every node, a hash of its name and the keys of its inputs.
+
+        Args:
+            source_keys (Dict[str, str]): Key of every source, like the fingerprint of a sheet.
+
+        Raises:
+            ValueError: The inputs of the nodes contain a cycle.
+
+        Returns:
+            Dict[str, Union[str, None]]: The key of every node, None if the node has no inputs or if the key of one of its inputs is unknown.
+        """
+        keys = {}
+        for name in self.get_order():
+            input_keys = [
+                keys[input_name] if input_name != name and input_name in self.nodes else source_keys.get(input_name)
+                for input_name in self.nodes[name]
+                ]
+            keys[name] = None if not input_keys or None in input_keys else hashlib.sha256(repr((name, ) + tuple(input_keys)).encode()).hexdigest()
+        return keys
+
+    def get_key(self, name: str, source_keys: Dict[str, str]) -> Union[str, None]:
+        """Gets the key of a node, see get_keys().
+        """
+        return self.get_keys(source_keys)[name]
+
+    def is_changed(self, name: str, source_keys: Dict[str, str]) -> bool:
+        """Checks whether a node has to be build, because it has not been build yet or because the key of its inputs changed.
+        """
+        key = self.get_key(name, source_keys)
+        return key is None or name not in self.results or self.keys.get(name) != key
+
+
+    ### BUILDING THE NODES
+    def run(self, source_keys: Dict[str, str] = None) -> Dict[str, Any]:
+        """Builds the nodes of which the inputs changed since the previous run, every node after its inputs.
+
+        Args:
+            source_keys (Dict[str, str], optional): Key of every source, like the fingerprint of a sheet. Defaults to None, then all nodes are build.
+
+        Raises:
+            ValueError: The inputs of the nodes contain a cycle.
+
+        Returns:
+            Dict[str, Any]: The result of every node.
+        """
+        source_keys = source_keys or {}
+        # The key of a node changes if the key of one of its inputs changes, so a node that depends on a node that is build is build as well.
+        keys = self.get_keys(source_keys)
+        nodes_to_build = {name for name in self.nodes if keys[name] is None or name not in self.results or self.keys.get(name) != keys[name]}
+
+        self.built_nodes = []
+        def build(name: str):
+            if name in nodes_to_build:
+                self.results[name] = self.build_functions[name]()
+                self.keys[name] = keys[name]
+                self.built_nodes.append(name)
+
+        if self.max_workers == 1:
+            for name in self.get_order():
+                build(name)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                self._run_in_parallel(executor, build)
+
+        return {name: self.results[name] for name in self.nodes if name in self.results}
+
+
+    ### HELPER FUNCTIONS
+    def _get_sorter(self) -> TopologicalSorter:
+        sorter = TopologicalSorter({name: self.get_node_inputs(name) for name in self.nodes})
+        try:
+            sorter.prepare()
+        except CycleError as e:
+            raise ValueError(f'The inputs of the nodes of the build graph contain a cycle: {e.args[1]}') from e
+        return sorter
+
+    def _get_position(self, name: str) -> int:
+        return list(self.nodes).index(name)
+
+    def _run_in_parallel(self, executor: ThreadPoolExecutor, build: Callable[[str], None]):
+        # Starts every node as soon as its inputs are build.
+        sorter = self._get_sorter()
+        running = {}
+        while sorter.is_active():
+            for name in sorted(sorter.get_ready(), key=self._get_position):
+                running[executor.submit(build, name)] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result() # Raises the exception of a node that failed.
+                sorter.done(running.pop(future))
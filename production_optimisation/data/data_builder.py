@@ -6,18 +6,24 @@ from data.dataframe import Dataframe
 from data.dataframes import Dataframes
 from data.data_cleaner import Data_Cleaner
 from data.data_index import Data_Index
+from data.data_time_grid import Time_Grid
+from data.data_sparse_planning import Sparse_Planning
+from data.data_penalty import Data_Penalty, Penalty_Column_Cache
+from data.data_indicator import Data_Indicator
 
 from general_configuration import data_indexes_columns, old_planning_limit
 
 class Data_Builder:
-    def __init__(self, dataframes_class: Dataframes):
+    def __init__(self, dataframes_class: Dataframes, penalty_cache: Penalty_Column_Cache = None):
         """Constructor of the Data_Cuilder class
 
         Args:
             dataframes_class (Dataframes): All the dataframes to build from and add new dataframes to.
+            penalty_cache (Penalty_Column_Cache, optional): Penalty columns of a previous build, such that only the columns of new or changed orders are calculated. Defaults to None, then the builder starts an empty cache.
         """
         self.dataframes_class = dataframes_class
         self.dataframes = dataframes_class.dataframes
+        self.penalty_cache = penalty_cache if penalty_cache is not None else Penalty_Column_Cache()
 
         self.orders_df: Dataframe
         self.orders_found = False
@@ -49,45 +55,22 @@ class Data_Builder:
             new_dataframe_name = dataframe_info[0]
             keep_cols = dataframe_info[1]
             
-            copy_orders_df = self.orders_df.create_copy_for_new_dataframe(new_dataframe_name)
+            # The new dataframe is a view on the columns of the orders_df, so the orders are held once instead of once per built dataframe.
+            orders_columns = self.orders_df.get_pandas_dataframe().columns
+            view_cols = [col for col in orders_columns if col in keep_cols]
 
-            copy_orders_pandas_df = copy_orders_df.get_pandas_dataframe()
-
-            #keep_cols = data_builder_columns.get(data_builder_col)
-            drop_cols = [col for col in copy_orders_pandas_df.columns if col not in keep_cols]
-
-            new_pandas_dataframe = copy_orders_df.get_pandas_dataframe().drop(columns=drop_cols)
-
-            copy_orders_df.change_pandas_dataframe(new_pandas_dataframe)
-
-            new_dataframe = copy_orders_df
+            new_dataframe = self.orders_df.create_view_for_new_dataframe(new_dataframe_name, view_cols)
             self.dataframes_class.append_dataframe(new_dataframe)
 
 
     def build_old_and_manual_planning_df(self):
-        manual_planning_df = self.dataframes_class.get_dataframe_by_name('manual_planning_df').get_pandas_dataframe().copy()
-        old_planning_df = self.dataframes_class.get_dataframe_by_name('old_planning_df').get_pandas_dataframe().copy()
-
-        if not old_planning_df.empty:
-
-            old_index = old_planning_df.index.names
-            old_planning_df = old_planning_df.reset_index()
+        manual_planning_df = self.dataframes_class.get_dataframe_by_name('manual_planning_df').get_pandas_dataframe()
+        old_planning_df = self.dataframes_class.get_dataframe_by_name('old_planning_df').get_pandas_dataframe()
 
-            condition_old = old_planning_df['time'] <= pd.to_datetime(old_planning_limit, format='%d-%m-%Y %H:%M:%S')
-            old_planning_df = old_planning_df[condition_old].set_index(old_index)
-
-            old_planning_df = old_planning_df['allocation']
-
-        if not manual_planning_df.empty and not old_planning_df.empty:
-            combined_df = pd.concat([old_planning_df, manual_planning_df], join='outer')
-        elif manual_planning_df.empty and not old_planning_df.empty:
-            combined_df = old_planning_df
-        elif not manual_planning_df.empty and old_planning_df.empty:
-            combined_df = manual_planning_df
-        else:
-            combined_df = None
-        
-        combined_df = combined_df.drop_duplicates(keep='first')
+        # Only the old allocations up to the old_planning_limit are kept. A combination that is in both plannings gets the manual allocation, see Sparse_Planning.merge().
+        manual_planning = Sparse_Planning.from_series(manual_planning_df)
+        old_planning = Sparse_Planning.from_series(old_planning_df).filter_time(Time_Grid.parse_time(old_planning_limit))
+        combined_df = manual_planning.merge(old_planning).to_series()
 
         old_and_manual_df = Dataframe(self.excel_file, 'old_and_manual_planning_df', None)
         old_and_manual_df.change_pandas_dataframe(combined_df)
@@ -98,16 +81,21 @@ class Data_Builder:
     def build_penalty_df(self):
         dates_df = self.dataframes_class.get_dataframe_by_name('dates_df').get_pandas_dataframe()
         revenue_df = self.dataframes_class.get_dataframe_by_name('revenue_df').get_pandas_dataframe()
-        time_req_df = self.dataframes_class.get_dataframe_by_name('time_req_df').get_pandas_dataframe()
         
-        time_index = Data_Index(self.dataframes_class).get_index_set('time')
-        orders_index = Data_Index(self.dataframes_class).get_orders_set()
-
-        penalty_df = pd.DataFrame(index=time_index, columns=orders_index)
-
-        for ti in time_index:
-            for order in orders_index:
-                penalty_df.loc[ti, order] = self.calc_penalty(ti=ti, order=order, dates_df=dates_df, revenue_df=revenue_df, time_req_df=time_req_df)
+        indexer = Data_Index(self.dataframes_class)
+        time_index = indexer.get_catalog().get_set('time')
+        orders_index = indexer.get_orders_set()
+
+        # The whole penalty matrix is calculated at once, with the same penalty as calc_penalty(). See Data_Penalty.
+        # Only the columns of new or changed orders and the rows of new time intervals are calculated, the others are taken from the penalty cache.
+        penalty_df = Data_Penalty.calc_penalty_dataframe(
+            time_index=time_index, 
+            order_suborder_index=orders_index, 
+            date_start=dates_df.iloc[:, 0], 
+            date_deadline=dates_df.iloc[:, 1], 
+            revenue=revenue_df.iloc[:, 0],
+            penalty_cache=self.penalty_cache
+            )
 
         penalty = Dataframe(self.excel_file, 'penalty', None)
         penalty.change_pandas_dataframe(penalty_df)
@@ -139,13 +127,13 @@ class Data_Builder:
 
     def build_complete_index_sets_df(self):
         if self.index_df_found and self.orders_found:
-            indexer = Data_Index(self.dataframes_class)
+            # The index sets of the read index_sets_df are read once, see Data_Index.get_catalog().
+            index_catalog = Data_Index(self.dataframes_class).get_catalog()
 
-            index_pandas_df = self.index_df.get_pandas_dataframe()
             orders_pandas_df = self.orders_df.get_pandas_dataframe()
 
-            employee_line = indexer.get_index_set('employee')
-            employee_line.extend(indexer.get_index_set('line'))
+            employee_line = index_catalog.get_index_set('employee')
+            employee_line.extend(index_catalog.get_index_set('line'))
             order_suborder = orders_pandas_df.index.to_list()
             
 
@@ -153,8 +141,8 @@ class Data_Builder:
 
             for idx in index_dict.keys():
                 try:
-                    if indexer.get_index_set(idx) != []:
-                        index_dict[idx] = indexer.get_index_set(idx)
+                    if index_catalog.get_size(idx) != 0:
+                        index_dict[idx] = index_catalog.get_index_set(idx)
                     else:
                         if idx == 'employee_line':
                             index_dict[idx] = employee_line
@@ -172,20 +160,13 @@ class Data_Builder:
             new_dataframe_name = dataframe_info[0]
             keep_cols = dataframe_info[1]
 
-            copy_orders_df = self.orders_df.create_copy_for_new_dataframe(new_dataframe_name)
-
-            copy_orders_pandas_df = copy_orders_df.get_pandas_dataframe()
-
-            #keep_cols = data_builder_columns.get(data_builder_col)
-            drop_cols = [col for col in copy_orders_pandas_df.columns if col not in keep_cols]
+            orders_columns = self.orders_df.get_pandas_dataframe().columns
+            view_cols = [col for col in orders_columns if col in keep_cols]
 
-            new_pandas_dataframe = copy_orders_df.get_pandas_dataframe().drop(columns=drop_cols)
+            copy_orders_df = self.orders_df.create_view_for_new_dataframe(new_dataframe_name, view_cols)
 
-            for idx in new_pandas_dataframe.index:
-                if new_pandas_dataframe.loc[idx].iloc[0] == 1 or new_pandas_dataframe.loc[idx].iloc[0] == True:
-                    new_pandas_dataframe.loc[idx] = True
-                else:
-                    new_pandas_dataframe.loc[idx] = False
+            # The indicator is a new (boolean) column, so the view on the orders_df is not changed.
+            new_pandas_dataframe = Data_Indicator.calc_indicator_dataframe(copy_orders_df.get_pandas_dataframe())
 
             copy_orders_df.change_pandas_dataframe(new_pandas_dataframe)
 
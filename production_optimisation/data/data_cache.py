@@ -0,0 +1,255 @@
+import os
+import pickle
+import hashlib
+import zipfile
+import posixpath
+import pandas as pd
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Union
+
+from data.dataframe import Dataframe
+from data.data_source import BaseDataSource
+
+import general_configuration
+
+
+class Data_Cache:
+    """The Data_Cache class stores the read, cleaned and build Dataframes of a Data_process on disk.
+    Every step of the process (reading a sheet, building a dataframe) is a 'node' with its own entries. An entry is keyed by the fingerprints
+    of the sheets that the step uses and by a hash of the configuration that is used to read, clean and build the Dataframes.
+    So, if a sheet changes, only the steps that use the sheet have to be done again, all other steps can be loaded from the cache.
+    """
+    # Increase when the format of the stored entries changes, such that old entries are no longer used.
+    cache_version = 3
+
+    namespace_main = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+    namespace_relationships = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+    namespace_package_relationships = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+    def __init__(self, path_cache_directory: str, max_entries: int = 5):
+        """Constructor of the Data_Cache.
+
+        Args:
+            path_cache_directory (str): Directory in which the entries are stored, it is created if it does not exist.
+            max_entries (int, optional): Maximum number of stored entries per node, the oldest entries are removed first. Defaults to 5.
+        """
+        self.path_cache_directory = path_cache_directory
+        self.max_entries = max_entries
+
+        self.configuration_hash = self.get_configuration_hash()
+
+
+    def get_key(self, *parts) -> str:
+        """Gets the key of an entry, given the parts (like fingerprints of sheets) that identify the entry and the current configuration.
+
+        Returns:
+            str: Hash of the parts and of the configuration.
+        """
+        return hashlib.sha256(repr((self.configuration_hash, ) + parts).encode()).hexdigest()
+
+
+    def get_configuration_hash(self) -> str:
+        """Gets a hash of the configuration that determines how the Dataframes are read, cleaned and build.
+
+        Returns:
+            str: Hash of the configuration.
+        """
+        configuration = (
+            self.cache_version,
+            pd.__version__,
+            general_configuration.dfs,
+            general_configuration.df_reader_helper,
+            general_configuration.sheet_types,
+            general_configuration.description_order_df,
+            general_configuration.dfs_to_build_columnBased,
+            general_configuration.dfs_to_build_indicatorBased,
+            general_configuration.dfs_build_inputs,
+            general_configuration.data_indexes_columns,
+            general_configuration.old_planning_limit
+        )
+        return hashlib.sha256(repr(configuration).encode()).hexdigest()
+
+
+    @classmethod
+    def get_data_source_fingerprints(cls, pandas_excel_file: Union[pd.ExcelFile, BaseDataSource]) -> Dict[str, str]:
+        """Gets a fingerprint of every sheet in the ExcelFile or in another data source (see data_source.py).
+
+        Args:
+            pandas_excel_file (Union[pd.ExcelFile, BaseDataSource]): The ExcelFile or data source.
+
+        Returns:
+            Dict[str, str]: Fingerprint per sheet name.
+        """
+        if isinstance(pandas_excel_file, BaseDataSource):
+            return pandas_excel_file.get_sheet_fingerprints()
+        return cls.get_sheet_fingerprints(pandas_excel_file.io)
+
+
+    @classmethod
+    def get_sheet_fingerprints(cls, path_excel_file: str) -> Dict[str, str]:
+        """Gets a fingerprint of every sheet in the ExcelFile, without opening the workbook in pandas or openpyxl.
+        An .xlsx/.xlsm file is a zip archive with a xml part per sheet. The fingerprint of a sheet is a hash of its xml part together with the parts
+        that are shared by all sheets (the shared strings and the styles, which determine whether a number is a date). 
+        So, the fingerprint of a sheet only changes if the content of that sheet (or of the shared parts) changes.
+
+        Args:
+            path_excel_file (str): Path to the ExcelFile.
+
+        Returns:
+            Dict[str, str]: Fingerprint per sheet name, in the order of the sheets in the ExcelFile.
+        """
+        with zipfile.ZipFile(path_excel_file) as archive:
+            workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+            relationships = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+
+            # Map the relationship ids to the paths of the parts in the archive.
+            targets = {}
+            shared_parts = []
+            for relationship in relationships.iter(f'{cls.namespace_package_relationships}Relationship'):
+                target = relationship.get('Target')
+                target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+                targets[relationship.get('Id')] = target
+
+                if relationship.get('Type').endswith(('/sharedStrings', '/styles')):
+                    shared_parts.append(target)
+
+            shared_hasher = hashlib.sha256()
+            workbook_properties = workbook.find(f'{cls.namespace_main}workbookPr')
+            shared_hasher.update(repr(workbook_properties.get('date1904') if workbook_properties is not None else None).encode())
+            for part in sorted(shared_parts):
+                shared_hasher.update(archive.read(part))
+            shared_fingerprint = shared_hasher.hexdigest()
+
+            fingerprints = {}
+            for sheet in workbook.iter(f'{cls.namespace_main}sheet'):
+                hasher = hashlib.sha256(shared_fingerprint.encode())
+                hasher.update(archive.read(targets[sheet.get(f'{cls.namespace_relationships}id')]))
+                fingerprints[sheet.get('name')] = hasher.hexdigest()
+
+        return fingerprints
+
+
+    def load(self, node: str, key: str) -> Union[dict, None]:
+        """Loads the entry of {node} stored under {key}.
+
+        Args:
+            node (str): Name of the step of the process, like 'read_Planning'.
+            key (str): Key of the entry.
+
+        Returns:
+            Union[dict, None]: The stored entry, or None if there is no (readable) entry for the key.
+        """
+        path_entry = self._get_path_entry(node, key)
+
+        if not os.path.isfile(path_entry):
+            return None
+
+        try:
+            with open(path_entry, 'rb') as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            print(f'The cache entry ({path_entry}) could not be loaded and is ignored: {e}')
+            return None
+
+
+    def store(self, node: str, key: str, entry: dict):
+        """Stores the entry of {node} under {key}. Then removes the oldest entries of the node if there are more than {max_entries} entries.
+
+        Args:
+            node (str): Name of the step of the process, like 'read_Planning'.
+            key (str): Key of the entry.
+            entry (dict): Entry to store, should be picklable.
+        """
+        os.makedirs(self._get_path_node(node), exist_ok=True)
+        path_entry = self._get_path_entry(node, key)
+
+        # Write to a temporary file first, such that an interrupted run never leaves a corrupt entry behind.
+        path_temporary = f'{path_entry}.tmp'
+        with open(path_temporary, 'wb') as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path_temporary, path_entry)
+
+        self._remove_oldest_entries(node)
+
+
+    def clear(self):
+        """Removes all the stored entries.
+        """
+        if not os.path.isdir(self.path_cache_directory):
+            return
+        for node in os.listdir(self.path_cache_directory):
+            for path_entry in self._get_paths_entries(node):
+                os.remove(path_entry)
+
+
+    ### CONVERTING DATAFRAMES TO STORABLE RECORDS
+    @staticmethod
+    def dataframe_to_record(dataframe: Dataframe) -> dict:
+        """Converts a Dataframe to a record, which contains everything needed to recreate the Dataframe, except for the ExcelFile.
+
+        Args:
+            dataframe (Dataframe): Dataframe to convert.
+
+        Returns:
+            dict: The record of the Dataframe.
+        """
+        return {
+            'dataframe_name': dataframe.dataframe_name,
+            'excel_sheet_name': dataframe.excel_sheet_name,
+            'cleaned': dataframe.get_cleaned_status(),
+            'pandas_dataframe': dataframe.pandas_dataframe
+        }
+
+    @staticmethod
+    def record_to_dataframe(record: dict, pandas_excel_file: pd.ExcelFile) -> Dataframe:
+        """Recreates a Dataframe from its record.
+
+        Args:
+            record (dict): Record of the Dataframe.
+            pandas_excel_file (pd.ExcelFile): The ExcelFile in which the dataframe is placed.
+
+        Returns:
+            Dataframe: The recreated Dataframe.
+        """
+        dataframe = Dataframe(
+            pandas_excel_file=pandas_excel_file,
+            dataframe_name=record['dataframe_name'],
+            excel_sheet_name=record['excel_sheet_name']
+            )
+        # Set the pandas dataframe directly, since change_pandas_dataframe() would alter the stored values.
+        dataframe.pandas_dataframe = record['pandas_dataframe']
+        if record['cleaned']:
+            dataframe.change_status_to_cleaned()
+
+        return dataframe
+
+    @staticmethod
+    def dataframes_to_records(dataframes: List[Dataframe]) -> List[dict]:
+        return [Data_Cache.dataframe_to_record(dataframe) for dataframe in dataframes]
+
+    @staticmethod
+    def records_to_dataframes(records: List[dict], pandas_excel_file: pd.ExcelFile) -> List[Dataframe]:
+        return [Data_Cache.record_to_dataframe(record, pandas_excel_file) for record in records]
+
+
+    ### HELPER FUNCTIONS
+    def _get_path_node(self, node: str) -> str:
+        return os.path.join(self.path_cache_directory, node)
+
+    def _get_path_entry(self, node: str, key: str) -> str:
+        return os.path.join(self._get_path_node(node), f'{key}.pickle')
+
+    def _get_paths_entries(self, node: str) -> List[str]:
+        path_node = self._get_path_node(node)
+        if not os.path.isdir(path_node):
+            return []
+        return [
+            os.path.join(path_node, file_name)
+            for file_name in os.listdir(path_node)
+            if file_name.endswith('.pickle')
+            ]
+
+    def _remove_oldest_entries(self, node: str):
+        paths_entries = sorted(self._get_paths_entries(node), key=os.path.getmtime, reverse=True)
+        for path_entry in paths_entries[self.max_entries:]:
+            os.remove(path_entry)
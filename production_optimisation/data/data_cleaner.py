@@ -2,6 +2,7 @@ import pandas as pd
 import contextlib
 
 from data.dataframe import Dataframe
+from data.column_cleaner import Column_Cleaner
 from general_configuration import description_order_df, sheet_types
 
 class Data_Cleaner:
@@ -58,7 +59,8 @@ class Data_Cleaner:
         """Function to clean the index_sets_dataframe
         """
         if not self.dataframe.get_cleaned_status():
-            self.pandas_df = self.pandas_df.applymap(self.clean_index_sets_elements)
+            # Strings to uppercase, timestamps are kept, floats to integers and other non-empty elements to None. See Column_Cleaner.
+            self.pandas_df = Column_Cleaner.clean_index_sets_dataframe(self.pandas_df)
     
             self.dataframe.change_pandas_dataframe(self.pandas_df)
             self.dataframe.change_status_to_cleaned()
@@ -70,8 +72,14 @@ class Data_Cleaner:
         if not self.dataframe.get_cleaned_status():
             self.columns_to_clean = self.pandas_df.columns.drop(description_order_df)
 
-            for col in self.pandas_df.columns:
-                self.pandas_df[col] = self.pandas_df[col].apply(lambda x: self.clean_orders_elements(x, col))
+            # The columns that are typed and normalised by the schema of the sheet are already clean.
+            schema = self.dataframe.schema
+            if schema is not None:
+                self.columns_to_clean = pd.Index([col for col in self.columns_to_clean if not schema.is_normalised(col)])
+
+            # Strings to uppercase, other elements are kept. See Column_Cleaner.
+            for col in self.columns_to_clean:
+                self.pandas_df[col] = Column_Cleaner.uppercase_strings(self.pandas_df[col])
             
             self.pandas_df = self.pandas_df[self.pandas_df.index != '']
             
@@ -80,48 +88,6 @@ class Data_Cleaner:
             self.dataframe.change_status_to_cleaned()
 
 
-    # Helper functions for cleaning:
-    def clean_index_sets_elements(self, element):
-        """Cleans the elements in a index list. Only apply this function on index lists. 
-        Because if the list has floats with non zero decimals, then those decimals are neglected by the int() function.
-
-        Args:
-            element (_type_): Element to be cleaned from index list
-
-        Returns:
-            'cleaned element': Either a cleaned element or the old element''
-        """
-        if element: # Removes Empty / None elements.
-            if pd.notna(element) and isinstance(element, str):
-                return element.upper()
-            elif pd.notna(element) and isinstance(element, pd.Timestamp):
-                return element
-            elif pd.notna(element) and isinstance(element, float):
-                return int(element)
-        else:
-            return element
-
-
-    def clean_orders_elements(self, element, column_name):
-        """Cleans the elements of the orders_df per column. Only apply this function on the orders_df.
-        Otherwise datapoint might change. 
-
-        Args:
-            element (_type_): Element to be cleaned in orders_df
-            column_name (_type_): Column of orders_df that must be cleaned.
-
-        Returns:
-            'cleaned element': Either a cleaned element or the old element
-        """
-        if element: 
-            if pd.notna(element) and isinstance(element, str) and column_name in self.columns_to_clean:
-                return element.upper()
-            else:
-                return element
-        else:
-            return element         
-        
-    
     def change_df_index_to_one(self):
         """Changes the index of a dataframe to the first column.
         """
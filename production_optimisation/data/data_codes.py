@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from data.data_sparse_planning import Sparse_Planning
+
+
+class Data_Codes:
+    """The Data_Codes class assigns stable integer codes to the labels of the index sets, such as order_suborder, suborder, employee_line and time.
+    The code of a label is its position in the index set, so the codes do not change as long as the index sets do not change.
+
+    The tables of the model (orders, skills, availability, penalty and planning) can be encoded with these codes into numpy arrays,
+    such that looking up a value becomes array indexing instead of looking up (string) labels in a pandas index with .loc.
+    """
+
+    coded_index_sets = ['order_suborder', 'order', 'suborder', 'time', 'employee_line'] # Index sets that get codes, strings should be from 'data_indexes_columns'.
+
+    def __init__(self, index_sets: Dict[str, list]):
+        """Constructor of the Data_Codes class.
+
+        Args:
+            index_sets (Dict[str, list]): The labels per index set, like {'order_suborder': ['51124_MAG', ...], 'time': [...], ...}. The code of a label is its position in the list.
+
+        Raises:
+            ValueError: An index set contains a label more than once, such that the label has no unique code.
+        """
+        self.labels: Dict[str, pd.Index] = {} # code -> label
+        self.codes: Dict[str, Dict] = {} # label -> code
+
+        for index_set_type, labels in index_sets.items():
+            labels = pd.Index(labels)
+            if not labels.is_unique:
+                raise ValueError(f'The index set ({index_set_type}) contains labels more than once, so they cannot get a unique code: {labels[labels.duplicated()].to_list()}')
+            self.labels[index_set_type] = labels
+            self.codes[index_set_type] = {label: code for code, label in enumerate(labels)}
+
+    @classmethod
+    def from_data_index(cls, data_index) -> 'Data_Codes':
+        """Creates the codes of the index sets of a Data_Index object.
+
+        Args:
+            data_index (Data_Index): Data_Index with the index sets.
+
+        Returns:
+            Data_Codes: The codes of the index sets.
+        """
+        return cls({index_set_type: data_index.get_index_set(index_set_type) for index_set_type in cls.coded_index_sets})
+
+
+    ### MAPS BETWEEN LABELS AND CODES
+    def get_labels(self, index_set_type: str) -> pd.Index:
+        """Gets the labels of an index set, the position of a label is its code (code -> label).
+
+        Args:
+            index_set_type (str): Name of the index set, like 'order_suborder'.
+
+        Returns:
+            pd.Index: The labels of the index set.
+        """
+        return self.labels[index_set_type]
+
+    def get_codes(self, index_set_type: str) -> Dict:
+        """Gets the codes of an index set (label -> code).
+
+        Args:
+            index_set_type (str): Name of the index set, like 'order_suborder'.
+
+        Returns:
+            Dict: The code per label.
+        """
+        return self.codes[index_set_type]
+
+    def get_size(self, index_set_type: str) -> int:
+        """Gets the number of labels (and codes) of an index set.
+        """
+        return len(self.labels[index_set_type])
+
+    def encode(self, index_set_type: str, labels, missing_code: int = None) -> np.ndarray:
+        """Encodes labels into their codes.
+
+        Args:
+            index_set_type (str): Name of the index set of the labels.
+            labels (array-like): Labels to encode.
+            missing_code (int, optional): Code for labels that are not in the index set. Defaults to None, then these labels raise a KeyError.
+
+        Raises:
+            KeyError: Some labels are not in the index set and no {missing_code} is given.
+
+        Returns:
+            np.ndarray: The codes of the labels.
+        """
+        codes = self.labels[index_set_type].get_indexer(labels)
+
+        is_missing = codes == -1
+        if is_missing.any():
+            if missing_code is None:
+                raise KeyError(f'The labels {list(pd.Index(labels)[is_missing])} are not in the index set ({index_set_type}).')
+            codes[is_missing] = missing_code
+        return codes
+
+    def decode(self, index_set_type: str, codes) -> pd.Index:
+        """Decodes codes into their labels.
+
+        Args:
+            index_set_type (str): Name of the index set of the codes.
+            codes (array-like): Codes to decode.
+
+        Returns:
+            pd.Index: The labels of the codes.
+        """
+        return self.labels[index_set_type].take(codes)
+
+
+    ### TABLES KEYED BY CODES
+    def encode_series(self, series: pd.Series, index_set_type: str) -> np.ndarray:
+        """Encodes a column that is indexed by the labels of an index set into an array that is indexed by their codes, like array[order_suborder_code].
+
+        Args:
+            series (pd.Series): Column to encode, for a dataframe with one column (like the time_req_df) select the column first.
+            index_set_type (str): Name of the index set of the index of the column.
+
+        Raises:
+            KeyError: A label of the index set is not in the index of the column.
+
+        Returns:
+            np.ndarray: The values of the column in the order of the codes.
+        """
+        positions = self._get_positions(series.index, index_set_type)
+        return series.to_numpy()[positions]
+
+    def encode_dataframe(self, dataframe: pd.DataFrame, index_set_type: str, columns_set_type: str) -> np.ndarray:
+        """Encodes a dataframe that is indexed by the labels of two index sets into a 2D array that is indexed by their codes, like array[time_code, employee_line_code].
+
+        Args:
+            dataframe (pd.DataFrame): Dataframe to encode, like the availability_df.
+            index_set_type (str): Name of the index set of the index of the dataframe (the rows).
+            columns_set_type (str): Name of the index set of the columns of the dataframe.
+
+        Raises:
+            KeyError: A label of the index sets is not in the index or the columns of the dataframe.
+
+        Returns:
+            np.ndarray: The values of the dataframe in the order of the codes.
+        """
+        rows = self._get_positions(dataframe.index, index_set_type)
+        columns = self._get_positions(dataframe.columns, columns_set_type)
+        return dataframe.to_numpy()[np.ix_(rows, columns)]
+
+    def encode_planning(self, planning: pd.Series, index_set_types: List[str] = ['order_suborder', 'time', 'employee_line']) -> Sparse_Planning:
+        """Encodes a planning, a series of allocations with a (order_suborder, time, empl_line) multiindex, into a Sparse_Planning with the codes of the index sets.
+        A planning is sparse, so only the planned combinations are kept, allocations of labels that are not in the index sets are left out.
+        If a combination is planned more than once, the first allocation is kept.
+
+        Args:
+            planning (pd.Series): Planning to encode, like the old_planning_df.
+            index_set_types (List[str], optional): Names of the index sets of the levels of the multiindex. Defaults to ['order_suborder', 'time', 'employee_line'].
+
+        Returns:
+            Sparse_Planning: The planning, of which get() gives the allocation of a (order_suborder_code, time_code, employee_line_code) combination.
+        """
+        levels = [self.labels[index_set_type] for index_set_type in index_set_types]
+        return Sparse_Planning.from_series(planning, levels).drop_duplicates()
+
+
+    ### HELPER FUNCTIONS
+    def _get_positions(self, index: pd.Index, index_set_type: str) -> np.ndarray:
+        # Positions in {index} of the labels of the index set, in the order of their codes. Like .loc[label].iloc[0], the first row of a label is used.
+        is_first = ~index.duplicated(keep='first')
+        positions = index[is_first].get_indexer(self.labels[index_set_type])
+        if (positions == -1).any():
+            missing_labels = self.labels[index_set_type][positions == -1].to_list()
+            raise KeyError(f'The labels {missing_labels} of the index set ({index_set_type}) are not found in the index: {index.to_list()}')
+        return np.flatnonzero(is_first)[positions]
@@ -0,0 +1,53 @@
+import pandas as pd
+from typing import List, Union
+
+
+class Data_Columns:
+    """The Data_Columns class is a columnar store of a dataframe, like the orders_df. Every column is held once, by the dataframe of the store.
+    The dataframes that consist of some of its columns (like the dates_df or time_req_df) are views on these columns instead of copies,
+    so building them takes no time and no memory.
+
+    Note: A view shares its columns with the store and the other views. So a view should only be read, a dataframe that changes the values
+    of its columns (like an indicator) should copy its columns first.
+    """
+
+    def __init__(self, pandas_dataframe: pd.DataFrame):
+        """Constructor of the Data_Columns class.
+
+        Args:
+            pandas_dataframe (pd.DataFrame): The dataframe that holds the columns.
+        """
+        self.pandas_dataframe = pandas_dataframe
+        self.index = pandas_dataframe.index
+
+
+    def get_column(self, column: str) -> pd.Series:
+        """Gets a column of the store, without copying it.
+
+        Args:
+            column (str): Name of the column.
+
+        Returns:
+            pd.Series: The column.
+        """
+        return self.pandas_dataframe[column]
+
+    def get_view(self, columns: Union[List[str], str]) -> pd.DataFrame:
+        """Gets a dataframe with some of the columns of the store, without copying the columns. The dataframe has the index of the store.
+
+        Args:
+            columns (Union[List[str], str]): Names of the columns, in the order of the returned dataframe.
+
+        Raises:
+            KeyError: A column is not in the store.
+
+        Returns:
+            pd.DataFrame: The view on the columns.
+        """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+
+        missing_columns = [column for column in columns if column not in self.pandas_dataframe.columns]
+        if missing_columns:
+            raise KeyError(f'The columns {missing_columns} are not found in the columns of the store: {self.pandas_dataframe.columns.to_list()}')
+
+        return pd.DataFrame({column: self.pandas_dataframe[column] for column in columns}, index=self.index, copy=False)
@@ -0,0 +1,125 @@
+import numpy as np
+from typing import Tuple
+
+
+class Data_Feasibility:
+    """The Data_Feasibility class holds the availability (time x employee_line), the skills (employee_line x suborder) and the line compatibility
+    (order_suborder x employee_line) as bitsets: booleans packed 8 per byte along the employee_line axis, see np.packbits. All arrays are indexed by codes (see Data_Codes).
+
+    An allocation (order_suborder, time, employee_line) is feasible if the employee_line is available at the time, is skilled for the suborder of the order_suborder,
+    and may perform the order_suborder: employees do not perform orders on a line, lines do not perform the other orders, and an order with a specific line is only
+    performed on that line. The feasible allocations follow from one broadcast AND of the bitsets, and the number of feasible allocations (the capacity) is counted
+    with a popcount of the bytes, instead of checking every combination.
+    """
+
+    popcount_table = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8) # Number of bits that are set, per byte.
+
+    def __init__(
+            self,
+            availability_array: np.ndarray,
+            skills_array: np.ndarray,
+            suborder_code_array: np.ndarray,
+            exec_on_line_array: np.ndarray,
+            is_line_array: np.ndarray,
+            is_employee_array: np.ndarray,
+            has_specific_line_array: np.ndarray,
+            specific_line_code_array: np.ndarray
+            ):
+        """Constructor of the Data_Feasibility class. The availability and skills are binary (0/1), every value above 0 counts as available or skilled.
+
+        Args:
+            availability_array (np.ndarray): Availability, [time, employee_line].
+            skills_array (np.ndarray): Skills, [employee_line, suborder].
+            suborder_code_array (np.ndarray): The suborder code of every order_suborder, [order_suborder].
+            exec_on_line_array (np.ndarray): Whether an order_suborder is performed on a line, [order_suborder].
+            is_line_array (np.ndarray): Whether an employee_line is a line, [employee_line].
+            is_employee_array (np.ndarray): Whether an employee_line is an employee, [employee_line].
+            has_specific_line_array (np.ndarray): Whether an order_suborder has a specific line, [order_suborder].
+            specific_line_code_array (np.ndarray): The employee_line code of the specific line of every order_suborder, -1 if it has none, [order_suborder].
+        """
+        self.number_of_employee_lines = availability_array.shape[1]
+        self.suborder_code_array = np.asarray(suborder_code_array)
+
+        is_line = np.asarray(is_line_array, dtype=bool)
+        is_employee = np.asarray(is_employee_array, dtype=bool)
+        exec_on_line = np.asarray(exec_on_line_array, dtype=bool)[:, None]
+        is_specific_line = np.asarray(specific_line_code_array)[:, None] == np.arange(self.number_of_employee_lines)[None, :]
+
+        compatible = ~(exec_on_line & is_employee) & ~(~exec_on_line & is_line) # [order_suborder, employee_line]
+        compatible &= ~np.asarray(has_specific_line_array, dtype=bool)[:, None] | is_specific_line
+
+        self.availability_bits = self.pack(availability_array > 0) # [time, bytes of employee_line]
+        self.skills_bits = self.pack(np.asarray(skills_array).T > 0) # [suborder, bytes of employee_line]
+        self.compatible_bits = self.pack(compatible) # [order_suborder, bytes of employee_line]
+
+        # Employee_lines that are skilled for the suborder of, and compatible with, every order_suborder. [order_suborder, bytes of employee_line]
+        self.assignable_bits = self.compatible_bits & self.skills_bits[self.suborder_code_array]
+
+
+    ### BITSETS
+    @staticmethod
+    def pack(mask: np.ndarray) -> np.ndarray:
+        """Packs a boolean array along its last (employee_line) axis, 8 booleans per byte.
+        """
+        return np.packbits(np.asarray(mask, dtype=bool), axis=-1)
+
+    def unpack(self, bits: np.ndarray) -> np.ndarray:
+        """Unpacks a bitset along its last axis into a boolean array with a value per employee_line.
+        """
+        return np.unpackbits(bits, axis=-1, count=self.number_of_employee_lines).astype(bool)
+
+    @classmethod
+    def popcount(cls, bits: np.ndarray, axis=-1) -> np.ndarray:
+        """Counts the bits that are set in a bitset, summed over the given axis (or axes).
+        """
+        return cls.popcount_table[bits].sum(axis=axis, dtype=np.int64)
+
+
+    ### FEASIBILITY MASKS
+    def get_feasible_bits(self) -> np.ndarray:
+        """Gets the feasible allocations as a bitset: [order_suborder, time, bytes of employee_line].
+        """
+        return self.assignable_bits[:, None, :] & self.availability_bits[None, :, :]
+
+    def get_feasible_mask(self) -> np.ndarray:
+        """Gets whether every allocation is feasible: [order_suborder, time, employee_line] (bool).
+        """
+        return self.unpack(self.get_feasible_bits())
+
+    def is_feasible(self, order_suborder_codes: np.ndarray, time_codes: np.ndarray, employee_line_codes: np.ndarray) -> np.ndarray:
+        """Checks for many allocations at once whether they are feasible.
+
+        Args:
+            order_suborder_codes (np.ndarray): The order_suborder codes of the allocations.
+            time_codes (np.ndarray): The time codes of the allocations.
+            employee_line_codes (np.ndarray): The employee_line codes of the allocations.
+
+        Returns:
+            np.ndarray: Whether each allocation is feasible (bool).
+        """
+        byte, bit = np.divmod(np.asarray(employee_line_codes), 8)
+        feasible_bytes = self.assignable_bits[order_suborder_codes, byte] & self.availability_bits[time_codes, byte]
+        return (feasible_bytes >> (7 - bit).astype(np.uint8)) & 1 == 1
+
+
+    ### CAPACITIES
+    def get_capacity_per_suborder(self) -> np.ndarray:
+        """Gets the number of (time, employee_line) combinations where an employee_line is available and skilled for a suborder: [suborder].
+        """
+        return self.popcount(self.availability_bits[None, :, :] & self.skills_bits[:, None, :], axis=(1, 2))
+
+    def get_capacity_per_order_suborder(self) -> np.ndarray:
+        """Gets the number of feasible (time, employee_line) combinations of every order_suborder: [order_suborder].
+        """
+        return self.popcount(self.get_feasible_bits(), axis=(1, 2))
+
+    def get_capacity(self) -> int:
+        """Gets the number of (time, employee_line) combinations where an employee_line is available.
+        """
+        return int(self.popcount(self.availability_bits, axis=None))
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """The shape of the feasible mask: (order_suborder, time, employee_line).
+        """
+        return (len(self.assignable_bits), len(self.availability_bits), self.number_of_employee_lines)
@@ -1,8 +1,8 @@
-import pandas as pd
-
 from data.dataframe import Dataframe
 from data.dataframes import Dataframes
-from general_configuration import data_indexes_columns, dfs
+from data.data_codes import Data_Codes
+from data.data_index_catalog import Index_Catalog
+from general_configuration import dfs
 
 class Data_Index(Dataframes):
     def __init__(self, dataframes: Dataframes):
@@ -18,15 +18,29 @@ class Data_Index(Dataframes):
 
 
     def get_index_set(self, index_set_type: str):
-        index_set_name = data_indexes_columns.get(index_set_type)
-        
-        if isinstance(self.index_df.get_pandas_dataframe(), pd.DataFrame):
-            index_set = self.index_df.get_pandas_dataframe()[index_set_name].to_list()
-        else:
-            #print(self.index_df.get_pandas_dataframe())
-            index_set = self.index_df.get_pandas_dataframe()[index_set_type]
-        index_set = [idx for idx in index_set if idx != '']
-        return index_set
+        return self.get_catalog().get_index_set(index_set_type)
+    
+
+    def get_catalog(self) -> Index_Catalog:
+        """Gets the catalog of the index sets, see Index_Catalog. The catalog is read once per version of the index_sets_df: it is kept by the index_sets_df,
+        and only read again once the pandas dataframe of the index_sets_df is changed (like when it is completed).
+
+        Returns:
+            Index_Catalog: The catalog of the index sets.
+        """
+        index_pandas_df = self.index_df.get_pandas_dataframe()
+        if self.index_df.index_catalog is None or self.index_df.index_catalog.source is not index_pandas_df:
+            self.index_df.index_catalog = Index_Catalog.from_index_sets_df(index_pandas_df)
+        return self.index_df.index_catalog
+
+
+    def get_codes(self) -> Data_Codes:
+        """Gets the integer codes of the index sets, see Data_Codes. The code of a label is its position in the index set.
+
+        Returns:
+            Data_Codes: The codes of the order_suborder, order, suborder, time and employee_line index sets.
+        """
+        return self.get_catalog().codes
     
 
     def get_orders_set(self):
@@ -0,0 +1,135 @@
+import pandas as pd
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+from dataclasses import dataclass, field
+
+from data.data_codes import Data_Codes
+from data.data_time_grid import Time_Grid
+from general_configuration import data_indexes_columns, old_planning_limit
+
+
+@dataclass(frozen=True)
+class Index_Catalog:
+    """The Index_Catalog holds the index sets (like order_suborder, time and employee_line) of one version of the index_sets_df, read and filtered once.
+    Every set is a pd.Index, which finds the position of a label in O(1), and the catalog gives the integer codes of the sets (see Data_Codes).
+
+    The catalog is frozen: its sets cannot be changed, so it can be shared by the builder, the model, the solvability checks and the Gantt chart.
+    A changed index_sets_df (like the completed one) gets a new catalog, see Data_Index.get_catalog().
+    """
+    index_sets: Mapping[str, pd.Index] # Labels per index set type, for the types of 'data_indexes_columns' that are found in the index_sets_df.
+    source: Any = field(default=None, repr=False, compare=False) # The pandas dataframe (or dict) of the index_sets_df that the catalog is read from.
+
+    model_shape_sets = ('order_suborder', 'time', 'employee_line') # Index sets of the allocation of the model.
+    time_index_set = 'time' # Index set of the time intervals, which is sorted such that the position of a time interval is its position in the Time_Grid.
+
+    @classmethod
+    def from_index_sets(cls, index_sets: Dict[str, list], source: Any = None) -> 'Index_Catalog':
+        """Creates the catalog of the given index sets.
+
+        The time intervals are sorted, since the model only compares them (t < j), so the order in which they are given does not matter.
+
+        Args:
+            index_sets (Dict[str, list]): The labels per index set type, without empty labels.
+            source (Any, optional): The pandas dataframe (or dict) that the index sets are read from. Defaults to None.
+
+        Returns:
+            Index_Catalog: The catalog.
+        """
+        index_sets = {index_set_type: pd.Index(labels, tupleize_cols=False) for index_set_type, labels in index_sets.items()}
+        if cls.time_index_set in index_sets:
+            times = index_sets[cls.time_index_set]
+            index_sets[cls.time_index_set] = times[pd.DatetimeIndex(times).argsort(kind='stable')]
+        return cls(index_sets=MappingProxyType(index_sets), source=source)
+
+    @classmethod
+    def from_index_sets_df(cls, index_pandas_df) -> 'Index_Catalog':
+        """Reads the catalog from the index_sets_df, which is a pandas dataframe when it is read and a dict of lists once it is completed (see Data_Builder.build_complete_index_sets_df).
+        The empty labels ('') are left out. An index set of which the column is not found, or which is None, is not in the catalog.
+
+        Args:
+            index_pandas_df (Union[pd.DataFrame, dict]): The pandas dataframe of the index_sets_df.
+
+        Returns:
+            Index_Catalog: The catalog.
+        """
+        index_sets = {}
+        for index_set_type, index_set_name in data_indexes_columns.items():
+            if isinstance(index_pandas_df, pd.DataFrame):
+                index_set = index_pandas_df[index_set_name].to_list() if index_set_name in index_pandas_df.columns else None
+            else:
+                index_set = index_pandas_df.get(index_set_type)
+
+            if index_set is not None:
+                index_sets[index_set_type] = [idx for idx in index_set if idx != '']
+        return cls.from_index_sets(index_sets, source=index_pandas_df)
+
+
+    ### INDEX SETS
+    def get_set(self, index_set_type: str) -> pd.Index:
+        """Gets an index set.
+
+        Args:
+            index_set_type (str): Name of the index set, like 'order_suborder'.
+
+        Raises:
+            KeyError: The index set is not in the catalog.
+
+        Returns:
+            pd.Index: The labels of the index set, the position of a label is its code.
+        """
+        if index_set_type not in self.index_sets:
+            raise KeyError(f'The index set ({index_set_type}) is not found in the index sets of the catalog: {list(self.index_sets)}')
+        return self.index_sets[index_set_type]
+
+    def get_index_set(self, index_set_type: str) -> list:
+        """Gets an index set as a new list, like Data_Index.get_index_set(). The list can be changed without changing the catalog.
+        """
+        return self.get_set(index_set_type).to_list()
+
+    def get_position(self, index_set_type: str, label) -> int:
+        """Gets the position (code) of a label in an index set, in O(1).
+
+        Raises:
+            KeyError: The label is not in the index set.
+        """
+        return self.get_set(index_set_type).get_loc(label)
+
+    def get_size(self, index_set_type: str) -> int:
+        """Gets the number of labels of an index set.
+        """
+        return len(self.get_set(index_set_type))
+
+    def get_shape(self, *index_set_types: str) -> Tuple[int, ...]:
+        """Gets the shape of the cartesian product of index sets, like get_shape('time', 'employee_line') for the availability.
+        """
+        return tuple(self.get_size(index_set_type) for index_set_type in index_set_types)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """The shape of the allocation of the model: (order_suborder, time, employee_line).
+        """
+        return self.get_shape(*self.model_shape_sets)
+
+    @cached_property
+    def codes(self) -> Data_Codes:
+        """The integer codes of the index sets, see Data_Codes. They are created once, the first time they are needed.
+
+        Raises:
+            ValueError: A coded index set contains a label more than once.
+        """
+        return Data_Codes({index_set_type: self.index_sets[index_set_type] for index_set_type in Data_Codes.coded_index_sets})
+
+    @cached_property
+    def time_grid(self) -> Time_Grid:
+        """The grid of the 'time' index set, with the old_planning_limit as cut point. See Time_Grid.
+
+        Raises:
+            ValueError: The time intervals are not unique.
+        """
+        return Time_Grid.from_times(self.get_set(self.time_index_set), old_planning_limit)
+
+    def get_index_set_types(self) -> List[str]:
+        """Gets the types of the index sets in the catalog.
+        """
+        return list(self.index_sets)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+
+class Data_Indicator:
+    """The Data_Indicator class builds indicators (boolean columns) from columns of the orders, like whether an order_suborder is executed on a line (the On_line column).
+    A value is indicated if it is 1 or True, every other value (like the fill value 2, an empty string or a missing value) is not indicated.
+
+    The whole column is compared at once, instead of checking and writing the indicator row by row with .loc. Since True == 1, a single comparison with 1 suffices.
+    """
+
+    indicated_value = 1 # Value that is indicated, True is equal to 1 so it is indicated as well.
+
+    @classmethod
+    def calc_indicator(cls, column) -> np.ndarray:
+        """Calculates the indicator of a column.
+
+        Args:
+            column (array-like): The column, like the On_line column of the orders_df. Numeric, boolean, object and categorical columns are supported.
+
+        Returns:
+            np.ndarray: The indicator (bool) per row of the column.
+        """
+        column = column if isinstance(column, pd.Series) else pd.Series(column)
+        # Nullable columns compare missing values to a missing value instead of False.
+        return column.eq(cls.indicated_value).fillna(False).to_numpy(dtype=bool)
+
+    @classmethod
+    def calc_indicator_dataframe(cls, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Calculates the indicator of every column of a dataframe, see calc_indicator().
+
+        Args:
+            dataframe (pd.DataFrame): The dataframe, like a view on the columns of the orders_df that are indicators.
+
+        Returns:
+            pd.DataFrame: The indicators, with the same index and columns as the dataframe.
+        """
+        return pd.DataFrame({column: cls.calc_indicator(dataframe[column]) for column in dataframe.columns}, index=dataframe.index)
@@ -0,0 +1,75 @@
+import pandas as pd
+from typing import Dict, List
+
+
+class Data_Loader:
+    """The Data_Loader class parses sheets from a single, already opened, ExcelFile.
+    Every sheet is parsed at most once, after which the parsed pd.DataFrame is kept until it is released.
+    This way the workbook (a zip archive) is never reopened or reparsed for each individual sheet.
+    """
+    def __init__(self, pandas_excel_file: pd.ExcelFile):
+        """Constructor of the Data_Loader.
+
+        Args:
+            pandas_excel_file (pd.ExcelFile): The opened ExcelFile to parse the sheets from.
+        """
+        self.excel_file = pandas_excel_file
+
+        self.loaded_sheets: Dict[str, pd.DataFrame] = {}
+
+
+    def load_sheets(self, sheet_names_to_load: List[str], index_columns: Dict[str, list] = None):
+        """Parses all the sheets in {sheet_names_to_load} that have not been parsed yet. Sheets that are not in the ExcelFile are skipped.
+        Sheets that share the same index columns are parsed together in one call on the open workbook.
+
+        Args:
+            sheet_names_to_load (List[str]): Sheets to parse.
+            index_columns (Dict[str, list], optional): Index columns per sheet, sheets not in this dictionary are parsed without index columns. Defaults to None.
+        """
+        if index_columns is None:
+            index_columns = {}
+
+        sheet_names = self.excel_file.sheet_names
+
+        # Group the sheets that still need parsing by their index columns.
+        sheets_per_index_col = {}
+        for sheet in sheet_names_to_load:
+            if sheet in sheet_names and sheet not in self.loaded_sheets:
+                index_col = index_columns.get(sheet)
+                key = tuple(index_col) if index_col is not None else None
+                sheets_per_index_col.setdefault(key, []).append(sheet)
+
+        for index_col, sheets in sheets_per_index_col.items():
+            parsed_sheets = self.excel_file.parse(
+                sheet_name=sheets,
+                index_col=list(index_col) if index_col is not None else None
+                )
+            self.loaded_sheets.update(parsed_sheets)
+
+
+    def get_sheet(self, sheet_name: str, index_col: list = None) -> pd.DataFrame:
+        """Gets the parsed pd.DataFrame of a sheet, the sheet is parsed first if that has not been done yet.
+
+        Args:
+            sheet_name (str): Name of the sheet.
+            index_col (list, optional): Index columns of the sheet, only used if the sheet still needs to be parsed. Defaults to None.
+
+        Raises:
+            KeyError: If the sheet cannot be found in the ExcelFile.
+
+        Returns:
+            pd.DataFrame: The parsed sheet.
+        """
+        if sheet_name not in self.loaded_sheets:
+            self.load_sheets([sheet_name], index_columns={sheet_name: index_col})
+
+        if sheet_name not in self.loaded_sheets:
+            raise KeyError(f'Sheet name: {sheet_name} , not found in the Excel file: {self.excel_file}')
+
+        return self.loaded_sheets[sheet_name]
+
+
+    def release_sheets(self):
+        """Removes all the parsed sheets, such that their memory can be freed once they are no longer needed.
+        """
+        self.loaded_sheets.clear()
@@ -0,0 +1,203 @@
+import math
+import numpy as np
+import pandas as pd
+
+
+class Data_Penalty:
+    """The Data_Penalty class builds the penalty matrix (time x order_suborder) in one go from the start dates, deadlines and revenues of the orders,
+    instead of calculating the penalty cell by cell. The penalty is the same as the one of Data_Builder.calc_penalty:
+
+        if time >= date_start:
+            penalty = (time - date_start) + exp((date_deadline - time) / (4 * (time - 1900-01-01))) + log(revenue), with the time differences in days.
+        else:
+            penalty = 50
+
+    The time differences are broadcast over the whole matrix with numpy. The exponent and logarithm are taken with math.exp and math.log,
+    because the vectorised numpy versions may differ in the last digit, so the matrix is identical to calculating the penalty per cell.
+    """
+
+    penalty_before_start = 50 # Penalty for allocating an order_suborder before its start date.
+    reference_date = np.datetime64('1900-01-01')
+
+    @classmethod
+    def calc_penalty_matrix(cls, time_index, date_start, date_deadline, revenue) -> np.ndarray:
+        """Calculates the penalty for every combination of time and order_suborder.
+
+        Args:
+            time_index (array-like): The time intervals (timestamps), the rows of the matrix.
+            date_start (array-like): Start date of each order_suborder, the columns of the matrix.
+            date_deadline (array-like): Deadline of each order_suborder.
+            revenue (array-like): Revenue of each order_suborder.
+
+        Raises:
+            ValueError: The revenue of an order_suborder that has started within the time intervals is not positive, so its logarithm does not exist.
+
+        Returns:
+            np.ndarray: The penalty matrix (float64), of shape (number of time intervals, number of order_suborders).
+        """
+        time = pd.DatetimeIndex(time_index).to_numpy(dtype='datetime64[ns]')[:, np.newaxis]
+        date_start = pd.DatetimeIndex(date_start).to_numpy(dtype='datetime64[ns]')[np.newaxis, :]
+        date_deadline = pd.DatetimeIndex(date_deadline).to_numpy(dtype='datetime64[ns]')[np.newaxis, :]
+        revenue = np.asarray(revenue, dtype='float64')
+
+        one_day = np.timedelta64(1, 'D')
+        is_started = time >= date_start # Missing start dates never start.
+
+        penalty_matrix = np.full(is_started.shape, cls.penalty_before_start, dtype='float64')
+        if not is_started.any():
+            return penalty_matrix
+
+        start_now = (time - date_start) / one_day
+        deadline_now = (date_deadline - time) / one_day
+        multiply_now = 4 * ((time - cls.reference_date) / one_day)
+        exp_val = (deadline_now / multiply_now)[is_started]
+
+        # The logarithm is only taken for the order_suborders that have started, like it is done per cell.
+        is_order_started = is_started.any(axis=0)
+        log_revenue = np.zeros(len(revenue))
+        log_revenue[is_order_started] = np.fromiter(map(math.log, revenue[is_order_started].tolist()), dtype='float64', count=int(is_order_started.sum()))
+
+        penalty_matrix[is_started] = (
+            start_now[is_started]
+            + np.fromiter(map(math.exp, exp_val.tolist()), dtype='float64', count=len(exp_val))
+            + np.broadcast_to(log_revenue, is_started.shape)[is_started]
+            )
+        return penalty_matrix
+
+    @classmethod
+    def calc_penalty_dataframe(cls, time_index, order_suborder_index, date_start: pd.Series, date_deadline: pd.Series, revenue: pd.Series, penalty_cache: 'Penalty_Column_Cache' = None) -> pd.DataFrame:
+        """Calculates the penalty dataframe, with the time intervals as index and the order_suborders as columns. See calc_penalty_matrix().
+
+        Args:
+            time_index (array-like): The time intervals (timestamps).
+            order_suborder_index (array-like): The order_suborders.
+            date_start (pd.Series): Start date, indexed by order_suborder.
+            date_deadline (pd.Series): Deadline, indexed by order_suborder.
+            revenue (pd.Series): Revenue, indexed by order_suborder.
+            penalty_cache (Penalty_Column_Cache, optional): Cache of the previous build, only the columns and rows that are not cached are calculated. Defaults to None, then everything is calculated.
+
+        Raises:
+            KeyError: An order_suborder is not in the index of the start dates, deadlines or revenues.
+
+        Returns:
+            pd.DataFrame: The penalty dataframe.
+        """
+        calc_penalty_matrix = penalty_cache.calc_penalty_matrix if penalty_cache is not None else cls.calc_penalty_matrix
+        penalty_matrix = calc_penalty_matrix(
+            time_index,
+            cls._select(date_start, order_suborder_index),
+            cls._select(date_deadline, order_suborder_index),
+            cls._select(revenue, order_suborder_index)
+            )
+        return pd.DataFrame(penalty_matrix, index=pd.DatetimeIndex(time_index), columns=pd.Index(order_suborder_index))
+
+
+    ### HELPER FUNCTIONS
+    @staticmethod
+    def _select(series: pd.Series, labels) -> np.ndarray:
+        # Values of the labels, like .loc[label].iloc[0] the first value of a label is used.
+        series = series[~series.index.duplicated(keep='first')]
+        return series.loc[pd.Index(labels)].to_numpy()
+
+
+
+class Penalty_Column_Cache:
+    """The Penalty_Column_Cache keeps the penalty columns of the previous build, such that a new build only calculates what changed.
+    The penalty column of an order_suborder only depends on its start date, deadline and revenue (its 'key') and on the time intervals. So a column is
+    reused for every order_suborder with the same key, and only the columns of new or changed order_suborders and the rows of new time intervals are calculated.
+
+    The cache can be stored in the Data_Cache, such that it persists between runs.
+    """
+    cache_version = 1 # Increase when the penalty changes, such that stored caches are no longer used.
+    node = 'penalty_columns' # Node of the Data_Cache in which the cache is stored.
+
+    def __init__(self):
+        """Constructor of the Penalty_Column_Cache, which starts empty.
+        """
+        self.time_index = pd.DatetimeIndex([]) # Rows of the cached matrix.
+        self.keys = pd.MultiIndex.from_arrays([pd.DatetimeIndex([]), pd.DatetimeIndex([]), pd.Index([], dtype='float64')]) # (date_start, date_deadline, revenue) of the columns of the cached matrix.
+        self.penalty_matrix = np.empty((0, 0))
+
+        # Number of columns and rows that were calculated in the last build, instead of reused.
+        self.calculated_columns = 0
+        self.calculated_rows = 0
+
+    def calc_penalty_matrix(self, time_index, date_start, date_deadline, revenue) -> np.ndarray:
+        """Calculates the penalty matrix like Data_Penalty.calc_penalty_matrix(), but reuses the cached cells. Afterwards the cache holds the new matrix.
+
+        Args:
+            time_index (array-like): The time intervals (timestamps), the rows of the matrix.
+            date_start (array-like): Start date of each order_suborder, the columns of the matrix.
+            date_deadline (array-like): Deadline of each order_suborder.
+            revenue (array-like): Revenue of each order_suborder.
+
+        Returns:
+            np.ndarray: The penalty matrix (float64), of shape (number of time intervals, number of order_suborders).
+        """
+        time_index = pd.DatetimeIndex(time_index)
+        date_start = pd.DatetimeIndex(date_start)
+        date_deadline = pd.DatetimeIndex(date_deadline)
+        revenue = np.asarray(revenue, dtype='float64')
+        keys = pd.MultiIndex.from_arrays([date_start, date_deadline, revenue])
+
+        # Positions of the rows and columns in the cached matrix, -1 if they are not cached.
+        cached_rows = self.time_index.get_indexer(time_index)
+        cached_columns = self.keys.get_indexer(keys)
+        is_cached_row = cached_rows != -1
+        is_cached_column = cached_columns != -1
+
+        penalty_matrix = np.empty((len(time_index), len(keys)), dtype='float64')
+        penalty_matrix[np.ix_(is_cached_row, is_cached_column)] = self.penalty_matrix[np.ix_(cached_rows[is_cached_row], cached_columns[is_cached_column])]
+
+        # New or changed order_suborders, for all time intervals.
+        if not is_cached_column.all():
+            penalty_matrix[:, ~is_cached_column] = Data_Penalty.calc_penalty_matrix(
+                time_index, date_start[~is_cached_column], date_deadline[~is_cached_column], revenue[~is_cached_column]
+                )
+        # New time intervals, for the cached order_suborders.
+        if not is_cached_row.all() and is_cached_column.any():
+            penalty_matrix[np.ix_(~is_cached_row, is_cached_column)] = Data_Penalty.calc_penalty_matrix(
+                time_index[~is_cached_row], date_start[is_cached_column], date_deadline[is_cached_column], revenue[is_cached_column]
+                )
+
+        self.calculated_columns = int((~is_cached_column).sum())
+        self.calculated_rows = int((~is_cached_row).sum())
+
+        # Keep every time interval and key once.
+        is_first_row = ~time_index.duplicated(keep='first')
+        is_first_column = ~keys.duplicated(keep='first')
+        self.time_index = time_index[is_first_row]
+        self.keys = keys[is_first_column]
+        self.penalty_matrix = penalty_matrix[np.ix_(is_first_row, is_first_column)]
+
+        return penalty_matrix
+
+
+    ### STORING THE CACHE BETWEEN RUNS
+    @classmethod
+    def load(cls, data_cache) -> 'Penalty_Column_Cache':
+        """Loads the cache that is stored in the Data_Cache, or starts an empty cache if none is stored.
+
+        Args:
+            data_cache (Data_Cache): The cache of the data process.
+
+        Returns:
+            Penalty_Column_Cache: The loaded or empty cache.
+        """
+        entry = data_cache.load(cls.node, cls._get_key(data_cache))
+        if entry is None or not isinstance(entry.get('penalty_column_cache'), cls):
+            return cls()
+        return entry['penalty_column_cache']
+
+    def store(self, data_cache):
+        """Stores the cache in the Data_Cache, such that the next run can reuse it.
+
+        Args:
+            data_cache (Data_Cache): The cache of the data process.
+        """
+        data_cache.store(self.node, self._get_key(data_cache), {'penalty_column_cache': self})
+
+    @classmethod
+    def _get_key(cls, data_cache) -> str:
+        # One stored cache, that is replaced by every build.
+        return data_cache.get_key(cls.node, cls.cache_version)
@@ -1,26 +1,49 @@
 from general_configuration import df_reader_helper, dfs
 from data.data_reader import Data_Reader
+from data.data_loader import Data_Loader
 from data.dataframe import Dataframe
 from data.data_cleaner import Data_Cleaner
 from data.dataframes import Dataframes
 from data.data_builder import Data_Builder
 from data.data_index import Data_Index
+from data.data_cache import Data_Cache
+from data.data_penalty import Penalty_Column_Cache
+from data.data_build_graph import Data_Build_Graph
 
+import os
 import pandas as pd
 
-from general_configuration import dfs_to_build_columnBased, dfs_to_build_indicatorBased
+from general_configuration import dfs_to_build_columnBased, dfs_to_build_indicatorBased, dfs_build_inputs, max_workers_build
 class Data_process:
-    def __init__(self, pandas_excel_file: pd.ExcelFile):
+    def __init__(self, pandas_excel_file: pd.ExcelFile, data_cache: Data_Cache = None):
         self.pandas_excel_file = pandas_excel_file
+        # One loader for the entire process, such that every sheet of the ExcelFile is parsed only once.
+        self.data_loader = Data_Loader(pandas_excel_file)
         self.helper_read_sheets_df = None
         self.dataframes = None
         self.sheets_to_read = None
+        self.build_graph = None
 
+        # Optional cache, such that only the sheets that changed since the previous run are read again and only the dataframes that depend on them are build again.
+        self.data_cache = data_cache
+        self.sheet_fingerprints = None
+        self.read_keys = {}
+        if self.data_cache is not None:
+            self.sheet_fingerprints = Data_Cache.get_data_source_fingerprints(self.pandas_excel_file)
 
-    def process_helper_read_sheets(self, helper_read_dfs_name: str):
-        reader = Data_Reader(pandas_excel_file=self.pandas_excel_file)
 
+    def process_helper_read_sheets(self, helper_read_dfs_name: str):
         self.helper_read_dfs_name = dfs.get(helper_read_dfs_name)[0]
+
+        # The sheets to read also depend on the sheet names of the ExcelFile, so a renamed or added sheet leads to a new key.
+        key = self._get_cache_key('helper', *[self.sheet_fingerprints.get(sheet) for sheet in df_reader_helper], tuple(self.sheet_fingerprints)) if self.data_cache else None
+        entry = self.data_cache.load('helper', key) if key else None
+        if entry is not None:
+            self.helper_read_sheets_df = Data_Cache.record_to_dataframe(entry['helper_read_sheets_df'], self.pandas_excel_file)
+            self.sheets_to_read = entry['sheets_to_read']
+            return
+
+        reader = Data_Reader(pandas_excel_file=self.pandas_excel_file, data_loader=self.data_loader)
         
         reader.read_all_dataframes(df_reader_helper)
         dataframes_reader = Dataframes(dataframes=reader.get_dataframes())
@@ -30,32 +53,131 @@ class Data_process:
         dataframes_reader.clean_dataframes(self.helper_read_sheets_df)
         self.sheets_to_read = reader.get_sheets_to_read(self.helper_read_sheets_df)
 
+        if key:
+            self.data_cache.store('helper', key, {
+                'helper_read_sheets_df': Data_Cache.dataframe_to_record(self.helper_read_sheets_df),
+                'sheets_to_read': self.sheets_to_read
+                })
+
 
     def process_read_dataframes(self):
-        reader = Data_Reader(pandas_excel_file=self.pandas_excel_file)
+        # Load the sheets that did not change from the cache, such that only the changed sheets are read and cleaned.
+        cached_dataframes = {}
+        for sheet in self.sheets_to_read:
+            self.read_keys[sheet] = self._get_read_key(sheet)
+            entry = self.data_cache.load(f'read_{sheet}', self.read_keys[sheet]) if self.read_keys[sheet] else None
+            if entry is not None:
+                cached_dataframes[sheet] = Data_Cache.record_to_dataframe(entry['dataframe'], self.pandas_excel_file)
+
+        sheets_to_read = [sheet for sheet in self.sheets_to_read if sheet not in cached_dataframes]
+
+        dataframes_reader = []
+        if sheets_to_read:
+            reader = Data_Reader(pandas_excel_file=self.pandas_excel_file, data_loader=self.data_loader)
 
-        reader.read_all_dataframes(self.sheets_to_read)
-        dataframes_reader = reader.get_dataframes()
+            reader.read_all_dataframes(sheets_to_read)
+            dataframes_reader = reader.get_dataframes()
+
+        # All sheets are read, so the parsed sheets are no longer needed.
+        self.data_loader.release_sheets()
 
         for df in dataframes_reader:
             Data_Cleaner(df).clean_dfs(self.helper_read_sheets_df)
-        
-        self.dataframes = Dataframes(dataframes=dataframes_reader)
 
+            if self.read_keys.get(df.excel_sheet_name):
+                self.data_cache.store(f'read_{df.excel_sheet_name}', self.read_keys[df.excel_sheet_name], {'dataframe': Data_Cache.dataframe_to_record(df)})
 
-    def process_build_dataframes(self):
-        builder = Data_Builder(self.dataframes)
+        # Keep the order of the sheets in the ExcelFile, independent of which sheets are loaded from the cache.
+        read_dataframes = {df.excel_sheet_name: df for df in dataframes_reader}
+        read_dataframes.update(cached_dataframes)
+        self.dataframes = Dataframes(dataframes=[read_dataframes[sheet] for sheet in self.sheets_to_read if sheet in read_dataframes])
 
-        for df_name in dfs_to_build_columnBased:
-            builder.build_new_df_column_based(dfs.get(df_name))
 
-        builder.build_penalty_df()
-        builder.build_complete_index_sets_df()
-        builder.build_old_and_manual_planning_df()
-
-        for df_name in dfs_to_build_indicatorBased:
-            builder.build_indicator(dfs.get(df_name))
+    def process_build_dataframes(self):
+        # The penalty columns of the previous run, such that only the penalty of new or changed orders has to be calculated.
+        penalty_cache = Penalty_Column_Cache.load(self.data_cache) if self.data_cache else None
+        builder = Data_Builder(self.dataframes, penalty_cache=penalty_cache)
+
+        build_functions = {df_name: lambda df_name=df_name: builder.build_new_df_column_based(dfs.get(df_name)) for df_name in dfs_to_build_columnBased}
+        build_functions['penalty_df'] = lambda: self._build_penalty_df(builder)
+        build_functions['index_sets_df'] = builder.build_complete_index_sets_df
+        build_functions['old_and_manual_planning_df'] = builder.build_old_and_manual_planning_df
+        build_functions.update({df_name: lambda df_name=df_name: builder.build_indicator(dfs.get(df_name)) for df_name in dfs_to_build_indicatorBased})
+
+        # The dataframes are build in the order of their inputs (see dfs_build_inputs), the dataframes that do not depend on each other are build concurrently.
+        self.build_graph = Data_Build_Graph(max_workers=max_workers_build or os.cpu_count() or 1)
+        for df_name, inputs in dfs_build_inputs.items():
+            self.build_graph.add_node(df_name, inputs, lambda df_name=df_name: self._build_dataframe(df_name, build_functions[df_name]))
+
+        number_of_read_dataframes = len(self.dataframes.dataframes)
+        self.build_graph.run()
+
+        # The dataframes that are build concurrently are added in the order in which they finish. Keep the order of building them one by one:
+        # the read dataframes first, followed by the build dataframes in the order of the build graph.
+        build_order = {df_name: position for position, df_name in enumerate(self.build_graph.get_order())}
+        self.dataframes.dataframes[number_of_read_dataframes:] = sorted(
+            self.dataframes.dataframes[number_of_read_dataframes:], 
+            key=lambda df: build_order.get(df.df_standard_name, len(build_order))
+            )
         
 
     def process_get_index(self, index_set_type: str):
-        return Data_Index(self.dataframes).get_index_set(index_set_type)
+        return Data_Index(self.dataframes).get_catalog().get_index_set(index_set_type)
+
+
+    ### HELPER FUNCTIONS FOR THE CACHE
+    def _build_dataframe(self, df_name: str, build_function):
+        """Builds the dataframe {df_name} using {build_function}, or loads it from the cache if none of its inputs (see dfs_build_inputs) changed.
+
+        Args:
+            df_name (str): Standard name of the dataframe that is build.
+            build_function (function): Function that builds the dataframe and adds it to the dataframes.
+        """
+        key = self._get_build_key(df_name)
+        entry = self.data_cache.load(f'build_{df_name}', key) if key else None
+
+        if entry is not None:
+            cached_dataframe = Data_Cache.record_to_dataframe(entry['dataframe'], self.pandas_excel_file)
+            try:
+                # Some build functions change an existing dataframe instead of adding a new one, like the index_sets_df.
+                self.dataframes.get_dataframe_by_name(df_name).pandas_dataframe = cached_dataframe.pandas_dataframe
+            except KeyError:
+                self.dataframes.append_dataframe(cached_dataframe)
+            return
+
+        build_function()
+
+        if key:
+            try:
+                self.data_cache.store(f'build_{df_name}', key, {'dataframe': Data_Cache.dataframe_to_record(self.dataframes.get_dataframe_by_name(df_name))})
+            except KeyError:
+                pass # Nothing is build, for example because the orders_df is not read.
+
+    def _build_penalty_df(self, builder: Data_Builder):
+        builder.build_penalty_df()
+        if self.data_cache:
+            builder.penalty_cache.store(self.data_cache)
+
+    def _get_read_key(self, sheet: str):
+        if self.data_cache is None or self.sheet_fingerprints.get(sheet) is None:
+            return None
+
+        try:
+            sheet_type = self.helper_read_sheets_df.get_pandas_dataframe().loc[sheet].iloc[0]
+        except KeyError:
+            sheet_type = None
+        return self._get_cache_key('read', sheet, self.sheet_fingerprints.get(sheet), sheet_type)
+
+    def _get_build_key(self, df_name: str):
+        # The dataframes of dfs_to_build_columnBased are views on the orders_df, so they are not cached.
+        if self.data_cache is None or df_name in dfs_to_build_columnBased:
+            return None
+
+        # The key of the inputs of the dataframe, which is based on the keys of the read sheets that it is (indirectly) build from.
+        source_keys = {input_name: self.read_keys.get(dfs.get(input_name)[0]) for input_name in dfs}
+        return self._get_cache_key('build', df_name, self.build_graph.get_key(df_name, source_keys))
+
+    def _get_cache_key(self, *parts):
+        if None in parts:
+            return None
+        return self.data_cache.get_key(*parts)
@@ -1,26 +1,29 @@
-import tkinter as tk
-from tkinter import messagebox
 from typing import List
 import pandas as pd
 
 from data.dataframe import Dataframe
-from general_configuration import sheet_types
+from data.data_loader import Data_Loader
+from general_configuration import sheet_types, headless
 
 
 class Data_Reader:
     """The Data_Reader class is for reading all the dataframes in a ExcelFile in a given path (to the excelfile). 
     This can be done with the method: "read_all_dataframes".
     """
-    def __init__(self, pandas_excel_file: pd.ExcelFile):
+    def __init__(self, pandas_excel_file: pd.ExcelFile, data_loader: Data_Loader = None):
         """This is a constructor for a Data_Reader.
 
         Args:
-            name_excel_file (str): Name for the excelfile (Does not have to be the .xlsx name)
-            path_excel_file (str): Path to the Excel File.
+            pandas_excel_file (pd.ExcelFile): The opened ExcelFile to read from.
+            data_loader (Data_Loader, optional): Loader that parses the sheets of the ExcelFile, share it between readers to parse each sheet only once. Defaults to None.
         """
         self.excel_file = pandas_excel_file
         self.path_excel_file = pandas_excel_file.io
 
+        if data_loader is None:
+            data_loader = Data_Loader(pandas_excel_file)
+        self.data_loader = data_loader
+
         self.dataframes: List[Dataframe] = []
 
 
@@ -58,10 +61,16 @@ class Data_Reader:
                 message = f'WARNING: \n\n The following sheets: \n\n {given_sheets_not_in_excel_file} \n\n Were not found in the Excel file in the Path: \n\n {self.path_excel_file}'
             else:
                 message = f'WARNING: \n\n None of the sheets in: \n\n {sheet_names_to_read} \n\n Were found in the Excel file in the Path: \n\n {self.path_excel_file}'
-            # Show a pop-up message box to the user
-            root = tk.Tk()
-            root.withdraw()  # Hide the main window
-            messagebox.showwarning('Missing Sheets:', message)
+            # Show a pop-up message box to the user, in headless mode there is no user to show it to, so the message is printed.
+            if headless:
+                print(message)
+            else:
+                import tkinter as tk # GUI dependency, only loaded when it is used.
+                from tkinter import messagebox
+
+                root = tk.Tk()
+                root.withdraw()  # Hide the main window
+                messagebox.showwarning('Missing Sheets:', message)
 
         # Reading the Dataframes and adding them to the dataframes list.
         dataframes = []
@@ -71,10 +80,17 @@ class Data_Reader:
                 pandas_excel_file=self.excel_file, dataframe_name=f'{sheet}', excel_sheet_name=sheet
                 )
             
-            dataframe.read_excel_dataframe()
-            
             dataframes.append(dataframe)
 
+        # Parse all the sheets in one pass over the opened workbook, then hand the parsed sheets to the Dataframes. Streamed sheets are not parsed.
+        self.data_loader.load_sheets(
+            [dataframe.excel_sheet_name for dataframe in dataframes if not dataframe.streamed], 
+            index_columns={dataframe.excel_sheet_name: dataframe.read_index_col for dataframe in dataframes}
+            )
+
+        for dataframe in dataframes:
+            dataframe.read_excel_dataframe(data_loader=self.data_loader)
+
         self.dataframes = dataframes
 
 
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+
+class Data_Routing:
+    """The Data_Routing class holds the routing of the orders through the suborders as a precedence graph: for every order_suborder the previous order_suborder
+    of the same order, the percentage of the previous order_suborder that should be completed before it, and the lowerbound of the required hours of the
+    previous order_suborder. All arrays are indexed by codes (see Data_Codes).
+
+    The order of the suborders (their codes) is the routing, where the first suborder (code 0) is not a suborder of an order. Not all orders go through every suborder,
+    the previous order_suborder is therefore the order_suborder of the same order with the nearest preceding suborder. It follows for all order_suborders at once
+    from a running maximum over the suborders of every order, instead of walking back through the suborders for every order_suborder.
+    """
+
+    def __init__(
+            self,
+            order_code_array: np.ndarray,
+            suborder_code_array: np.ndarray,
+            percentage_array: np.ndarray,
+            time_req_lb_array: np.ndarray,
+            number_of_orders: int,
+            number_of_suborders: int
+            ):
+        """Constructor of the Data_Routing class.
+
+        Args:
+            order_code_array (np.ndarray): The order code of every order_suborder, [order_suborder].
+            suborder_code_array (np.ndarray): The suborder code of every order_suborder, [order_suborder].
+            percentage_array (np.ndarray): The percentage of the previous order_suborder that should be completed before an order_suborder, [order_suborder].
+            time_req_lb_array (np.ndarray): The lowerbound of the required hours of every order_suborder, [order_suborder].
+            number_of_orders (int): Number of orders.
+            number_of_suborders (int): Number of suborders.
+        """
+        order_code_array = np.asarray(order_code_array)
+        suborder_code_array = np.asarray(suborder_code_array)
+
+        # The order_suborder code of every order and suborder, -1 if there is no such order_suborder (the first one, if an order has a suborder twice). [order, suborder]
+        self.order_suborder_code_array = np.full((number_of_orders, number_of_suborders), -1)
+        is_first = ~pd.MultiIndex.from_arrays([order_code_array, suborder_code_array]).duplicated(keep='first')
+        self.order_suborder_code_array[order_code_array[is_first], suborder_code_array[is_first]] = np.flatnonzero(is_first)
+
+        # The nearest suborder of every order up to and including a suborder that the order has, 0 if there is none. [order, suborder]
+        suborders = np.arange(number_of_suborders)
+        is_present = (self.order_suborder_code_array != -1) & (suborders > 0)
+        nearest_suborder = np.maximum.accumulate(np.where(is_present, suborders, 0), axis=1)
+
+        # The previous suborder of an order_suborder is the nearest suborder of its order before its own suborder.
+        previous_suborder = np.where(suborder_code_array > 0, nearest_suborder[order_code_array, np.maximum(suborder_code_array - 1, 0)], 0)
+        self.has_previous_array = previous_suborder > 0
+        self.previous_code_array = np.where(self.has_previous_array, self.order_suborder_code_array[order_code_array, previous_suborder], -1) # [order_suborder] -> order_suborder (-1: none)
+
+        self.percentage_array = np.asarray(percentage_array)
+        self.previous_time_req_lb_array = np.where(self.has_previous_array, np.asarray(time_req_lb_array)[self.previous_code_array], 0) # 0 if there is no previous order_suborder.
@@ -0,0 +1,132 @@
+import pandas as pd
+from typing import Dict, List, Union
+from dataclasses import dataclass
+
+
+@dataclass
+class SheetSchema:
+    """The SheetSchema declares how a sheet is read: which columns to keep, the dtype of the columns and which columns are normalised to uppercase.
+    Applying the schema to a read sheet gives typed, compact columns directly, so these columns do not have to be cleaned element by element anymore.
+
+    The dtypes that can be given are:
+        - 'category': text with few distinct values, empty cells get the fill value of the sheet.
+        - 'object': text, empty cells get the fill value of the sheet.
+        - integer dtypes (like 'int32'): whole numbers, empty cells become 0. Other values raise a ValueError.
+        - nullable integer dtypes (like 'Int32'): whole numbers, empty cells stay missing (<NA>). A column with other values than numbers is kept as read,
+          like the cleaning does, such that an identifier that is not a number (like an order number) is not lost.
+        - float dtypes (like 'float64'): numbers, empty cells become NaN. Other values raise a ValueError.
+        - 'datetime64[ns]': dates and times, empty cells become NaT. Other values raise a ValueError.
+    """
+    usecols: List[str] = None # Columns to keep, in the order of the sheet. None keeps all columns.
+    dtypes: Dict[str, str] = None # dtype per column.
+    default_dtype: str = None # dtype of the columns that are not in {dtypes}. None keeps the read column, with empty cells filled.
+    uppercase: Union[bool, List[str]] = False # Columns with text that is changed to uppercase, True for all columns.
+    keep_case: List[str] = None # Columns that are never changed to uppercase, like descriptions.
+
+
+    def apply(self, pandas_dataframe: pd.DataFrame, fill_value='') -> pd.DataFrame:
+        """Applies the schema to a read sheet.
+
+        Args:
+            pandas_dataframe (pd.DataFrame): The sheet as read by pandas, with the empty cells still missing (NaN).
+            fill_value (optional): Value for the empty cells in text columns and in columns without a dtype. Defaults to ''.
+
+        Raises:
+            KeyError: A column of {usecols} is not in the sheet.
+
+        Returns:
+            pd.DataFrame: The sheet with typed and normalised columns.
+        """
+        if self.usecols is not None:
+            missing_columns = [column for column in self.usecols if column not in pandas_dataframe.columns]
+            if missing_columns:
+                raise KeyError(f'The columns {missing_columns} of the schema are not found in the sheet, which has the columns: {pandas_dataframe.columns.to_list()}')
+            pandas_dataframe = pandas_dataframe[[column for column in pandas_dataframe.columns if column in self.usecols]]
+
+        columns = {}
+        for column in pandas_dataframe.columns:
+            values = pandas_dataframe[column]
+            if self.is_uppercase(column):
+                values = self._to_uppercase(values)
+            columns[column] = self._to_dtype(values, self.get_dtype(column), fill_value)
+
+        return pd.DataFrame(columns, index=pandas_dataframe.index)
+
+
+    def get_dtype(self, column: str) -> Union[str, None]:
+        """Gets the dtype of a column according to the schema.
+
+        Args:
+            column (str): Name of the column.
+
+        Returns:
+            Union[str, None]: The dtype, or None if the column keeps the dtype it is read with.
+        """
+        return (self.dtypes or {}).get(column, self.default_dtype)
+
+    def is_uppercase(self, column: str) -> bool:
+        """Checks whether the text of a column is changed to uppercase by the schema.
+
+        Args:
+            column (str): Name of the column.
+
+        Returns:
+            bool: True if the column is changed to uppercase.
+        """
+        if column in (self.keep_case or []):
+            return False
+        return self.uppercase is True or column in (self.uppercase or [])
+
+    def is_normalised(self, column: str) -> bool:
+        """Checks whether a column is typed or changed to uppercase by the schema, such that it does not need to be cleaned anymore.
+
+        Args:
+            column (str): Name of the column.
+
+        Returns:
+            bool: True if the column is normalised by the schema.
+        """
+        return self.get_dtype(column) is not None or self.is_uppercase(column)
+
+
+    ### HELPER FUNCTIONS
+    @staticmethod
+    def _to_uppercase(values: pd.Series) -> pd.Series:
+        # Only the text is changed, other values (numbers, dates) are kept.
+        if values.dtype != object:
+            return values
+        uppercase_values = values.str.upper()
+        return uppercase_values.where(uppercase_values.notna(), values)
+
+    @staticmethod
+    def _to_dtype(values: pd.Series, dtype: Union[str, None], fill_value) -> pd.Series:
+        if dtype is None or dtype == 'object':
+            return values.fillna(fill_value)
+
+        if dtype == 'category':
+            return values.fillna(fill_value).astype('category')
+
+        if pd.api.types.is_datetime64_dtype(pd.api.types.pandas_dtype(dtype)):
+            # Empty cells become NaT, any other value that is not a date raises an error.
+            values = values.where(values != '')
+            dates = pd.to_datetime(values, errors='coerce')
+            not_dates = values[dates.isna() & values.notna()]
+            if not not_dates.empty:
+                raise ValueError(f'Column ({values.name}) should only contain dates to be read as {dtype}, but contains: {not_dates.to_list()}')
+            return dates.astype(dtype)
+
+        # Numeric dtypes: empty cells are missing, any other value that is not a number raises an error, except for nullable dtypes (like 'Int32').
+        is_nullable = isinstance(pd.api.types.pandas_dtype(dtype), pd.api.extensions.ExtensionDtype)
+        try:
+            numbers = pd.to_numeric(values.where(values != ''))
+        except (ValueError, TypeError) as e:
+            if is_nullable:
+                return values
+            raise ValueError(f'Column ({values.name}) should only contain numbers to be read as {dtype}: {e}')
+
+        if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(dtype)):
+            if not is_nullable:
+                numbers = numbers.fillna(0)
+            if not (numbers.dropna() % 1 == 0).all():
+                raise ValueError(f'Column ({values.name}) should only contain whole numbers to be read as {dtype}.')
+        return numbers.astype(dtype)
@@ -0,0 +1,296 @@
+import os
+import re
+import sqlite3
+import hashlib
+import datetime
+import pandas as pd
+from typing import Dict, Iterator, List, Union
+
+from data.lazy_excel_file import LazyExcelFile
+
+from general_configuration import df_reader_helper
+
+
+class BaseDataSource:
+    """The BaseDataSource is a source of 'sheets' that is not an Excel file, but can be used in the place of a pd.ExcelFile.
+    It offers the part of the pd.ExcelFile that the Dataframes use: {io}, {sheet_names}, parse() and close(), so the same
+    reading, cleaning and building is applied to its sheets. Every sheet is a table, with the header row as the column names.
+
+    Values that are dates in Excel are stored as ISO formatted strings (like '2023-08-21 08:00:00') in formats without a datetime type,
+    these are restored to pd.Timestamps when parsed, also in the column names (like the time columns of the Manual_planning).
+
+    The order of the sheets is taken from the helper_read_sheets sheet, like the order of the sheets in a workbook. Sheets not listed there follow alphabetically.
+    """
+    iso_datetime_pattern = r'\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?'
+
+    def __init__(self, path_data_source: str):
+        """Constructor of the BaseDataSource.
+
+        Args:
+            path_data_source (str): Path to the data source.
+        """
+        self._path_data_source = path_data_source
+        self._sheet_names: List[str] = None
+
+    @property
+    def io(self) -> str:
+        return self._path_data_source
+
+    @property
+    def sheet_names(self) -> List[str]:
+        if self._sheet_names is None:
+            self._sheet_names = self._order_sheet_names(self._list_sheets())
+        return self._sheet_names
+
+    def parse(self, sheet_name: Union[str, int, List[Union[str, int]], None] = 0, index_col: Union[int, List[int], None] = None, **kwargs) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """Parses sheet(s) of the data source, like pd.ExcelFile.parse().
+
+        Args:
+            sheet_name (Union[str, int, List[Union[str, int]], None], optional): Name or position of the sheet, a list of those, or None for all sheets. Defaults to 0.
+            index_col (Union[int, List[int], None], optional): Position(s) of the column(s) to use as index. Defaults to None.
+
+        Raises:
+            ValueError: If other arguments than {sheet_name} and {index_col} are given.
+
+        Returns:
+            Union[pd.DataFrame, Dict[str, pd.DataFrame]]: The parsed sheet, or a dictionary with the parsed sheets if a list of sheets (or None) is given.
+        """
+        if kwargs:
+            raise ValueError(f'The arguments {list(kwargs)} are not supported by the data source {self}')
+
+        if sheet_name is None or isinstance(sheet_name, list):
+            sheets = self.sheet_names if sheet_name is None else sheet_name
+            return {self._get_sheet_name(sheet): self.parse(sheet_name=sheet, index_col=index_col) for sheet in sheets}
+
+        frame = self._restore_datetimes(self._read_sheet(self._get_sheet_name(sheet_name)))
+
+        if index_col is not None:
+            index_col = [index_col] if isinstance(index_col, int) else list(index_col)
+            index_columns = [frame.columns[position] for position in index_col]
+            if len(index_columns) > 1:
+                # Like pandas does for an Excel file, empty cells of a MultiIndex are filled with the value above.
+                frame[index_columns] = frame[index_columns].ffill()
+            frame = frame.set_index(index_columns if len(index_columns) > 1 else index_columns[0])
+
+        return frame
+
+    def iter_rows(self, sheet_name: str) -> Iterator[tuple]:
+        """Iterates over the rows of a sheet, starting with the header row, like the values of a worksheet in openpyxl. Empty values are None.
+
+        Args:
+            sheet_name (str): Name of the sheet.
+
+        Yields:
+            Iterator[tuple]: The values of a single row.
+        """
+        frame = self.parse(sheet_name=sheet_name)
+        yield tuple(self._to_cell_value(column) for column in frame.columns)
+        for row in frame.itertuples(index=False, name=None):
+            yield tuple(self._to_cell_value(value) for value in row)
+
+    def get_sheet_fingerprints(self) -> Dict[str, str]:
+        """Gets a fingerprint of every sheet, that only changes if the content of the sheet changes.
+
+        Returns:
+            Dict[str, str]: Fingerprint per sheet name.
+        """
+        return {sheet: self._fingerprint_sheet(sheet) for sheet in self.sheet_names}
+
+    def close(self):
+        pass
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(io='{self._path_data_source}')"
+
+
+    ### METHODS THAT DEPEND ON THE TYPE OF DATA SOURCE
+    def _list_sheets(self) -> List[str]:
+        raise NotImplementedError
+
+    def _read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def _fingerprint_sheet(self, sheet_name: str) -> str:
+        raise NotImplementedError
+
+
+    ### HELPER FUNCTIONS
+    def _get_sheet_name(self, sheet_name: Union[str, int]) -> str:
+        if isinstance(sheet_name, int):
+            return self.sheet_names[sheet_name]
+        if sheet_name not in self.sheet_names:
+            raise ValueError(f'Worksheet named {sheet_name} not found in the data source {self}')
+        return sheet_name
+
+    def _order_sheet_names(self, sheet_names: List[str]) -> List[str]:
+        helper_sheet = df_reader_helper[0]
+        if helper_sheet not in sheet_names:
+            return sorted(sheet_names)
+
+        listed_sheets = [sheet for sheet in self._read_sheet(helper_sheet).iloc[:, 0].dropna() if sheet in sheet_names]
+        return listed_sheets + sorted(sheet for sheet in sheet_names if sheet not in listed_sheets)
+
+    @classmethod
+    def _restore_datetimes(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        frame.columns = [cls._restore_datetime(column) for column in frame.columns]
+
+        for column in frame.columns[frame.dtypes == object]:
+            values = frame[column]
+            is_datetime = values.map(lambda value: isinstance(value, str) and re.fullmatch(cls.iso_datetime_pattern, value) is not None)
+            if not is_datetime.any():
+                continue
+
+            if is_datetime.sum() == values.notna().sum():
+                frame[column] = pd.to_datetime(values)
+            else:
+                frame[column] = values.where(~is_datetime, values[is_datetime].map(pd.Timestamp))
+        return frame
+
+    @classmethod
+    def _restore_datetime(cls, value):
+        if isinstance(value, str) and re.fullmatch(cls.iso_datetime_pattern, value):
+            return pd.Timestamp(value)
+        return value
+
+    @staticmethod
+    def _to_cell_value(value):
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if isinstance(value, float) and pd.isna(value):
+            return None
+        if value is pd.NaT:
+            return None
+        if hasattr(value, 'item'): # Numpy scalars
+            return value.item()
+        return value
+
+    @staticmethod
+    def _to_stored_column(column):
+        if isinstance(column, (pd.Timestamp, datetime.datetime)):
+            return pd.Timestamp(column).isoformat(sep=' ')
+        return str(column)
+
+
+
+class DirectorySource(BaseDataSource):
+    """A directory with a Parquet (.parquet) or CSV (.csv) file per sheet, the name of the file (without extension) is the name of the sheet.
+    If both exist for a sheet, the Parquet file is used.
+    """
+    extensions = ['.parquet', '.csv']
+
+    def _list_sheets(self) -> List[str]:
+        return list(self._get_paths_sheets())
+
+    def _read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        path_sheet = self._get_paths_sheets()[sheet_name]
+        if path_sheet.endswith('.parquet'):
+            return pd.read_parquet(path_sheet)
+        # Only empty cells are missing values, so texts like 'NA' or 'None' are kept.
+        return pd.read_csv(path_sheet, keep_default_na=False, na_values=[''])
+
+    def _fingerprint_sheet(self, sheet_name: str) -> str:
+        hasher = hashlib.sha256()
+        with open(self._get_paths_sheets()[sheet_name], 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _get_paths_sheets(self) -> Dict[str, str]:
+        paths_sheets = {}
+        for extension in reversed(self.extensions): # Preferred extension last, so it overwrites the others.
+            for file_name in sorted(os.listdir(self._path_data_source)):
+                if file_name.endswith(extension):
+                    paths_sheets[file_name[:-len(extension)]] = os.path.join(self._path_data_source, file_name)
+        return paths_sheets
+
+
+
+class SQLiteSource(BaseDataSource):
+    """A SQLite database with a table per sheet, the name of the table is the name of the sheet.
+    """
+    def _list_sheets(self) -> List[str]:
+        with sqlite3.connect(self._path_data_source) as connection:
+            tables = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").fetchall()
+        return [table for (table, ) in tables]
+
+    def _read_sheet(self, sheet_name: str) -> pd.DataFrame:
+        with sqlite3.connect(self._path_data_source) as connection:
+            return pd.read_sql_query(f'SELECT * FROM "{self._quote(sheet_name)}"', connection)
+
+    def _fingerprint_sheet(self, sheet_name: str) -> str:
+        hasher = hashlib.sha256()
+        with sqlite3.connect(self._path_data_source) as connection:
+            cursor = connection.execute(f'SELECT * FROM "{self._quote(sheet_name)}"')
+            hasher.update(repr([description[0] for description in cursor.description]).encode())
+            for row in cursor:
+                hasher.update(repr(row).encode())
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        return name.replace('"', '""')
+
+
+
+def open_data_source(path_data_source: str, engine: str = 'openpyxl') -> Union[LazyExcelFile, BaseDataSource]:
+    """Opens the data source in {path_data_source}, based on its type:
+        - .xlsx/.xlsm file: LazyExcelFile
+        - directory: DirectorySource (Parquet/CSV files)
+        - .db/.sqlite/.sqlite3 file: SQLiteSource
+
+    Args:
+        path_data_source (str): Path to the data source.
+        engine (str, optional): Engine used by pandas to open an Excel file. Defaults to 'openpyxl'.
+
+    Raises:
+        ValueError: If there is no supported data source in the path.
+
+    Returns:
+        Union[LazyExcelFile, BaseDataSource]: The data source, which can be used in the place of a pd.ExcelFile.
+    """
+    extension = os.path.splitext(path_data_source)[1].lower()
+
+    if extension in ['.xlsx', '.xlsm']:
+        return LazyExcelFile(path_data_source, engine=engine)
+    elif os.path.isdir(path_data_source):
+        return DirectorySource(path_data_source)
+    elif extension in ['.db', '.sqlite', '.sqlite3']:
+        return SQLiteSource(path_data_source)
+    else:
+        raise ValueError(f'No excel file, directory or SQLite database found in {path_data_source}')
+
+
+def export_data_source(pandas_excel_file: pd.ExcelFile, path_data_source: str, file_format: str = 'parquet'):
+    """Exports all sheets of an ExcelFile to a data source, such that it can be read without Excel. Also shows the expected format for other systems.
+    Dates are written as ISO formatted strings in the column names, and in the values of CSV files and SQLite databases.
+    Columns with mixed types are written as text in Parquet files.
+
+    Args:
+        pandas_excel_file (pd.ExcelFile): The ExcelFile to export.
+        path_data_source (str): Directory (for 'parquet' and 'csv') or SQLite database (for 'sqlite') to write to.
+        file_format (str, optional): One of 'parquet', 'csv' or 'sqlite'. Defaults to 'parquet'.
+
+    Raises:
+        ValueError: If the {file_format} is not supported.
+    """
+    if file_format not in ['parquet', 'csv', 'sqlite']:
+        raise ValueError(f"The file_format ({file_format}) should be one of 'parquet', 'csv' or 'sqlite'")
+
+    if file_format != 'sqlite':
+        os.makedirs(path_data_source, exist_ok=True)
+
+    for sheet_name, frame in pandas_excel_file.parse(sheet_name=None).items():
+        frame.columns = [BaseDataSource._to_stored_column(column) for column in frame.columns]
+
+        if file_format == 'parquet':
+            for column in frame.columns[frame.dtypes == object]:
+                if frame[column].dropna().map(type).nunique() > 1:
+                    frame[column] = frame[column].map(lambda value: value if pd.isna(value) else BaseDataSource._to_stored_column(value))
+            frame.to_parquet(os.path.join(path_data_source, f'{sheet_name}.parquet'), index=False)
+        elif file_format == 'csv':
+            frame.to_csv(os.path.join(path_data_source, f'{sheet_name}.csv'), index=False, date_format='%Y-%m-%d %H:%M:%S')
+        else:
+            for column in frame.columns:
+                frame[column] = frame[column].map(lambda value: BaseDataSource._to_stored_column(value) if isinstance(value, (pd.Timestamp, datetime.datetime)) else value)
+            with sqlite3.connect(path_data_source) as connection:
+                frame.to_sql(sheet_name, connection, if_exists='replace', index=False)
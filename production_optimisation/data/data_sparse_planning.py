@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence, Tuple, Union
+
+
+class Sparse_Planning:
+    """The Sparse_Planning class holds a planning (like the old, manual or combined planning, or the solution) as coordinates and allocations:
+    for every level of the (order_suborder, time, empl_line) index an int32 array with the codes of the labels, and an array with the allocations.
+    The code of a label is its position in the labels of its level, so a planning that is encoded with the index sets (see Data_Codes.encode_planning)
+    has the same codes as the model.
+
+    Merging, filtering on time, membership tests and sums per group are done on the arrays at once, instead of with pd.concat, drop_duplicates and .loc per combination.
+    A planning that is read can contain a combination more than once, then get() gives its first allocation and group_sum() sums all of them.
+    """
+
+    index_names = ['order_suborder', 'time', 'empl_line'] # Names of the levels of a planning, see Planning_Reader.
+
+    def __init__(self, coordinates: Sequence[np.ndarray], allocations: np.ndarray, levels: Sequence[pd.Index], names: List[str] = None):
+        """Constructor of the Sparse_Planning.
+
+        Args:
+            coordinates (Sequence[np.ndarray]): The codes of the labels of every allocation, an array per level.
+            allocations (np.ndarray): The allocations.
+            levels (Sequence[pd.Index]): The labels per level, the position of a label is its code.
+            names (List[str], optional): Names of the levels. Defaults to None, then the 'index_names' are used.
+        """
+        self.coordinates: Tuple[np.ndarray, ...] = tuple(np.asarray(level_codes, dtype=np.int32) for level_codes in coordinates)
+        self.allocations: np.ndarray = np.asarray(allocations)
+        self.levels: Tuple[pd.Index, ...] = tuple(pd.Index(labels, tupleize_cols=False) for labels in levels)
+        self.names: List[str] = list(names) if names is not None else list(self.index_names)
+
+        self._positions: Dict[int, int] = None # Position of every combination (linear key -> position), created once it is needed by get().
+
+    @classmethod
+    def from_series(cls, planning: pd.Series, levels: Sequence[pd.Index] = None) -> 'Sparse_Planning':
+        """Creates the sparse planning of a planning with an (order_suborder, time, empl_line) multiindex. Combinations that are planned more than once are kept, see drop_duplicates().
+
+        Args:
+            planning (pd.Series): The planning, like the old_planning_df. None or an empty dataframe gives an empty planning.
+            levels (Sequence[pd.Index], optional): The labels per level, like the index sets of the model. Allocations of other labels are left out.
+                Defaults to None, then the labels of the planning are used.
+
+        Returns:
+            Sparse_Planning: The sparse planning.
+        """
+        if not isinstance(planning, pd.Series):
+            levels = levels if levels is not None else [[] for _ in cls.index_names]
+            return cls([[] for _ in levels], [], levels)
+
+        if isinstance(planning.index, pd.MultiIndex):
+            # The multiindex already holds the codes and the labels of its levels, a missing label (code -1) gets a code of its own.
+            coordinates = [np.asarray(level_codes) for level_codes in planning.index.codes]
+            planning_levels = list(planning.index.levels)
+            for level, level_codes in enumerate(coordinates):
+                if (level_codes == -1).any():
+                    coordinates[level] = np.where(level_codes == -1, len(planning_levels[level]), level_codes)
+                    planning_levels[level] = planning_levels[level].append(pd.Index([np.nan]))
+        else:
+            factorized = [pd.factorize(planning.index.get_level_values(level), use_na_sentinel=False) for level in range(planning.index.nlevels)]
+            coordinates = [level_codes for level_codes, _ in factorized]
+            planning_levels = [labels for _, labels in factorized]
+
+        if levels is None:
+            levels = planning_levels
+        else:
+            levels = [pd.Index(labels, tupleize_cols=False) for labels in levels]
+            coordinates = [labels.get_indexer(planning_labels)[level_codes] for labels, planning_labels, level_codes in zip(levels, planning_levels, coordinates)]
+
+        is_known = np.logical_and.reduce([level_codes != -1 for level_codes in coordinates]) if coordinates else np.ones(len(planning), dtype=bool)
+        return cls([level_codes[is_known] for level_codes in coordinates], planning.to_numpy()[is_known], levels, planning.index.names)
+
+    @classmethod
+    def from_planning(cls, planning: Union[pd.Series, 'Sparse_Planning']) -> 'Sparse_Planning':
+        """Gets the sparse planning of a planning that is either a series (see from_series()) or already a Sparse_Planning.
+        """
+        return planning if isinstance(planning, Sparse_Planning) else cls.from_series(planning)
+
+
+    ### PROPERTIES
+    def __len__(self) -> int:
+        return len(self.allocations)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.allocations) == 0
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """The number of labels per level.
+        """
+        return tuple(len(labels) for labels in self.levels)
+
+    def to_series(self) -> pd.Series:
+        """Gets the planning as a series with an (order_suborder, time, empl_line) multiindex, named 'allocation' like the plannings that are read.
+        """
+        if any(labels.hasnans for labels in self.levels): # The levels of a multiindex cannot hold a missing label.
+            index = pd.MultiIndex.from_arrays([labels.take(level_codes) for labels, level_codes in zip(self.levels, self.coordinates)], names=self.names)
+        else:
+            index = pd.MultiIndex(levels=self.levels, codes=self.coordinates, names=self.names, verify_integrity=False)
+        return pd.Series(self.allocations, index=index, name='allocation')
+
+
+    ### LOOKUP
+    def get_keys(self) -> np.ndarray:
+        """Gets a single (linear) key per combination, from the codes of its levels.
+        """
+        return self._get_keys(self.coordinates, self.shape)
+
+    def get(self, combination: Tuple[int, ...], default=None):
+        """Gets the (first) allocation of a combination of codes, like the get() of a dict.
+
+        Args:
+            combination (Tuple[int, ...]): The code per level, like (order_suborder_code, time_code, employee_line_code).
+            default (optional): Returned if the combination is not planned. Defaults to None.
+        """
+        if self._positions is None:
+            self._positions = dict(zip(self.get_keys().tolist()[::-1], range(len(self) - 1, -1, -1))) # Reversed, such that the first position of a key is kept.
+        if any(not 0 <= code < size for code, size in zip(combination, self.shape)):
+            return default
+        position = self._positions.get(int(np.ravel_multi_index(combination, self.shape)))
+        return default if position is None else self.allocations[position]
+
+    def get_allocation(self, labels: Tuple, default=None):
+        """Gets the (first) allocation of a combination of labels, like (order_suborder, time, empl_line). See get().
+        """
+        try:
+            combination = tuple(level_labels.get_loc(label) for level_labels, label in zip(self.levels, labels))
+        except (KeyError, TypeError):
+            return default
+        return self.get(combination, default)
+
+    def contains(self, coordinates: Sequence[np.ndarray]) -> np.ndarray:
+        """Checks for many combinations of codes at once whether they are planned.
+
+        Args:
+            coordinates (Sequence[np.ndarray]): The codes of the combinations, an array per level.
+
+        Returns:
+            np.ndarray: Whether each combination is planned (bool).
+        """
+        coordinates = [np.asarray(level_codes) for level_codes in coordinates]
+        is_valid = np.logical_and.reduce([(level_codes >= 0) & (level_codes < size) for level_codes, size in zip(coordinates, self.shape)])
+        is_planned = np.zeros(len(is_valid), dtype=bool)
+        is_planned[is_valid] = np.isin(self._get_keys([level_codes[is_valid] for level_codes in coordinates], self.shape), self.get_keys())
+        return is_planned
+
+
+    ### OPERATIONS
+    def filter(self, mask: np.ndarray) -> 'Sparse_Planning':
+        """Keeps the allocations for which the mask is True.
+        """
+        return Sparse_Planning([level_codes[mask] for level_codes in self.coordinates], self.allocations[mask], self.levels, self.names)
+
+    def filter_time(self, limit: pd.Timestamp, level: str = 'time') -> 'Sparse_Planning':
+        """Keeps the allocations up to and including a time, like the allocations of the old planning before the old_planning_limit.
+
+        Args:
+            limit (pd.Timestamp): The last time that is kept.
+            level (str, optional): Name of the level with the times. Defaults to 'time'.
+        """
+        position = self.names.index(level)
+        is_kept_label = np.asarray(self.levels[position] <= limit, dtype=bool) # Once per label, instead of once per allocation.
+        return self.filter(is_kept_label[self.coordinates[position]])
+
+    def drop_duplicates(self) -> 'Sparse_Planning':
+        """Keeps the first allocation of every combination.
+        """
+        _, first_positions = np.unique(self.get_keys(), return_index=True)
+        if len(first_positions) == len(self):
+            return self
+        return self.filter(np.sort(first_positions))
+
+    def recode(self, levels: Sequence[pd.Index]) -> 'Sparse_Planning':
+        """Encodes the planning with other labels per level, allocations of labels that are not in these levels are left out.
+        """
+        levels = [pd.Index(labels, tupleize_cols=False) for labels in levels]
+        coordinates = [new_labels.get_indexer(old_labels)[level_codes] for new_labels, old_labels, level_codes in zip(levels, self.levels, self.coordinates)]
+        is_known = np.logical_and.reduce([level_codes != -1 for level_codes in coordinates])
+        return Sparse_Planning([level_codes[is_known] for level_codes in coordinates], self.allocations[is_known], levels, self.names)
+
+    def merge(self, other: 'Sparse_Planning') -> 'Sparse_Planning':
+        """Merges two plannings, where this planning has priority: a combination that is in both plannings gets the allocation of this planning.
+        The allocations of this planning come first, followed by the other allocations in their order.
+
+        Args:
+            other (Sparse_Planning): The planning with the lower priority, like the old planning when merged into the manual planning.
+
+        Returns:
+            Sparse_Planning: The merged planning.
+        """
+        if other.empty:
+            return self
+        if self.empty:
+            return other
+
+        levels = [labels.append(other_labels.difference(labels, sort=False)) for labels, other_labels in zip(self.levels, other.levels)]
+        this, other = self.recode(levels), other.recode(levels)
+        merged = Sparse_Planning(
+            [np.concatenate(level_codes) for level_codes in zip(this.coordinates, other.coordinates)],
+            np.concatenate([this.allocations, other.allocations]),
+            levels,
+            self.names
+            )
+        return merged.drop_duplicates()
+
+    def group_sum(self, names: List[str]) -> pd.Series:
+        """Sums the allocations per group of labels, like pd.Series.groupby(names).sum(). The groups are sorted and labels that are missing (NaN) are left out.
+
+        Args:
+            names (List[str]): Names of the levels to group by, like ['empl_line', 'time'].
+
+        Returns:
+            pd.Series: The sum of the allocations per group, named 'allocation'.
+        """
+        positions = [self.names.index(name) for name in names]
+        coordinates = [self.coordinates[position] for position in positions]
+        levels = [self.levels[position] for position in positions]
+
+        is_labelled = np.logical_and.reduce([~np.asarray(labels.isna())[level_codes] for labels, level_codes in zip(levels, coordinates)])
+        coordinates = [level_codes[is_labelled] for level_codes in coordinates]
+
+        group_keys, group_of_allocation = np.unique(self._get_keys(coordinates, tuple(len(labels) for labels in levels)), return_inverse=True)
+        sums = np.bincount(group_of_allocation, weights=self.allocations[is_labelled], minlength=len(group_keys)).astype(self.allocations.dtype)
+
+        group_coordinates = np.unravel_index(group_keys, tuple(len(labels) for labels in levels)) if len(levels) > 1 else [group_keys]
+        group_labels = [labels.take(level_codes) for labels, level_codes in zip(levels, group_coordinates)]
+        index = pd.MultiIndex.from_arrays(group_labels, names=names) if len(names) > 1 else pd.Index(group_labels[0], name=names[0])
+        return pd.Series(sums, index=index, name='allocation').sort_index()
+
+
+    ### HELPER FUNCTIONS
+    @staticmethod
+    def _get_keys(coordinates: Sequence[np.ndarray], shape: Tuple[int, ...]) -> np.ndarray:
+        if not len(shape) or 0 in shape:
+            return np.zeros(len(coordinates[0]) if len(coordinates) else 0, dtype=np.int64)
+        return np.ravel_multi_index([np.asarray(level_codes, dtype=np.int64) for level_codes in coordinates], shape)
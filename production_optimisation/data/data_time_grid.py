@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from functools import cached_property
+from typing import List, Union
+from pandas.tseries.offsets import Tick
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, eq=False)
+class Time_Grid:
+    """The Time_Grid holds the time intervals of the model as an ordered pd.DatetimeIndex, where the position of a time interval is its code (see Data_Codes).
+    Since the grid is ordered, the time intervals before or after a time interval are a slice of positions, instead of a scan over all time intervals that
+    compares every one of them. Cut points, like the old_planning_limit or the start dates and deadlines of the orders, are turned into positions once.
+
+    If the time intervals are regular (like every hour, without breaks), the frequency of the grid is known and the position of a time interval is calculated.
+    Otherwise (like a grid of working hours) it is looked up, which is O(1) as well.
+    """
+    times: pd.DatetimeIndex # The time intervals, sorted and unique.
+    old_planning_end: int = field(default=0) # Number of time intervals up to and including the old_planning_limit, which are the positions before this cut point.
+
+    time_format = '%d-%m-%Y %H:%M:%S' # Format of the times in the configuration, like the old_planning_limit.
+
+    @classmethod
+    def from_times(cls, times, old_planning_limit: Union[str, pd.Timestamp] = None) -> 'Time_Grid':
+        """Creates the grid of the given time intervals, which are sorted. So, the positions of the grid are only the codes of the time intervals
+        if the 'time' index set is sorted as well, like it is by the Index_Catalog.
+
+        Args:
+            times (array-like): The time intervals, like the 'time' index set.
+            old_planning_limit (Union[str, pd.Timestamp], optional): Until which time the old planning is used, see general_configuration. Defaults to None, then it is never used.
+
+        Raises:
+            ValueError: The time intervals contain a time interval more than once.
+
+        Returns:
+            Time_Grid: The grid.
+        """
+        times = pd.DatetimeIndex(times)
+        if not times.is_unique:
+            raise ValueError(f'The time intervals of a Time_Grid should be unique, but contain more than once: {times[times.duplicated()].to_list()}')
+        if not times.is_monotonic_increasing:
+            times = times.sort_values()
+
+        if times.freq is None and len(times) >= 3:
+            times = pd.DatetimeIndex(times, freq=pd.infer_freq(times)) # The frequency is None if the time intervals are not regular.
+
+        grid = cls(times=times)
+        if old_planning_limit is not None:
+            grid = cls(times=times, old_planning_end=grid.get_cut(cls.parse_time(old_planning_limit), side='right'))
+        return grid
+
+    @classmethod
+    def parse_time(cls, time: Union[str, pd.Timestamp]) -> pd.Timestamp:
+        """Parses a time of the configuration (like the old_planning_limit), which has the format of 'time_format'.
+        """
+        return pd.to_datetime(time, format=cls.time_format) if isinstance(time, str) else pd.Timestamp(time)
+
+
+    ### POSITIONS
+    @property
+    def freq(self):
+        """The frequency of the time intervals, None if they are not regular.
+        """
+        return self.times.freq
+
+    @cached_property
+    def step(self) -> Union[pd.Timedelta, None]:
+        """The fixed time between two time intervals, None if the time intervals are not regular or if the frequency is not fixed (like a month).
+        """
+        return pd.Timedelta(self.freq) if isinstance(self.freq, Tick) else None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @cached_property
+    def time_list(self) -> List[pd.Timestamp]:
+        """The time intervals as a list, from which the slices of the model are taken.
+        """
+        return self.times.to_list()
+
+    def get_position(self, time) -> int:
+        """Gets the position (code) of a time interval of the grid.
+
+        Raises:
+            KeyError: The time is not a time interval of the grid.
+        """
+        if self.step is not None:
+            position, remainder = divmod(pd.Timestamp(time) - self.times[0], self.step)
+            if 0 <= position < len(self.times) and not remainder:
+                return int(position)
+            raise KeyError(f'The time ({time}) is not a time interval of the grid: {self.times[0]} - {self.times[-1]}, every {self.step}')
+        return self.times.get_loc(time)
+
+    def get_cut(self, time, side: str = 'left') -> int:
+        """Gets the cut point of a time, which does not have to be a time interval of the grid.
+
+        Args:
+            time (Union[pd.Timestamp, str]): The time.
+            side (str, optional): 'left' gives the number of time intervals before the time, 'right' the number of time intervals up to and including the time. Defaults to 'left'.
+
+        Returns:
+            int: The position at which the grid is cut.
+        """
+        return int(self.times.searchsorted(self.parse_time(time), side=side))
+
+    def get_cuts(self, times, side: str = 'left') -> np.ndarray:
+        """Gets the cut points of many times at once, like the start dates of all orders. See get_cut().
+        """
+        return self.times.searchsorted(pd.DatetimeIndex(times), side=side)
+
+
+    ### SLICES
+    def get_slice_before(self, time, inclusive: bool = False) -> slice:
+        """Gets the positions of the time intervals before (t < time) or, if inclusive, up to and including (t <= time) a time interval of the grid.
+        """
+        return slice(0, self.get_position(time) + int(inclusive))
+
+    def get_slice_after(self, time, inclusive: bool = False) -> slice:
+        """Gets the positions of the time intervals after (t > time) or, if inclusive, from and including (t >= time) a time interval of the grid.
+        """
+        return slice(self.get_position(time) + int(not inclusive), len(self.times))
+
+    def get_times_before(self, time, inclusive: bool = False) -> List[pd.Timestamp]:
+        """Gets the time intervals before a time interval of the grid, see get_slice_before().
+        """
+        return self.time_list[self.get_slice_before(time, inclusive)]
+
+    def get_times_after(self, time, inclusive: bool = False) -> List[pd.Timestamp]:
+        """Gets the time intervals after a time interval of the grid, see get_slice_after().
+        """
+        return self.time_list[self.get_slice_after(time, inclusive)]
+
+    def is_in_old_planning(self, time) -> bool:
+        """Checks whether a time interval of the grid is up to and including the old_planning_limit, such that the old planning is used.
+        """
+        return self.get_position(time) < self.old_planning_end
@@ -1,7 +1,8 @@
 import pandas as pd
-import openpyxl
 
 from general_configuration import dfs, path_to_excel
+from data.planning_reader import Planning_Reader
+from data.data_columns import Data_Columns
 
 class Dataframe:
     """The Dataframe class is for dataframes that are read from the (parent class) ExcelFile. 
@@ -29,16 +30,28 @@ class Dataframe:
             if dfs.get(df)[0] == dataframe_name:
                 self.df_standard_name = df
                 self.filterType = dfs.get(df)[2]
+                self.schema = dfs.get(df)[3]
                 break
             elif df == dataframe_name:
                 self.df_standard_name = dataframe_name
                 self.filterType = dfs.get(df)[2]
+                self.schema = dfs.get(df)[3]
                 break
             else:
                 self.filterType = ''
+                self.schema = None
                 self.df_standard_name = df
 
+        # The manual planning has its index in the first two columns of the sheet.
+        self.read_index_col = [0, 1] if self.df_standard_name == 'manual_planning_df' else None
+        # The planning sheets are streamed by the Planning_Reader, instead of being parsed as a whole.
+        self.streamed = self.df_standard_name in ['old_planning_df', 'manual_planning_df']
+
         self.pandas_dataframe = pd.DataFrame
+        # Columnar store of the pandas dataframe, from which new dataframes take views on its columns. See get_data_columns().
+        self.data_columns = None
+        # Catalog of the index sets, if this is the index_sets_df. See Data_Index.get_catalog().
+        self.index_catalog = None
 
         self.cleaned = False
 
@@ -78,8 +91,13 @@ class Dataframe:
             return False
 
 
-    def read_excel_dataframe(self):
+    def read_excel_dataframe(self, data_loader=None):
         """Read the Dataframe in the {self.excel_sheet_name} sheet in the ExcelFile.
+        If a Data_Loader is given, the already parsed sheet of the Data_Loader is used, instead of parsing the sheet again.
+        The planning sheets are streamed row by row and are cleaned while reading.
+
+        Args:
+            data_loader (Data_Loader, optional): Loader that holds the parsed sheets of the ExcelFile. Defaults to None.
 
         Raises:
             KeyError: Indicated that the sheet is not found in the sheets of the ExcelFile
@@ -90,19 +108,29 @@ class Dataframe:
         
         
         if self.check_sheet_name_in_excelfile():
-            if self.df_standard_name == 'manual_planning_df':
-                self.pandas_dataframe = pd.read_excel(
-                    io=self.excel_file_path,
-                    sheet_name=self.excel_sheet_name,
-                    engine='openpyxl',
-                    index_col=[0, 1]
-                ).fillna(self.filterType)
+            if self.streamed:
+                # The streamed planning only contains the non-zero allocations in the cleaned format, so it does not need cleaning anymore.
+                planning_reader = Planning_Reader(self.pandas_excel_file)
+                if self.df_standard_name == 'manual_planning_df':
+                    self.pandas_dataframe = planning_reader.read_manual_planning(self.excel_sheet_name)
+                else:
+                    self.pandas_dataframe = planning_reader.read_planning(self.excel_sheet_name)
+                self.change_status_to_cleaned()
+                return
+
+            if data_loader is not None:
+                read_pandas_dataframe = data_loader.get_sheet(self.excel_sheet_name, index_col=self.read_index_col)
             else:
-                self.pandas_dataframe = pd.read_excel(
-                    io=self.excel_file_path,
+                # Parse from the opened ExcelFile, such that the workbook is not reopened by its path.
+                read_pandas_dataframe = self.pandas_excel_file.parse(
                     sheet_name=self.excel_sheet_name,
-                    engine='openpyxl'
-                ).fillna(self.filterType)
+                    index_col=self.read_index_col
+                )
+            # The schema of the sheet (see data/data_schema.py) gives typed columns, otherwise the empty cells are only filled.
+            if self.schema is not None:
+                self.pandas_dataframe = self.schema.apply(read_pandas_dataframe, self.filterType)
+            else:
+                self.pandas_dataframe = read_pandas_dataframe.fillna(self.filterType)
         else:
             raise KeyError(f'Sheet name: {self.excel_sheet_name} , not found in the Excel file in path: {self.excel_file_path}')
     
@@ -141,7 +169,14 @@ class Dataframe:
             new_pandas_df (pd.DataFrame): The new DataFrame
         """
         if isinstance(new_pandas_df, pd.DataFrame):
-            new_pandas_df = new_pandas_df.fillna(2)
+            # The columns typed by the schema of the sheet (see data/data_schema.py) keep their empty cells missing, and categorical columns cannot
+            # be filled with a value that is not one of their categories, so these columns are skipped.
+            skipped_columns = [column for column, dtype in new_pandas_df.dtypes.items()
+                               if isinstance(dtype, pd.CategoricalDtype) or (self.schema is not None and self.schema.is_normalised(column))]
+            if skipped_columns:
+                new_pandas_df = new_pandas_df.fillna({column: 2 for column in new_pandas_df.columns if column not in skipped_columns})
+            else:
+                new_pandas_df = new_pandas_df.fillna(2)
         self.pandas_dataframe = new_pandas_df
 
 
@@ -167,6 +202,32 @@ class Dataframe:
         new_df.change_pandas_dataframe(self.get_pandas_dataframe())
         return new_df
 
+    def get_data_columns(self) -> Data_Columns:
+        """Gets the columnar store of the pandas dataframe, which is created once and renewed only if the pandas dataframe is changed.
+
+        Returns:
+            Data_Columns: The columnar store.
+        """
+        if self.data_columns is None or self.data_columns.pandas_dataframe is not self.pandas_dataframe:
+            self.data_columns = Data_Columns(self.pandas_dataframe)
+        return self.data_columns
+
+    def create_view_for_new_dataframe(self, new_dataframe_name: str, columns: list):
+        """Creates a new dataframe with some of the columns of a dataframe, without copying them. The columns are shared with this dataframe,
+        so the new dataframe should only be read. Use create_copy_for_new_dataframe() to create a dataframe that is changed.
+
+        Args:
+            new_dataframe_name (str): name of the new dataframe
+            columns (list): columns of this dataframe that the new dataframe consists of
+
+        Returns:
+            Dataframe: The new dataframe
+        """
+        new_df = Dataframe(self.pandas_excel_file, new_dataframe_name, None)
+        # Set the pandas dataframe directly, since change_pandas_dataframe() fills (and thus copies) the columns, which are already filled when this dataframe was changed (cleaned).
+        new_df.pandas_dataframe = self.get_data_columns().get_view(columns)
+        return new_df
+
 
     def write_excel_dataframe(self):
         
@@ -1,4 +1,5 @@
 import pandas as pd
+import threading
 from typing import List
 
 from data.dataframe import Dataframe
@@ -10,6 +11,9 @@ from general_configuration import dfs
 class Dataframes:
     """The Dataframes class stores a List of Dataframes. Using Dataframes one can easily clean all Dataframes or get a single Dataframe.
     """
+    # Dataframes are appended by the threads that build them concurrently, see Data_process.process_build_dataframes().
+    _append_lock = threading.Lock()
+
     def __init__(self, dataframes: List[Dataframe]):
         """This is the constructor of Dataframes.
 
@@ -76,7 +80,8 @@ class Dataframes:
         Args:
             dataframe (Dataframe): Dataframe to add to the list.
         """
-        self.dataframes.append(dataframe)
+        with self._append_lock:
+            self.dataframes.append(dataframe)
 
     def print_dataframes(self):
         for df in self.dataframes:
@@ -0,0 +1,76 @@
+import pandas as pd
+
+
+class LazyExcelFile:
+    """The LazyExcelFile is a handle to an Excel file that is only opened (as a pd.ExcelFile) once its content is needed.
+    Attributes that do not need the content of the file, such as the path in {io}, are available without opening the file.
+    All other attributes and methods, like 'sheet_names', 'book' and 'parse', are passed on to the opened pd.ExcelFile.
+    """
+    def __init__(self, path_excel_file: str, engine: str = 'openpyxl'):
+        """Constructor of the LazyExcelFile, does not open the file.
+
+        Args:
+            path_excel_file (str): Path to the Excel file.
+            engine (str, optional): Engine used by pandas to open the Excel file. Defaults to 'openpyxl'.
+        """
+        self._path_excel_file = path_excel_file
+        self._engine = engine
+
+        self._pandas_ExcelFile: pd.ExcelFile = None
+
+    @property
+    def io(self) -> str:
+        return self._path_excel_file
+
+    @property
+    def opened(self) -> bool:
+        return self._pandas_ExcelFile is not None
+
+    @property
+    def pandas_ExcelFile(self) -> pd.ExcelFile:
+        """Gets the opened pd.ExcelFile, the file is opened if this has not been done yet.
+
+        Returns:
+            pd.ExcelFile: The opened Excel file.
+        """
+        if self._pandas_ExcelFile is None:
+            self._pandas_ExcelFile = pd.ExcelFile(self._path_excel_file, engine=self._engine)
+        return self._pandas_ExcelFile
+
+    def parse(self, *args, **kwargs):
+        """Parses sheet(s) of the Excel file, see pd.ExcelFile.parse().
+        """
+        return self.pandas_ExcelFile.parse(*args, **kwargs)
+
+    def close(self):
+        """Closes the Excel file if it has been opened. It is opened again when its content is needed.
+        """
+        if self._pandas_ExcelFile is not None:
+            self._pandas_ExcelFile.close()
+            self._pandas_ExcelFile = None
+
+    def change_path(self, path_excel_file: str):
+        """Changes the path of the Excel file. If the current file has been opened it is closed, the new file is opened once its content is needed.
+
+        Args:
+            path_excel_file (str): Path to the new Excel file.
+        """
+        self.close()
+        self._path_excel_file = path_excel_file
+
+    def __getattr__(self, name: str):
+        # Only called for attributes that are not found on the LazyExcelFile itself.
+        # Special attributes are not passed on, such that copying or pickling does not open the file.
+        if name.startswith('__') or name.startswith('_pandas_ExcelFile'):
+            raise AttributeError(name)
+        return getattr(self.pandas_ExcelFile, name)
+
+    def __getstate__(self):
+        # The opened file cannot be pickled, it is opened again when needed.
+        return {'_path_excel_file': self._path_excel_file, '_engine': self._engine, '_pandas_ExcelFile': None}
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+
+    def __repr__(self) -> str:
+        return f"LazyExcelFile(io='{self._path_excel_file}', opened={self.opened})"
@@ -0,0 +1,139 @@
+import pandas as pd
+from typing import List
+
+from data.data_source import BaseDataSource
+
+
+class Planning_Reader:
+    """The Planning_Reader class streams the planning sheets of an ExcelFile row by row, using the read-only workbook of openpyxl.
+    Only the non-zero allocations are kept, so memory scales with the number of allocations instead of with the size of the sheet.
+    The result is the (cleaned) planning: a pd.Series named 'allocation' with an (order_suborder, time, empl_line) MultiIndex.
+
+    Two formats are supported:
+        - read_planning: long format (Planning), the columns are order_suborder, time, empl_line and allocation.
+        - read_manual_planning: wide format (Manual_planning), the columns are order_suborder, empl_line and then a column per time.
+    """
+    index_names = ['order_suborder', 'time', 'empl_line']
+
+    def __init__(self, pandas_excel_file: pd.ExcelFile):
+        """Constructor of the Planning_Reader.
+
+        Args:
+            pandas_excel_file (pd.ExcelFile): The opened ExcelFile (engine openpyxl) or data source to read the planning sheets from.
+        """
+        self.excel_file = pandas_excel_file
+
+
+    def read_planning(self, sheet_name: str) -> pd.Series:
+        """Reads a planning in long format, where every row is a single allocation: order_suborder, time, empl_line, allocation.
+
+        Args:
+            sheet_name (str): Name of the sheet with the planning.
+
+        Returns:
+            pd.Series: The non-zero allocations, with the first three columns of the sheet as index.
+        """
+        rows = self._iter_rows(sheet_name)
+        header = next(rows, None)
+        if header is None:
+            return self._create_series([], [], [], [], self.index_names)
+
+        orders, times, empl_lines, allocations = [], [], [], []
+        all_integer = True
+        for row in rows:
+            row = tuple(row) + (None, ) * (4 - len(row))
+            order_suborder, time, empl_line, allocation = row[:4]
+
+            if order_suborder is None and time is None and empl_line is None:
+                continue # Empty row
+
+            all_integer = all_integer and self._is_integer(allocation)
+            if self._is_empty(allocation) or allocation == 0:
+                continue
+
+            orders.append(order_suborder)
+            times.append(time)
+            empl_lines.append(empl_line)
+            allocations.append(allocation)
+
+        return self._create_series(orders, times, empl_lines, allocations, list(header[:3]), all_integer)
+
+
+    def read_manual_planning(self, sheet_name: str) -> pd.Series:
+        """Reads a planning in wide format, where every row is an order_suborder and empl_line combination, with a column per time.
+        Empty cells in the first two columns are filled with the value above them, like pandas does for index columns.
+
+        Args:
+            sheet_name (str): Name of the sheet with the manual planning.
+
+        Returns:
+            pd.Series: The non-zero allocations, with (order_suborder, time, empl_line) as index.
+        """
+        rows = self._iter_rows(sheet_name)
+        header = next(rows, None)
+        if header is None or len(header) < 2:
+            return self._create_series([], [], [], [], self.index_names)
+
+        # Only the columns with a (time) header contain allocations.
+        time_columns = [(position, time) for position, time in enumerate(header) if position >= 2 and time is not None]
+
+        orders, times, empl_lines, allocations = [], [], [], []
+        all_integer = True
+        order_suborder, empl_line = None, None
+        for row in rows:
+            if all(self._is_empty(value) for value in row):
+                continue # Empty row
+
+            order_suborder = row[0] if row[0] is not None else order_suborder
+            empl_line = row[1] if len(row) > 1 and row[1] is not None else empl_line
+
+            for position, time in time_columns:
+                allocation = row[position] if position < len(row) else None
+
+                all_integer = all_integer and self._is_integer(allocation)
+                if self._is_empty(allocation) or allocation == 0:
+                    continue
+
+                orders.append(order_suborder)
+                times.append(time)
+                empl_lines.append(empl_line)
+                allocations.append(allocation)
+
+        index_names = [header[0], 'time', header[1]]
+        series = self._create_series(orders, times, empl_lines, allocations, index_names, all_integer)
+        return series.reorder_levels(self.index_names) if set(index_names) == set(self.index_names) else series
+
+
+    ### HELPER FUNCTIONS
+    def _iter_rows(self, sheet_name: str):
+        # Data sources other than Excel (see data_source.py) offer the rows of their sheets themselves.
+        if isinstance(self.excel_file, BaseDataSource):
+            return self.excel_file.iter_rows(sheet_name)
+
+        sheet = self.excel_file.book[sheet_name]
+        # The dimensions of a read-only sheet are taken from the file and can be wrong, so reset them to read all rows and columns.
+        if getattr(self.excel_file.book, 'read_only', False):
+            sheet.reset_dimensions()
+        return sheet.iter_rows(values_only=True)
+
+    @staticmethod
+    def _is_empty(value) -> bool:
+        return value is None or (isinstance(value, str) and value.strip() == '')
+
+    @staticmethod
+    def _is_integer(value) -> bool:
+        # Like pandas, whole floats are read as integers. Any empty or decimal value makes the allocations floats.
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+    @staticmethod
+    def _create_series(orders: list, times: list, empl_lines: list, allocations: list, index_names: List[str], all_integer: bool = True) -> pd.Series:
+        if all_integer:
+            dtype = 'int64'
+            allocations = [int(allocation) for allocation in allocations]
+        elif all(isinstance(allocation, (int, float)) for allocation in allocations):
+            dtype = 'float64'
+        else:
+            dtype = None
+
+        index = pd.MultiIndex.from_arrays([orders, pd.Index(times), empl_lines], names=index_names)
+        return pd.Series(allocations, index=index, dtype=dtype, name='allocation')
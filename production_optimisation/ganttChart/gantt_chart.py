@@ -3,6 +3,9 @@ import matplotlib.pyplot as plt
 import plotly.express as px
 import pandas as pd
 
+from data.data_index_catalog import Index_Catalog
+from data.data_sparse_planning import Sparse_Planning
+
 
 # https://github.com/apexcharts/apexchpiarts.js/issues/705
 # https://stackoverflow.com/questions/63793981/formatting-multilevel-axes-labels-with-plotly
@@ -26,25 +29,23 @@ class GanttChart:
     def show_plt(self):
         self.plt.show()
 
-    def convert_dataframe(self, specific_orders: pd.DataFrame):
+    def convert_dataframe(self, specific_orders: pd.DataFrame, index_catalog: Index_Catalog = None):
         if isinstance(self.df, pd.DataFrame):
             self.df = self.df.copy().stack()
         else:
             self.df = self.df.copy()
 
         self.df = self.df[self.df != 0.0]
-        grouped = self.df.groupby(['order_suborder', 'time']).sum()
+        grouped = Sparse_Planning.from_series(self.df).group_sum(['order_suborder', 'time']).rename(self.df.name)
         self.grouped_df = grouped.reset_index()
 
-        # Obtain the unique orders and suborders
-        orders = []
-        suborders = []
-        for order_suborder in specific_orders.index:
-            orders.append(specific_orders.loc[order_suborder].iloc[0])
-            suborders.append(specific_orders.loc[order_suborder].iloc[1])
-
-        self.orders = list(set(orders))
-        self.suborders = list(set(suborders))
+        # Obtain the unique orders and suborders, in the order of the index sets of the model if its catalog is given.
+        if index_catalog is not None:
+            self.orders = self._get_unique_labels(specific_orders.iloc[:, 0], index_catalog.get_set('order'))
+            self.suborders = self._get_unique_labels(specific_orders.iloc[:, 1], index_catalog.get_set('suborder'))
+        else:
+            self.orders = list(set(specific_orders.iloc[:, 0].to_list()))
+            self.suborders = list(set(specific_orders.iloc[:, 1].to_list()))
 
         # Adding the specific_orders to the solution.
         self.specific_solution = pd.merge(self.grouped_df.set_index('order_suborder'), specific_orders, left_index=True, right_index=True)
@@ -54,6 +55,14 @@ class GanttChart:
         print(self.specific_solution)
 
 
+    @staticmethod
+    def _get_unique_labels(labels: pd.Series, index_set: pd.Index) -> list:
+        # The labels that are in the index set come first, in the order of the index set.
+        unique_labels = pd.Index(labels.unique())
+        known_labels = index_set.intersection(unique_labels)
+        return known_labels.to_list() + unique_labels.difference(known_labels, sort=False).to_list()
+
+
     def create_ganttchart(self):
         fig, ax = self.plt.subplots(figsize=(12, 8))
 
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 from typing import Dict, Type, Union, ForwardRef
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import pandas as pd
 
+from general_configuration import path_to_excel, orders_schema, availability_schema, skills_schema
+from data.lazy_excel_file import LazyExcelFile
+from data.data_schema import SheetSchema
+from data.data_source import BaseDataSource, open_data_source
 from data.data import (
     BaseDataframe, 
     OrderDataframe, 
@@ -24,14 +28,16 @@ from data.data import (
 class ConfigBaseDataframe:
     """Class used to present a configuring for BaseDataframes.
     """
-    excelFile: pd.ExcelFile = None
+    excelFile: Union[pd.ExcelFile, LazyExcelFile, BaseDataSource] = None
     name_excel_sheet: str = None
     class_type: type[BaseDataframe] = BaseDataframe
 
     read_sheet: bool = True
     read_fillna_value: Union[None, any] = None
+    schema: SheetSchema = None # Columns and dtypes of the sheet, see data/data_schema.py.
     
     build_df: bool = False
+    build_inputs: list[str] = field(default_factory=list) # Dataframes that are used to build the dataframe, it is build after these. Strings should be from 'dfs'.
 
 @dataclass
 class ConfigOrderBased:
@@ -53,14 +59,19 @@ CombinedPlanningDataframeType = ForwardRef("CombinedPlanningDataframe")
 PenaltyDataframeType = ForwardRef("PenaltyDataframe")
 SolutionDataframeType = ForwardRef("SolutionDataframe")
 
-excelFileRead = pd.ExcelFile(
-    "/Users/gebruiker/Documents/GitHub/Production_Optimisation/production_optimisation/EW_Optimisation.xlsm", 
-    engine='openpyxl'
-    )
-excelFileSolution = pd.ExcelFile(
-    "/Users/gebruiker/Documents/GitHub/Production_Optimisation/production_optimisation/EW_Optimisation.xlsm", 
-    engine='openpyxl'
-    )
+# The ExcelFiles are shared by all dataframes and only opened once a sheet is read from them, so importing this configuration does not open the workbook.
+excelFileRead = LazyExcelFile(path_to_excel, engine='openpyxl')
+excelFileSolution = LazyExcelFile(path_to_excel, engine='openpyxl')
+
+def change_path_excel_file(path_excel_file: str):
+    """Changes the path of the ExcelFile to read from and to write the solution to, at run time. 
+    \n Should be called before the dataframes are read, an already opened ExcelFile is closed.
+
+    Args:
+        path_excel_file (str): Path to the ExcelFile.
+    """
+    excelFileRead.change_path(path_excel_file)
+    excelFileSolution.change_path(path_excel_file)
 
 dfs = {
     # >>>> Name of Dataframe instance: ConfigBaseDataframe[...]
@@ -73,7 +84,8 @@ dfs = {
         excelFile=excelFileRead,
         name_excel_sheet='Orders_dataframe',
         class_type=OrderDataframe,
-        read_fillna_value=''
+        read_fillna_value='',
+        schema=orders_schema
         ), 
     'IndexDF': ConfigBaseDataframe(
         excelFile=excelFileRead,
@@ -97,25 +109,29 @@ dfs = {
         excelFile=excelFileRead,
         name_excel_sheet='Config_availability',
         class_type=AvailabilityDataframe,
-        read_fillna_value=0.0
+        read_fillna_value=0.0,
+        schema=availability_schema
         ),
     'SkillDF': ConfigBaseDataframe(
         excelFile=excelFileRead,
         name_excel_sheet='Config_skills', 
         class_type=SkillDataframe,
-        read_fillna_value=0.0
+        read_fillna_value=0.0,
+        schema=skills_schema
         ), 
     'CombinedPlanningDF': ConfigBaseDataframe(
         excelFile=excelFileRead,
         class_type=CombinedPlanningDataframe,
         read_sheet=False,
-        build_df=True
+        build_df=True,
+        build_inputs=['OldPlanningDF', 'ManualPlanningDF']
         ), 
     'PenaltyDF': ConfigBaseDataframe(
         excelFile=excelFileRead,
         class_type=PenaltyDataframe,
         read_sheet=False,
-        build_df=True
+        build_df=True,
+        build_inputs=['OrderDF', 'IndexDF']
         ),
     'SolutioinDF': ConfigBaseDataframe(
         excelFile=excelFileSolution,
@@ -125,6 +141,21 @@ dfs = {
         )
 }
 
+def change_data_source(path_data_source: str):
+    """Changes the source of the dataframes that are read to a different ExcelFile, a directory with Parquet/CSV files or a SQLite database, at run time.
+    \n The solution is still written to the excelFileSolution. Should be called before the dataframes are read.
+
+    Args:
+        path_data_source (str): Path to the data source, see open_data_source() in data/data_source.py.
+    """
+    global excelFileRead
+    data_source = open_data_source(path_data_source)
+
+    for config in dfs.values():
+        if config.excelFile is excelFileRead:
+            config.excelFile = data_source
+    excelFileRead = data_source
+
 orderBased = {
     # Order/Suborder
     # Specific Components
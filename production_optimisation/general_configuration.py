@@ -1,9 +1,21 @@
 # Dependencies: Pandas, Pyomo, xlsxwriter, openpyxl
+import os
+from data.data_schema import SheetSchema
 
-path_to_excel = '/Users/gebruiker/Documents/GitHub/Production_Optimisation/production_optimisation/EW_Optimisation.xlsm'
+path_to_excel = '/Users/gebruiker/Documents/GitHub/Production_Optimisation/production_optimisation/EW_Optimisation.xlsm' # Can also be a directory with a Parquet/CSV file per sheet or a SQLite database with a table per sheet, see data/data_source.py
 #"/Users/gebruiker/Dropbox/Werk/BMQSolutions/0_Production_optimisation/ElectroWatt_Optimisation.xlsx"
 
 time_limit = 60
+sparse_allocation = False # True: only create allocation variables for (order_suborder, time, employee_line) combinations that can be allocated (available, skilled and on the right type of line), instead of for every combination. See data/data_allocation_index.py.
+time_window_slack = None # Number of time intervals after its deadline in which an order_suborder can still be allocated, it is never allocated before its start date. None: every order_suborder can be allocated over the whole horizon.
+gaps_formulation = 'sum' # How the gaps rules count the allocations before and after a time. 'sum': by summing the allocations again for every time, which grows quadratic with the horizon. 'cumulative': from a running total per (order_suborder, time), which grows linear with the horizon. 'start_end': the first and last allocated time of every order_suborder from per-period start and end indicators, where the gaps are the time between them minus the allocated times. Only the allocations are binary and its LP relaxation is at least as tight, but it solves faster or slower depending on the instance (see benchmarks/benchmark_gaps_formulation.py), and it counts the gaps that 'sum' and 'cumulative' can hide (they do not have gaps_gaps2), so its objective value can be higher.
+headless = False # Run without user interface (batch/server runs): no pop-ups and no ganttchart, the GUI and plotting packages are then never loaded.
+
+use_data_cache = False # Store the read and build dataframes on disk, such that an unchanged excel file does not have to be read again.
+path_to_cache = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_cache') # Directory in which the cached dataframes are stored, next to this file (ignored by git).
+cache_max_entries = 5 # Maximum number of cached versions of the excel file, the oldest versions are removed first.
+max_workers_read = None # Number of processes that read the sheets concurrently (data/data.py), None uses the number of processors and 1 reads the sheets one by one.
+max_workers_build = None # Number of threads that build independent dataframes concurrently (data/data_build_graph.py), None uses the number of processors and 1 builds the dataframes one by one.
 old_planning_limit = '21-08-2023 14:00:00' # Until which point should the old planning be used. Also, format is important, see the format in the oldplanning constraint.
 
 df_reader_helper = ['helper_read_sheets'] # Sheet that contains information about all the other sheets. Possible to rename to 'sheet1', that way it is standardized, but also this is standardized as long as you dont change the name. 
@@ -20,26 +32,64 @@ sheet_types = { # Should be compatable with 'type of sheets' in 'config_main'
 
 description_order_df = 'Description' # in cleaning the 'description columns' of the orders_dataframe should not be 'cleaned' that is turned to uppercase, because then the description might become unreadable.
 
-dfs = { # Standard name: [ Name of excelsheet / dataframe, [ columns in (orders) dataframe], 'filter_type']
-    'helper_read_sheets': ['helper_read_sheets', None, ''], # read from excel
-    'orders_df': ['Orders_dataframe', None, ''], # read from excel
-    'index_sets_df': ['Index_sets_dataframe', None, ''], # read from excel
-    'availability_df': ['Config_availability', None, 0.0], # read from excel
-    'skills_df': ['Config_skills', None, 0.0], # read from excel
-    'old_planning_df':['Planning', None, 0.0], # read from excel
-    'manual_planning_df':['Manual_planning', None, 0.0], # read from excel
-    'time_req_df': ['Time_required_per_order', ['Time_hours_lowerbound', 'Time_hours_upperbound'], None],
-    'specific_line_df': ['Production_specific_line', ['Production_line_specific_line'], None],
-    'dates_df': ['dates_start_deadline', ['Date_start', 'Date_deadline'], None],
-    'specific_order_req_time_df':['specific_order_req_time_df', ['Sub_order', 'Time_hours_upperbound'], None],
-    'next_prev_suborder_df': ['Next_prev_suborder', ['Previous_sub_order', 'Next_sub_order'], None],
-    'revenue_df': ['Revenue', ['Revenue'], None],
-    'order_specific_df': ['Order_specific', ['Order_number', 'Sub_order'], None],
-    'line_indicator_df': ['line_indicator',  ['On_line'], None],
-    'penalty_df': ['penalty', None, None], # build using other, already build, dataframes. 
-    'old_and_manual_planning_df': ['old_and_manual_planning_df', None, None],
-    'percentage_df': ['percentage', ['Percentage_prev_sub_order_needed_before_next_sub_order'], None],
-    'solution_df': ['Planning', None, 0.0] # TO EXCEL, so first entry is sheet to write to. 
+# Schemas of the sheets that are read, see data/data_schema.py. The columns of a sheet are typed while reading, instead of cleaning them element by element.
+helper_read_sheets_schema = SheetSchema(
+    usecols=['listofsheets', 'sheet_type']
+)
+orders_schema = SheetSchema(
+    dtypes={
+        'Order_number': 'Int32', # Nullable integers (Int32): an empty cell stays missing instead of becoming 0, see data/data_schema.py.
+        'Sub_order': 'category',
+        'Revenue': 'float64',
+        'On_line': 'float64',
+        'Production_line_specific_line': 'category',
+        'Time_required': 'float64',
+        'Time_completed': 'float64',
+        'Time_to_complete': 'float64',
+        'Time_hours_lowerbound': 'float64',
+        'Time_hours_upperbound': 'float64',
+        'Quantity_required': 'Int32',
+        'Quantity_completed': 'Int32',
+        'Quantity_to_complete': 'Int32',
+        'Date_start': 'datetime64[ns]',
+        'Date_deadline': 'datetime64[ns]',
+        'Previous_sub_order': 'category',
+        'Next_sub_order': 'category',
+        'Percentage_prev_sub_order_needed_before_next_sub_order': 'float64',
+        'Manual_urgency': 'Int32'
+    },
+    uppercase=True,
+    keep_case=['Unique_Code', description_order_df] # The first column becomes the index, which is not cleaned.
+)
+availability_schema = SheetSchema(
+    dtypes={'Time_intervals': 'datetime64[ns]'},
+    default_dtype='int32' # Availability of an employee/line is 0 or 1.
+)
+skills_schema = SheetSchema(
+    dtypes={'Employee_line': 'object'},
+    default_dtype='int32' # Skill of an employee/line for a suborder is 0 or 1.
+)
+
+dfs = { # Standard name: [ Name of excelsheet / dataframe, [ columns in (orders) dataframe], 'filter_type', schema of the sheet (None: no schema)]
+    'helper_read_sheets': ['helper_read_sheets', None, '', helper_read_sheets_schema], # read from excel
+    'orders_df': ['Orders_dataframe', None, '', orders_schema], # read from excel
+    'index_sets_df': ['Index_sets_dataframe', None, '', None], # read from excel
+    'availability_df': ['Config_availability', None, 0.0, availability_schema], # read from excel
+    'skills_df': ['Config_skills', None, 0.0, skills_schema], # read from excel
+    'old_planning_df':['Planning', None, 0.0, None], # read from excel
+    'manual_planning_df':['Manual_planning', None, 0.0, None], # read from excel
+    'time_req_df': ['Time_required_per_order', ['Time_hours_lowerbound', 'Time_hours_upperbound'], None, None],
+    'specific_line_df': ['Production_specific_line', ['Production_line_specific_line'], None, None],
+    'dates_df': ['dates_start_deadline', ['Date_start', 'Date_deadline'], None, None],
+    'specific_order_req_time_df':['specific_order_req_time_df', ['Sub_order', 'Time_hours_upperbound'], None, None],
+    'next_prev_suborder_df': ['Next_prev_suborder', ['Previous_sub_order', 'Next_sub_order'], None, None],
+    'revenue_df': ['Revenue', ['Revenue'], None, None],
+    'order_specific_df': ['Order_specific', ['Order_number', 'Sub_order'], None, None],
+    'line_indicator_df': ['line_indicator',  ['On_line'], None, None],
+    'penalty_df': ['penalty', None, None, None], # build using other, already build, dataframes. 
+    'old_and_manual_planning_df': ['old_and_manual_planning_df', None, None, None],
+    'percentage_df': ['percentage', ['Percentage_prev_sub_order_needed_before_next_sub_order'], None, None],
+    'solution_df': ['Planning', None, 0.0, None] # TO EXCEL, so first entry is sheet to write to. 
 } #FIXME: Split up in different dictionaries for different functions, this is unorganised. make dict for read excel, dict for build, dict for test_validation.
 # Also add an example input like in Feasability_dfs
 
@@ -55,6 +105,22 @@ dfs_to_build_columnBased = ['time_req_df', 'specific_line_df', 'dates_df', 'next
 dfs_to_build_indicatorBased = ['line_indicator_df'] # Strings should be from 'dfs'. 
 #FIXME: These could be removed if the previous fixme about different dictionaries for the dfs {} is completed. 
 
+dfs_build_inputs = { # Dataframes that are build, with the (read or build) dataframes that are used to build them. Strings should be from 'dfs'.
+    # A dataframe is build after its inputs (see data/data_build_graph.py), and is only rebuild if one of its inputs changed. A dataframe that is completed from its read version lists itself.
+    # The dataframes of 'dfs_to_build_columnBased' are not cached, they are views on the columns of the orders_df (see data/data_columns.py), which take no time to build.
+    'time_req_df': ['orders_df'],
+    'specific_line_df': ['orders_df'],
+    'dates_df': ['orders_df'],
+    'next_prev_suborder_df': ['orders_df'],
+    'revenue_df': ['orders_df'],
+    'order_specific_df': ['orders_df'],
+    'percentage_df': ['orders_df'],
+    'penalty_df': ['orders_df', 'index_sets_df', 'dates_df', 'revenue_df'],
+    'index_sets_df': ['orders_df', 'index_sets_df'], # The index_sets_df is completed using the orders_df.
+    'old_and_manual_planning_df': ['old_planning_df', 'manual_planning_df'],
+    'line_indicator_df': ['orders_df']
+}
+
 data_indexes_columns = { # Column titles of index_sets.
     'order_suborder': 'Orders_suborders',
     'order': 'Orders',
@@ -1,34 +1,27 @@
-import re
-import pandas as pd
-from icecream import ic
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from data.data_process import Data_process
-from problem_declaration.models import EWOptimisation
-from problem_declaration.test_solvability import SolvabilityTest
-from ganttChart.gantt_chart import GanttChart
-from general_configuration import path_to_excel, time_limit
+from data.data_cache import Data_Cache
+from data.data_source import open_data_source
+from general_configuration import path_to_excel, time_limit, headless, use_data_cache, path_to_cache, cache_max_entries
+
+# The model (pyomo) and the ganttchart (matplotlib, plotly) are imported once they are used, such that the data processing starts right away.
+if TYPE_CHECKING:
+    from problem_declaration.models import EWOptimisation
 
 def read():
     """Reading the data.
 
     Raises:
-        ValueError: If there is no excel file found in the directory.
+        ValueError: If there is no excel file, directory (with Parquet/CSV files) or SQLite database found in the path.
 
     Returns:
-        pd.ExcelFile: The excelfile in a pd format.
+        Union[LazyExcelFile, BaseDataSource]: The excelfile, which is only opened (in a pd format) once its content is needed. Or the data source that is used in its place.
     """
-    ### FIND THE PATH AND EXCEL FILE TO READ DATA FROM.
-    patterns_to_search = ['.xlsx', '.xlsm']
-    patterns = '|'.join(re.escape(ext) for ext in patterns_to_search)
-
-    if re.search(patterns, path_to_excel):
-        excel_file = pd.ExcelFile(path_to_excel)
-        #excel_file_write = pd.ExcelFile(path_to_excel)
-    else:
-        raise ValueError(f'No excel file found in directory {path_to_excel}')
-
-    ### READ THE EXCEL FILE USING OPENPYXL.
-    excel_file = pd.ExcelFile(path_to_excel, engine='openpyxl')
+    ### FIND THE EXCEL FILE OR OTHER DATA SOURCE TO READ DATA FROM. AN EXCEL FILE IS OPENED ONCE, WHEN FIRST NEEDED, AND SHARED BY ALL READS.
+    excel_file = open_data_source(path_to_excel, engine='openpyxl')
 
     return excel_file
 
@@ -41,12 +34,13 @@ def main():
 
     ### PROCESSING THE DATA.
     # CREATE A DATA PROCESS
-    process = Data_process(excel_file) # add a way to check whether the data has changed in excel => store the data in database => no need to reread every time.
+    data_cache = Data_Cache(path_to_cache, max_entries=cache_max_entries) if use_data_cache else None
+    process = Data_process(excel_file, data_cache=data_cache)
     # READ THE HELPER SHEET OF THE EXCELFILE, THAT INDICATES WHICH SHEETS TO READ AND WHAT TYPE OF SHEET THEY ARE
     process.process_helper_read_sheets('helper_read_sheets')
-    # READ ALL THE NECESARRY SHEETS BASED ON THEIR SHEET TYPE
+    # READ ALL THE NECESARRY SHEETS BASED ON THEIR SHEET TYPE, SHEETS THAT DID NOT CHANGE SINCE THE PREVIOUS RUN ARE LOADED FROM THE CACHE
     process.process_read_dataframes()
-    # USING THE READ DATA, BUILD NEEDED DATAFRAMES
+    # USING THE READ DATA, BUILD NEEDED DATAFRAMES, ONLY DATAFRAMES THAT DEPEND ON CHANGED SHEETS ARE BUILD AGAIN
     process.process_build_dataframes()
     # CLOSE THE EXCELFILE
     excel_file.close()
@@ -60,6 +54,9 @@ def problem(dataProcess: Data_process):
     Args:
         dataProcess (Data_process): Process containing the data.
     """
+    from problem_declaration.models import EWOptimisation
+    from problem_declaration.test_solvability import SolvabilityTest
+
     ### BUILDING THE MATHEMATICAL MODEL FOR THE OPTIMISATION
     # CREATE THE MODEL, GIVEN THE DATA
     ewOpt = EWOptimisation(dataProcess.dataframes)
@@ -78,7 +75,9 @@ def problem(dataProcess: Data_process):
     # EXPORT THE MODEL TO THE EXCELFILE
     #ewOpt.export() # DO NOT EXPORT BEFORE BACKING UP THE EXCEL FILE
 
-    solution(ewOptimalisatie=ewOpt, dataProcess=dataProcess)
+    # SHOW THE SOLUTION, IN HEADLESS MODE THERE IS NO USER TO SHOW IT TO
+    if not headless:
+        solution(ewOptimalisatie=ewOpt, dataProcess=dataProcess)
 
 def solution(ewOptimalisatie: EWOptimisation, dataProcess: Data_process):
     """Transform the solution into a ganttchart.
@@ -87,12 +86,14 @@ def solution(ewOptimalisatie: EWOptimisation, dataProcess: Data_process):
         ewOptimalisatie (EWOptimisation): The mathematical model that has been solved
         dataProcess (Data_process): The dataprocess containing the data.
     """
+    from ganttChart.gantt_chart import GanttChart
+
     ### OBTAIN A USER INTERFACE FOR END USERS
 
     # CREAT A GANTTCHART OBJECT FOR THE PRODUCTION SCHEDULE
     gantt_chart = GanttChart(ewOptimalisatie.short_solution)
     # CONVERT THE SOLUTION TO CORRECT FORMAT FOR THE GANTTCHART
-    gantt_chart.convert_dataframe(dataProcess.dataframes.get_dataframe_by_name('order_specific_df').get_pandas_dataframe())
+    gantt_chart.convert_dataframe(dataProcess.dataframes.get_dataframe_by_name('order_specific_df').get_pandas_dataframe(), ewOptimalisatie.index_catalog)
     # CREATE THE ACTUAL GANTTCHART
     gantt_chart.create_ganttchart()
     # SHOW THE GANTTCHART
@@ -2,15 +2,18 @@ import pyomo
 import pyomo.opt
 import pyomo.environ as pyo
 import pandas as pd
+import numpy as np
 import logging
-from icecream import ic
 import sys
 
 from data.dataframe import Dataframe
 from data.dataframes import Dataframes
 from data.data_index import Data_Index
+from data.data_feasibility import Data_Feasibility
+from data.data_allocation_index import Allocation_Index
+from data.data_routing import Data_Routing
 
-from general_configuration import dfs, old_planning_limit
+from general_configuration import dfs, sparse_allocation, time_window_slack, gaps_formulation
 
 
 """ 
@@ -36,6 +39,7 @@ class EWOptimisation:
         
         self.dataframes_class = dataframes_class 
         self.data_index = Data_Index(self.dataframes_class)
+        self.index_catalog = None # The index sets of the model, read once when the model is created. See Index_Catalog.
         self.excel_file = dataframes_class.get_dataframe_by_index(0).get_excel_file() # All dataframes come from the same file. That is why it simply selects the first dataframe and gets the excelfile. 
 
         self.model_created : bool = False
@@ -45,7 +49,7 @@ class EWOptimisation:
 
         self.initialized_EWOptimisation = True
         
-    def createModel(self):
+    def createModel(self, sparse_allocation: bool = sparse_allocation, time_window_slack: int = time_window_slack, gaps_formulation: str = gaps_formulation):
         """Creates the pyomo model that optimizes the production planning for EW. \n
 
         THE OBJECTIVE FUNCTION:
@@ -85,17 +89,33 @@ class EWOptimisation:
             DURING INDICATES IF AT A CERTAIN TIME THE ORDER HAS BEEN STARTED AND HAS NOT YET BEEN FINISHED, THUS INDICATES ALL TIME INTERVALS BETWEEN START AND FINISH OF ORDER \n
             GAPS INDICATES IF BETWEEN THE START AND FINISH TIMES OF AN ORDER_SUBORDER, THE IS AN NOT ALLOCATION AT A CERTAIN TIME. THAT IS, THERE IS A GAP IN THE SCHEDULE. 
 
+        Args:
+            sparse_allocation (bool, optional): Only create allocation variables for the feasible (order_suborder, time, employee_line) combinations, see Data_Feasibility. 
+                The rules that force the other allocations to zero (skills, availability and the lines) are then not needed. Defaults to 'sparse_allocation' of the general_configuration.
+            time_window_slack (int, optional): Only create the variables of an order_suborder within its time window: from its start date up to its deadline plus this number of time intervals.
+                None creates them over the whole horizon. Defaults to 'time_window_slack' of the general_configuration.
+            gaps_formulation (str, optional): How the allocations of an order_suborder before and after a time are counted. 'cumulative' uses a running total per (order_suborder, time), 
+                see constr_cumulativeAlloc, and 'sum' sums the allocations again for every time. 'start_end' indicates the time intervals from the first allocated time on (var_before) 
+                and up to the last allocated time (var_after) with per-period start and end indicators, without big-M rules, such that the gaps are the time between the first and last 
+                allocation minus the allocated times. Only its allocations are binary, and it counts the allocations with running totals like 'cumulative'. 
+                Defaults to 'gaps_formulation' of the general_configuration.
         """
+        if gaps_formulation not in ['cumulative', 'sum', 'start_end']:
+            raise ValueError(f"The gaps_formulation should be either 'cumulative', 'sum' or 'start_end', not {gaps_formulation!r}.")
+        has_running_totals = gaps_formulation in ['cumulative', 'start_end']
+
         self.m = pyo.ConcreteModel()
 
         ### Retrieving data
-        # Retrieve sets/lists
-        self.list_order_suborder = self.data_index.get_index_set('order_suborder')
-        self.list_suborder_set = self.data_index.get_index_set('suborder')
-        self.list_time = self.data_index.get_index_set('time')
-        self.list_employee_line = self.data_index.get_index_set('employee_line')
-        self.list_employee = self.data_index.get_index_set('employee')
-        self.list_line = self.data_index.get_index_set('line')
+        # Retrieve sets/lists, from the catalog of the index sets that is shared with the solvability checks and the Gantt chart.
+        self.index_catalog = self.data_index.get_catalog()
+        self.list_order_suborder = self.index_catalog.get_index_set('order_suborder')
+        self.list_suborder_set = self.index_catalog.get_index_set('suborder')
+        self.list_time = self.index_catalog.get_index_set('time')
+        self.time_grid = self.index_catalog.time_grid # The time intervals before or after a time interval are slices of the grid, see Time_Grid.
+        self.list_employee_line = self.index_catalog.get_index_set('employee_line')
+        self.list_employee = self.index_catalog.get_index_set('employee')
+        self.list_line = self.index_catalog.get_index_set('line')
 
         # Retrieve dataframes that represent specific columns of the 'order_df'. 
         self.dates_df = self.dataframes_class.get_dataframe_by_name('dates_df').get_pandas_dataframe()
@@ -122,13 +142,91 @@ class EWOptimisation:
         self.manual_planning_df = self.dataframes_class.get_dataframe_by_name('manual_planning_df').get_pandas_dataframe()
         self.combined_planning_df = self.dataframes_class.get_dataframe_by_name('old_and_manual_planning_df').get_pandas_dataframe()
 
-        # Create dataframe where unique_code can be looked for by using specific order and suborder. (order, suborder) -> (order_suborder)
-            # NOTE: This can be made a 'specific' function if we implement subclasses of the dataframe class, like it is stated in the todo's
-            # RENAME: reverseSearch_specific_order_suborder?!
-        transpose_specific_order_suborder = self.specific_order_suborder.copy()
-        transpose_index = self.specific_order_suborder.columns.to_list()
-        transpose_specific_order_suborder.reset_index(inplace=True)
-        transpose_specific_order_suborder.set_index(transpose_index, inplace=True)
+        # Obtain the integer codes of the index sets (label -> code), see Data_Codes. The tables are stored as arrays indexed by these codes, 
+        # such that the rules below look up their values by array indexing instead of .loc on the (string) indexes of the dataframes.
+        self.codes = self.index_catalog.codes
+        code_order_suborder = self.codes.get_codes('order_suborder')
+        code_time = self.codes.get_codes('time')
+        code_employee_line = self.codes.get_codes('employee_line')
+
+        # Tables indexed by two codes.
+        self.penalty_array = self.codes.encode_dataframe(self.penalty_df, 'time', 'order_suborder') # [time, order_suborder]
+        self.skills_array = self.codes.encode_dataframe(self.skills_df, 'employee_line', 'suborder') # [employee_line, suborder]
+        self.availability_array = self.codes.encode_dataframe(self.availability_df, 'time', 'employee_line') # [time, employee_line]
+
+        # Columns of the order_df indexed by the order_suborder code.
+        self.time_req_lb_array = self.codes.encode_series(time_req_lb, 'order_suborder')
+        self.time_req_ub_array = self.codes.encode_series(time_req_ub, 'order_suborder')
+        self.order_code_array = self.codes.encode('order', self.codes.encode_series(self.specific_order_suborder.iloc[:, 0], 'order_suborder'))
+        self.suborder_code_array = self.codes.encode('suborder', self.codes.encode_series(self.specific_order_suborder.iloc[:, 1], 'order_suborder'))
+        self.percentage_array = self.codes.encode_series(self.percentage_df.iloc[:, 0], 'order_suborder')
+        self.exec_on_line_array = self.codes.encode_series(self.exec_on_line_df.iloc[:, 0], 'order_suborder')
+        specific_line = self.codes.encode_series(self.specific_line_df.iloc[:, 0], 'order_suborder')
+        self.has_specific_line_array = specific_line != ''
+        self.specific_line_code_array = self.codes.encode('employee_line', specific_line, missing_code=-1) # -1: no specific line, or a line that is not an employee_line.
+
+        # Bitsets of the availability, skills and line compatibility, from which the feasible allocations and the capacities follow at once. See Data_Feasibility.
+        employee_lines = self.codes.get_labels('employee_line')
+        self.feasibility = Data_Feasibility(
+            availability_array=self.availability_array,
+            skills_array=self.skills_array,
+            suborder_code_array=self.suborder_code_array,
+            exec_on_line_array=self.exec_on_line_array,
+            is_line_array=employee_lines.isin(self.list_line),
+            is_employee_array=employee_lines.isin(self.list_employee),
+            has_specific_line_array=self.has_specific_line_array,
+            specific_line_code_array=self.specific_line_code_array
+            )
+
+        # Cut points of the orders on the time grid: the first position at or after the start date, and the end of the positions up to and including the deadline.
+        self.start_position_array = self.time_grid.get_cuts(self.codes.encode_series(self.date_start, 'order_suborder'), side='left')
+        self.deadline_position_array = self.time_grid.get_cuts(self.codes.encode_series(self.date_deadline, 'order_suborder'), side='right')
+
+        # The routing of the orders through the suborders: the previous order_suborder of every order_suborder, see Data_Routing.
+        self.routing = Data_Routing(
+            order_code_array=self.order_code_array,
+            suborder_code_array=self.suborder_code_array,
+            percentage_array=self.percentage_array,
+            time_req_lb_array=self.time_req_lb_array,
+            number_of_orders=self.codes.get_size('order'),
+            number_of_suborders=self.codes.get_size('suborder')
+            )
+
+        # Plannings, which are sparse, keyed by the codes of their (order_suborder, time, employee_line) combinations.
+        self.old_planning = self.codes.encode_planning(self.old_planning_df)
+        self.manual_planning = self.codes.encode_planning(self.manual_planning_df)
+        self.combined_planning = self.codes.encode_planning(self.combined_planning_df)
+
+        planned = self.combined_planning.filter(self.combined_planning.allocations == 1)
+        planned_order_suborder_codes, planned_time_codes, _ = planned.coordinates
+
+        # Time window of every order_suborder: the time positions [window_start, window_stop) in which it can be allocated, from its start date up to its deadline plus the slack.
+        # The window always holds the planned allocations of the order_suborder, and an order_suborder with an empty window (like a deadline before the horizon) gets the whole horizon.
+        number_of_times = len(self.list_time)
+        self.window_start_array = np.zeros(len(self.list_order_suborder), dtype=int)
+        self.window_stop_array = np.full(len(self.list_order_suborder), number_of_times)
+        if time_window_slack is not None:
+            window_start = self.start_position_array.copy()
+            window_stop = np.minimum(self.deadline_position_array + time_window_slack, number_of_times)
+            is_empty = window_stop <= window_start
+            self.window_start_array = np.where(is_empty, 0, window_start)
+            self.window_stop_array = np.where(is_empty, number_of_times, window_stop)
+            np.minimum.at(self.window_start_array, planned_order_suborder_codes, planned_time_codes)
+            np.maximum.at(self.window_stop_array, planned_order_suborder_codes, planned_time_codes + 1)
+        time_positions = np.arange(number_of_times)
+        window_mask = (time_positions >= self.window_start_array[:, None]) & (time_positions < self.window_stop_array[:, None]) # [order_suborder, time]
+
+        # The (order_suborder, time, employee_line) combinations that get an allocation variable: within the time window, all of them or only the feasible ones. 
+        # Planned allocations always get a variable, such that a planned allocation that is not feasible still makes the model infeasible, see constr_infeasibleAllocations.
+        allocation_mask = np.broadcast_to(window_mask[:, :, None], self.feasibility.shape).copy()
+        infeasible_allocations = []
+        if sparse_allocation:
+            feasible_mask = self.feasibility.get_feasible_mask()
+            allocation_mask &= feasible_mask
+            allocation_mask[planned.coordinates] = True
+            infeasible_allocations = Allocation_Index(allocation_mask & ~feasible_mask, self.list_order_suborder, self.list_time, self.list_employee_line).tuples
+        self.allocation_index = Allocation_Index(allocation_mask, self.list_order_suborder, self.list_time, self.list_employee_line)
+        gaps_index = [(i, j) for i, window in zip(self.list_order_suborder, window_mask) for j, is_in_window in zip(self.list_time, window) if is_in_window]
 
         ### Create needed sets, variables and parameters for the model.
         # Create sets for the model
@@ -138,8 +236,9 @@ class EWOptimisation:
         self.m.set_employee = pyo.Set(initialize=self.list_employee, name='set_employee', doc='Set of all employees')
         self.m.set_line = pyo.Set(initialize=self.list_line, name='set_line', doc='Set of all production lines')
         
-        self.m.set_alloc_index = pyo.Set(initialize=self.m.set_order_suborder * self.m.set_time * self.m.set_employee_line)
-        self.m.set_gaps_index = pyo.Set(initialize=self.m.set_order_suborder * self.m.set_time)
+        self.m.set_alloc_index = pyo.Set(initialize=self.allocation_index.tuples, dimen=3, name='set_alloc_index', doc='Set of the (order_suborder, time, employee_line) combinations that have an allocation variable')
+        self.m.set_infeasible_alloc_index = pyo.Set(initialize=infeasible_allocations, dimen=3, name='set_infeasible_alloc_index', doc='Set of the planned combinations that are not feasible (only with sparse allocation)')
+        self.m.set_gaps_index = pyo.Set(initialize=gaps_index, dimen=2, name='set_gaps_index', doc='Set of the (order_suborder, time) combinations within the time window of the order_suborder')
 
         # Create the upperbounds for constraints in the model.
         self.upperbound = len(self.m.set_order_suborder) * len(self.m.set_time) * len(self.m.set_employee_line)
@@ -150,15 +249,58 @@ class EWOptimisation:
         # Create variables for the model
         self.m.var_alloc = pyo.Var(self.m.set_alloc_index, domain=pyo.Binary, name='var_alloc', doc="Represents the allocation of order_suborder's at a specific time, performed by an employee_line") 
 
-        self.m.var_indicator_alloc_sum_employee_line = pyo.Var(self.m.set_gaps_index, domain=pyo.Binary, name='var_indicator_alloc_sum_employee_line', doc='Represents an allocator that has value 1 when at least one employee_line has been scheduled else value 0')
+        # With the 'start_end' gaps formulation the variables of the gaps are fixed by the allocations (see the start and end rules), such that they do not need to be binary.
+        gaps_domain = pyo.UnitInterval if gaps_formulation == 'start_end' else pyo.Binary
+        self.m.var_indicator_alloc_sum_employee_line = pyo.Var(self.m.set_gaps_index, domain=gaps_domain, name='var_indicator_alloc_sum_employee_line', doc='Represents an allocator that has value 1 when at least one employee_line has been scheduled else value 0')
         
         # In the next 'doc's, 'Including' means: if var_alloc(51124_MAG, 09:00:00) = 1 and then the entire production is finished, 
         # then var_after(51124_MAG, 08:00:00) = var_after(51124_MAG, 09:00:00) = 1, but var_after(51124_MAG, 10:00:00)=0
         # then var_before(51124_MAG, 08:00:00) = 0 , but var_before(51124_MAG, 09:00:00) = var_before(51124_MAG, 10:00:00) = ... = 1
-        self.m.var_before = pyo.Var(self.m.set_gaps_index, domain=pyo.Binary, name='var_gaps_before', doc="Represents the sum of allocations before (and including) a specific combination of (order_suborder, time)")
-        self.m.var_after = pyo.Var(self.m.set_gaps_index, domain=pyo.Binary, name='var_gaps_after', doc="Represents the sum of allocations after (and including) a specific combination of (order_suborder, time)") 
-        self.m.var_during = pyo.Var(self.m.set_gaps_index, domain=pyo.Binary, name='var_gaps_during', doc="Represents the entire period that an order_suborder is scheduled, from start till finish. (var_alloc only gives allocated combination value 1, this also gives combination inbetween start and finish that represent a 'gap' value 1)")
-        self.m.var_gaps = pyo.Var(self.m.set_gaps_index, domain=pyo.Binary, name='var_gaps', doc="Represents all the gaps that an order_suborder allocation has.")
+        self.m.var_before = pyo.Var(self.m.set_gaps_index, domain=gaps_domain, name='var_gaps_before', doc="Represents the sum of allocations before (and including) a specific combination of (order_suborder, time)")
+        self.m.var_after = pyo.Var(self.m.set_gaps_index, domain=gaps_domain, name='var_gaps_after', doc="Represents the sum of allocations after (and including) a specific combination of (order_suborder, time)") 
+        self.m.var_during = pyo.Var(self.m.set_gaps_index, domain=gaps_domain, name='var_gaps_during', doc="Represents the entire period that an order_suborder is scheduled, from start till finish. (var_alloc only gives allocated combination value 1, this also gives combination inbetween start and finish that represent a 'gap' value 1)")
+        self.m.var_gaps = pyo.Var(self.m.set_gaps_index, domain=gaps_domain, name='var_gaps', doc="Represents all the gaps that an order_suborder allocation has.")
+        if has_running_totals:
+            self.m.var_cumulative_alloc = pyo.Var(self.m.set_gaps_index, domain=pyo.NonNegativeReals, name='var_cumulative_alloc', doc="Represents the sum of allocations before (and including) a specific combination of (order_suborder, time), that is the running total of the allocations.")
+
+        # HELPER FUNCTION
+        def get_cumulative_alloc(m, i, position):
+            """Gets the running total of the allocations of order_suborder {i} up to and including a time position, for the gaps formulations with running totals. 
+            There are no allocations before the time window of {i}, and after its window the running total does not change.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                position (int): time position, -1 for before the first time.
+
+            Returns:
+                Expression: var_cumulative_alloc(i, min(position, end of the time window)), or 0 before the time window.
+            """
+            code_i = code_order_suborder[i]
+            if position < self.window_start_array[code_i]:
+                return 0
+            return m.var_cumulative_alloc[(i, self.list_time[min(position, self.window_stop_array[code_i] - 1)])]
+
+        # HELPER FUNCTION
+        def get_allocated_hours(m, i, time_slice):
+            """Gets the number of allocated hours of order_suborder {i} within a range of time positions, like the time intervals before or after a time, see Time_Grid.
+            With running totals (the 'cumulative' and 'start_end' gaps formulations) this is the difference between two running totals, otherwise the sum of the allocations.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                time_slice (slice): time positions
+
+            Returns:
+                Expression: allocation(sum over time {t} in the time_slice and over employee_line)
+            """
+            if has_running_totals:
+                start, stop, _ = time_slice.indices(number_of_times)
+                return get_cumulative_alloc(m, i, stop - 1) - get_cumulative_alloc(m, i, start - 1) if stop > start else 0
+            return sum(
+                m.var_alloc[index] 
+                for index in self.allocation_index.get_allocations(code_order_suborder[i], time_slice)
+                )
 
         #FIXME: MAKE A CORRECT OBJECTIVE FUNCTION THAT PRIORITIZES THE MOST IMPORTANT ORDERS.
         # Create objective function
@@ -180,20 +322,23 @@ class EWOptimisation:
             """
             penalty = \
                 sum(
-                    m.var_alloc[i, j, k] * self.penalty_df.loc[j, i]
-                    for i in m.set_order_suborder
-                    for j in m.set_time
-                    for k in m.set_employee_line
-                ) + \
+                    m.var_alloc[i, j, k] * self.penalty_array[code_time[j], code_order_suborder[i]]
+                    for (i, j, k) in m.set_alloc_index
+                )
+            penalty = penalty + \
                 sum(
                     m.var_gaps[(i, j)] * 400
-                    for i in m.set_order_suborder
-                    for j in m.set_time
+                    for (i, j) in m.set_gaps_index
                 ) + \
                 sum(
                     (1 - m.var_before[(i, j)]) * 40
+                    for (i, j) in m.set_gaps_index
+                ) + \
+                sum( # Outside its time window an order_suborder has not started before the window, and after the window it has started if it has started at the end of the window.
+                    40 * self.window_start_array[code_order_suborder[i]]
+                    + 40 * (number_of_times - self.window_stop_array[code_order_suborder[i]]) * (1 - m.var_before[(i, self.list_time[self.window_stop_array[code_order_suborder[i]] - 1])])
                     for i in m.set_order_suborder
-                    for j in m.set_time
+                    if self.window_start_array[code_order_suborder[i]] > 0 or self.window_stop_array[code_order_suborder[i]] < number_of_times
                 )
             
             return penalty
@@ -215,14 +360,16 @@ class EWOptimisation:
             Returns:
                 Expression: time_req_lb <= allocation(sum over time and employee_line) <= req_time_up
             """
+            allocations = self.allocation_index.get_allocations(code_order_suborder[i])
+            if not allocations: # Without allocation variables (sparse allocation) the required hours can only be met if no hours are required.
+                return pyo.Constraint.Skip if self.time_req_lb_array[code_order_suborder[i]] <= 0 else pyo.Constraint.Infeasible
             return (
-                time_req_lb.loc[i],
+                self.time_req_lb_array[code_order_suborder[i]],
                 sum(
-                    m.var_alloc[(i, j, k)] 
-                    for j in m.set_time 
-                    for k in m.set_employee_line
+                    m.var_alloc[index] 
+                    for index in allocations
                 ),
-                time_req_ub.loc[i]
+                self.time_req_ub_array[code_order_suborder[i]]
             )
         self.m.constr_required_planned_hours = pyo.Constraint(self.m.set_order_suborder, rule=rule_requiredPlannedHours)
 
@@ -239,10 +386,13 @@ class EWOptimisation:
             Returns:
                 Expression: 0 <= allocation(sum over order_suborder) <= 1
             """
+            allocations = self.allocation_index.get_allocations_of_employee_line(code_time[j], code_employee_line[k])
+            if not allocations: # The employee_line cannot be allocated at time {j} (sparse allocation).
+                return pyo.Constraint.Skip
             return (
                 0, 
-                sum(m.var_alloc[(i, j, k)]
-                    for i in m.set_order_suborder
+                sum(m.var_alloc[index]
+                    for index in allocations
                 ),
                 1
             )
@@ -261,15 +411,19 @@ class EWOptimisation:
             Returns:
                 Expression: 0 <= allocation(sum over time) <= 1 (skills_df has binary value (0/1))
             """
-            suborder = self.specific_order_suborder.loc[i].iloc[1]
+            suborder = self.suborder_code_array[code_order_suborder[i]]
+            allocations = self.allocation_index.get_allocations_of(code_order_suborder[i], code_employee_line[k])
+            if not allocations: # Not within the time window of the order_suborder.
+                return pyo.Constraint.Skip
             return (0, 
                     sum(
-                        m.var_alloc[(i, j, k)] 
-                        for j in m.set_time
+                        m.var_alloc[index] 
+                        for index in allocations
                         ), 
-                    m.upperbound_of_time * self.skills_df.loc[k, suborder]
+                    m.upperbound_of_time * self.skills_array[code_employee_line[k], suborder]
                     ) # NOTE: Instead of creating a constraint for each individual 'time' index, we sum over the entire 'time' index to reduce the amount of constraints, leading to quicker solving times. 
-        self.m.constr_onlyAllocIfEmpl_lineSkilled = pyo.Constraint(self.m.set_order_suborder, self.m.set_employee_line, rule= rule_onlyAllocIfEmpl_lineSkilled)
+        if not sparse_allocation: # With sparse allocation there are no variables for employee_lines that are not skilled.
+            self.m.constr_onlyAllocIfEmpl_lineSkilled = pyo.Constraint(self.m.set_order_suborder, self.m.set_employee_line, rule= rule_onlyAllocIfEmpl_lineSkilled)
 
         # EMPLOYEE_LINE ONLY ALLOWED ALLOCATED IF AVAILABLE.
         def rule_onlyAllocIfEmpl_lineAvailable(m, i, j, k):
@@ -286,65 +440,29 @@ class EWOptimisation:
             """
             return (0, 
                     m.var_alloc[(i, j, k)], 
-                    self.availability_df.loc[j, k])  
-        self.m.constr_onlyAllocIfEmpl_lineAvailable = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_employee_line, rule= rule_onlyAllocIfEmpl_lineAvailable)
+                    self.availability_array[code_time[j], code_employee_line[k]])  
+        if not sparse_allocation: # With sparse allocation there are no variables for employee_lines that are not available.
+            self.m.constr_onlyAllocIfEmpl_lineAvailable = pyo.Constraint(self.m.set_alloc_index, rule= rule_onlyAllocIfEmpl_lineAvailable)
 
         ### RULES THAT IMPLEMENT THAT NEXT SUBORDERS CANNOT BE STARTED BEFORE PREVIOUS SUBORDER IS COMPLETED (FOR ATLEAST X%)
 
-        # HELPER FUNCTION
-        def get_previous_suborder(i):
-            """Gets the previous order_suborder for a given order_suborder {i}. If there is no previous suborder 'None' is returned, if there is a previous suborder a list with attributes of the previous suborder is returned. 
-
-            Args:
-                i (str): order_suborder index
-
-            Returns:
-                List: if there is a previous suborder: [order, suborder, percentage, prev_suborder_index, prev_order_suborder], if there is no previous suborder: None. /n So, in handling the case where there is no previous suborder one can check if the output is 'None'
-            """
-            order = self.specific_order_suborder.loc[i].iloc[0]
-            suborder = self.specific_order_suborder.loc[i].iloc[1]
-            percentage = self.percentage_df.loc[i].iloc[0]
-
-            # Not all orders follow the same route through the suborders. To prevent this from resulting in problem, we loop through each previous suborder until we find the first present suborder.
-            # NOTE:This might be improved by adding a prev_sub and next_sub to the orders_df, but this is dependent on which data the client stores for connections between orders.
-            prev_suborder_index = self.list_suborder_set.index(suborder) - 1
-            prev_order_suborder = None
-            while prev_suborder_index > 0:
-                prev_suborder = self.list_suborder_set[prev_suborder_index]
-                try:
-                    prev_order_suborder = transpose_specific_order_suborder.loc[order, prev_suborder].iloc[0]
-                    break # valid previous suborder found
-                except KeyError:
-                    prev_order_suborder = None
-                    prev_suborder_index -= 1
-                    continue
-            
-            if prev_order_suborder: # If there is a previous suborder
-                return [prev_order_suborder, percentage, order, suborder, prev_suborder_index]
-            else: # if there is not a previous suborder
-                return None 
-
         # HELPER FUNCTION    
-        def get_ratio_completed_hours_for_suborder(m, i, j):
+        def get_ratio_completed_hours_for_suborder(m, i, j, time_req_lb_i):
             """Gets the amount of time that have been completed vs the lowerbound required amount of time. The lowerbound is chosen since using the upperbound could mean that ratio 1 is never reached, however using the lowerbound could mean that ratio 1 is reached prematurely. \n If required time is zero, then the ratio returns 0, because dividing by 0 is impossible.
 
             Args:
                 m (pyo.ConcreteModel()): pyomo model
                 i (str): order_suborder index
                 j (datetime): time index
+                time_req_lb_i (float): lowerbound of the required time of order_suborder {i}
 
             Returns:
                 Expression: allocation(sum over {t} if {t} < time j and over employee_line) / time_required_lb
             """
-            if time_req_lb.loc[i] == 0:
+            if time_req_lb_i == 0:
                 return 0
             else:
-                ratio = sum(
-                    m.var_alloc[(i, ti_j, empl_line_i)]  
-                    for ti_j in m.set_time 
-                    for empl_line_i in m.set_employee_line
-                    if ti_j < j
-                    ) / time_req_lb.loc[i] # Total amount of allocated hours of the previous suborder devided by the lowerbound of required time. The lowerbound is taken, since the upperbound could result in the fraction never reaching 1. Opposite of that, lowerbound could mean that the fraction reaches 1 prematurely
+                ratio = get_allocated_hours(m, i, self.time_grid.get_slice_before(j)) / time_req_lb_i # The time intervals < {j}, and the employee_lines. # Total amount of allocated hours of the previous suborder devided by the lowerbound of required time. The lowerbound is taken, since the upperbound could result in the fraction never reaching 1. Opposite of that, lowerbound could mean that the fraction reaches 1 prematurely
             
                 return ratio
 
@@ -362,22 +480,22 @@ class EWOptimisation:
             Returns:
                 Expression: 0 <= allocation <= a, where a >= 0 and 'a >= 1' if enough hours of the previous suborder are completed, else 'a < 1'.
             """
-            # Obtain the needed information for the previous suborder.
-            list_prev_suborder = get_previous_suborder(i)
-            if not list_prev_suborder: # If there is not previous suborder skip the constraint.
+            # Obtain the needed information for the previous suborder, see Data_Routing.
+            code_i = code_order_suborder[i]
+            if not self.routing.has_previous_array[code_i]: # If there is not previous suborder skip the constraint.
                 return pyo.Constraint.Skip
             
-            percentage = list_prev_suborder[1]
-            prev_order_suborder = list_prev_suborder[0]
+            percentage = self.routing.percentage_array[code_i]
+            prev_order_suborder = self.list_order_suborder[self.routing.previous_code_array[code_i]]
             
-            ratio_completedHoursPrevSuborders = get_ratio_completed_hours_for_suborder(m, prev_order_suborder, j)
+            ratio_completedHoursPrevSuborders = get_ratio_completed_hours_for_suborder(m, prev_order_suborder, j, self.routing.previous_time_req_lb_array[code_i])
 
             # Dividing by the needed percentage to inflate the completed hours for the previous suborder, such that the restriction is looser if that is allowed. (Elastic constraint?)
             ratio_completed_vs_neededHours = ratio_completedHoursPrevSuborders / percentage
 
             # The constraint is added for each employee_line since summing over the employee_line {k} would result in unbalanced equation. This causes a possibility that the amount of required hours for the order_suborder is smaller than the RHS, since the LHS sum could then become equal to the required hours the order_suborder could be completed before the other previous suborder is completed.
             return m.var_alloc[i,j,k] <= ratio_completed_vs_neededHours
-        self.m.constr_prevSuborderCompletedBeforeNext = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_employee_line, rule=rule_prevSuborderCompletedBeforeNext)
+        self.m.constr_prevSuborderCompletedBeforeNext = pyo.Constraint(self.m.set_alloc_index, rule=rule_prevSuborderCompletedBeforeNext)
 
         # PREVIOUS SUBORDER MUST BE COMPLETED FOR A LARGER PERCENTAGE THAN THE NEXT SUBORDER
         def rule_prevSuborderCannotOvertakeCurrentSuborder(m, i, j):
@@ -392,19 +510,24 @@ class EWOptimisation:
                 Expression: ratio_previous_suborder >= ratio_current_suborder, for the completed amount of hours vs the required amount per suborder.
             """
 
-            # Obtain the needed information for the previous suborder.
-            list_prev_suborder = get_previous_suborder(i)
-            if not list_prev_suborder: # If there is not previous suborder skip the constraint.
+            # Outside the time window of order_suborder {i} the constraint is not needed: before the window none of its hours are completed, 
+            # and after the window its completed hours do not change, while those of the previous suborder can only increase.
+            if not self.window_start_array[code_order_suborder[i]] <= code_time[j] <= self.window_stop_array[code_order_suborder[i]]:
+                return pyo.Constraint.Skip
+
+            # Obtain the needed information for the previous suborder, see Data_Routing.
+            code_i = code_order_suborder[i]
+            if not self.routing.has_previous_array[code_i]: # If there is not previous suborder skip the constraint.
                 return pyo.Constraint.Skip
             
-            prev_order_suborder = list_prev_suborder[0]
+            prev_order_suborder = self.list_order_suborder[self.routing.previous_code_array[code_i]]
 
             # Obtain the ratio's
-            ratio_Current = get_ratio_completed_hours_for_suborder(m, i, j)
-            ratio_Prev = get_ratio_completed_hours_for_suborder(m, prev_order_suborder, j)
+            ratio_Current = get_ratio_completed_hours_for_suborder(m, i, j, self.time_req_lb_array[code_i])
+            ratio_Prev = get_ratio_completed_hours_for_suborder(m, prev_order_suborder, j, self.routing.previous_time_req_lb_array[code_i])
 
-            # If either of the ratios is a pyo.numeric_expr.DivisionExpression, then return the constraint
-            if isinstance(ratio_Prev, pyo.numeric_expr.DivisionExpression) or isinstance(ratio_Current, pyo.numeric_expr.DivisionExpression):
+            # If either of the ratios is an expression, then return the constraint. (Not only a pyo.numeric_expr.DivisionExpression: divided by a lowerbound of 1 it is the sum itself.)
+            if not isinstance(ratio_Prev, (int, float)) or not isinstance(ratio_Current, (int, float)):
                 return ratio_Prev >= ratio_Current
             elif ratio_Prev == 0 and ratio_Current == 0: # If both ratios are zero, then skip the constraint.
                 return pyo.Constraint.Skip
@@ -426,11 +549,13 @@ class EWOptimisation:
             Returns:
                 Expression: 0 <= allocation(sum over time)(for all employees {k}) <= 0 if order_suborder {i} should be allocated on a line, else constraint is skipped.
             """
-            if self.exec_on_line_df.loc[i].iloc[0]: # Check whether an order_suborder should be preformed on a line.
-                return (0, sum(m.var_alloc[(i, j, k)] for j in m.set_time), 0)
+            allocations = self.allocation_index.get_allocations_of(code_order_suborder[i], code_employee_line[k])
+            if self.exec_on_line_array[code_order_suborder[i]] and allocations: # Check whether an order_suborder should be preformed on a line (and can be allocated).
+                return (0, sum(m.var_alloc[index] for index in allocations), 0)
             else:
                 return pyo.Constraint.Skip # Skips the constraint if an order_suborder should not be preformed on a line.
-        self.m.constr_lineOrdersOnLine = pyo.Constraint(self.m.set_order_suborder, self.m.set_employee, rule=rule_lineOrdersOnLine)
+        if not sparse_allocation: # With sparse allocation there are no variables for employees on line orders.
+            self.m.constr_lineOrdersOnLine = pyo.Constraint(self.m.set_order_suborder, self.m.set_employee, rule=rule_lineOrdersOnLine)
 
         # SPECIFIC LINE ORDERS ALLOCATED TO THE SPECIFIC LINE
         def rule_orderOnSpecificLine(m, i, k):
@@ -446,13 +571,15 @@ class EWOptimisation:
             Returns:
                 Expression: 0 <= allocation(sum over time) <= 0, for employee_line {k} if the order_suborder must be allocated by a specific line other than the current employee_line {k}, else the constraint is skipped.
             """
-            specific_line = self.specific_line_df.loc[i].iloc[0]
+            code_i = code_order_suborder[i]
             
-            if specific_line != '': # Continue only if the order_suborder {k} has a specific line on which it must be preformed.
-                if specific_line != k: # if employee_line {k} is not equal to the specific line
-                    return (0, sum(m.var_alloc[(i, j, k)] for j in m.set_time), 0)
+            if self.has_specific_line_array[code_i]: # Continue only if the order_suborder {k} has a specific line on which it must be preformed.
+                allocations = self.allocation_index.get_allocations_of(code_i, code_employee_line[k])
+                if self.specific_line_code_array[code_i] != code_employee_line[k] and allocations: # if employee_line {k} is not equal to the specific line
+                    return (0, sum(m.var_alloc[index] for index in allocations), 0)
             return pyo.Constraint.Skip
-        self.m.constr_ordersOnSpecificLine = pyo.Constraint(self.m.set_order_suborder, self.m.set_employee_line, rule=rule_orderOnSpecificLine)
+        if not sparse_allocation: # With sparse allocation there are no variables for other employee_lines than the specific line.
+            self.m.constr_ordersOnSpecificLine = pyo.Constraint(self.m.set_order_suborder, self.m.set_employee_line, rule=rule_orderOnSpecificLine)
 
         # MANUAL ORDERS ALLOCATED TO EMPLOYEES
         def rule_manualOrdersForEmployee(m, i, j, k):
@@ -468,11 +595,30 @@ class EWOptimisation:
             Returns:
                 Expression: 0 <= allocation(sum over time) <= 0, if order_suborder {i} is not executed on a line (that is, is executed by employees) then the order_suborder cannot be allocated to lines.
             """
-            if not self.exec_on_line_df.loc[i].iloc[0]: # If the order_suborder is not executed on a line -> it is executed by employees.
+            if not self.exec_on_line_array[code_order_suborder[i]] and (i, j, k) in m.set_alloc_index: # If the order_suborder is not executed on a line -> it is executed by employees.
                 return (0, m.var_alloc[(i, j, k)], 0)
             else:
                 return pyo.Constraint.Skip
-        self.m.constr_manualOrdersForEmployee = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_line, rule=rule_manualOrdersForEmployee)
+        if not sparse_allocation: # With sparse allocation there are no variables for lines on orders that are not performed on a line.
+            self.m.constr_manualOrdersForEmployee = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_line, rule=rule_manualOrdersForEmployee)
+
+        # PLANNED ALLOCATIONS THAT ARE NOT FEASIBLE
+        def rule_infeasibleAllocations(m, i, j, k):
+            """This rule replaces the rules above for sparse allocation. Only the combinations that are feasible have an allocation variable, except for planned combinations.
+            A planned combination that is not feasible (for example an employee_line that is not available) is restricted to zero, such that the planning cannot be met, like without sparse allocation.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo Model
+                i (str): order_suborder index
+                j (datetime): time index
+                k (str): employee_line index
+
+            Returns:
+                Expression: 0 <= allocation <= 0
+            """
+            return (0, m.var_alloc[(i, j, k)], 0)
+        if sparse_allocation:
+            self.m.constr_infeasibleAllocations = pyo.Constraint(self.m.set_infeasible_alloc_index, rule=rule_infeasibleAllocations)
 
         ### RULES THAT IMPLEMENT THE OLD- AND MANUAL PLANNING.
         # OLD PLANNING
@@ -488,13 +634,11 @@ class EWOptimisation:
             Returns:
                 Expression: new_allocation = old_allocation, if there was an old_allocation that is before the old_planning_limit, else the constraint is skipped.
             """
-            if j <= pd.to_datetime(old_planning_limit, format='%d-%m-%Y %H:%M:%S'): # Only take into account the old schedule if the time {j} is smaller than the old_planning_limit, that represents the benchmark until which point the old planning must be taken into account.
-                try:
-                    if self.old_planning_df.loc[i, j, k] == 1: # If there is an old allocation, then bind the new allocation to the old. 
-                        return m.var_alloc[(i, j, k)] == int(self.old_planning_df.loc[i, j, k])
-                    else: # If there is no old allocation, skip the constraint. (this can happen when {i} is scheduled, but not at time {j} or by employee_line {k})
-                        return pyo.Constraint.Skip
-                except: # If there is not value for {i, j, k} in the old planning, then skip the constraint.
+            if self.time_grid.is_in_old_planning(j): # Only take into account the old schedule if the time {j} is smaller than the old_planning_limit, that represents the benchmark until which point the old planning must be taken into account.
+                allocation = self.old_planning.get((code_order_suborder[i], code_time[j], code_employee_line[k])) # None if there is no value for {i, j, k} in the old planning.
+                if allocation == 1: # If there is an old allocation, then bind the new allocation to the old. 
+                    return m.var_alloc[(i, j, k)] == int(allocation)
+                else: # If there is no old allocation, skip the constraint. (this can happen when {i} is scheduled, but not at time {j} or by employee_line {k})
                     return pyo.Constraint.Skip
             else:
                 return pyo.Constraint.Skip
@@ -513,12 +657,10 @@ class EWOptimisation:
             Returns:
                 Expression: new_allocation = manual_planning, if there is an manual_allocation. 
             """
-            try:
-                if self.manual_planning_df.loc[i, j, k] == 1.0: # If there exists a manual_allocation, else skip the constraint. 
-                    return m.var_alloc[(i, j, k)] == int(self.manual_planning_df.loc[i, j, k])
-                else:
-                    return pyo.Constraint.Skip
-            except:
+            allocation = self.manual_planning.get((code_order_suborder[i], code_time[j], code_employee_line[k]))
+            if allocation == 1.0: # If there exists a manual_allocation, else skip the constraint. 
+                return m.var_alloc[(i, j, k)] == int(allocation)
+            else:
                 return pyo.Constraint.Skip
         #self.m.constr_manualPlanning = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_employee_line, rule=rule_manualPlanning)
 
@@ -537,17 +679,35 @@ class EWOptimisation:
             Returns:
                 Expression: new_allocation = manual_allocation or old_allocation, if one is present, if both are present the manual_allocation will be followed. Old_allocations will only be implemented if they happen before the old_planning_limit.
             """
-            try:
-                if self.combined_planning_df.loc[i, j, k] == 1: # If either there is a manual_ or an old_planning present, otherwise skip the constraint.
-                    return m.var_alloc[(i, j, k)] == self.combined_planning_df.loc[i, j, k]
-                else:
-                    return pyo.Constraint.Skip
-            except:
+            allocation = self.combined_planning.get((code_order_suborder[i], code_time[j], code_employee_line[k]))
+            if allocation == 1: # If either there is a manual_ or an old_planning present, otherwise skip the constraint.
+                return m.var_alloc[(i, j, k)] == allocation
+            else:
                 return pyo.Constraint.Skip
-        self.m.constr_planning = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_employee_line, rule=rule_planning)
+        self.m.constr_planning = pyo.Constraint(self.m.set_alloc_index, rule=rule_planning)
 
         ### RULES THAT IMPLEMENT THE GAPS IDENTIFICATION.
 
+        # CUMULATIVE ALLOCATIONS ARE THE RUNNING TOTAL OF THE ALLOCATIONS OF AN ORDER_SUBORDER
+        def rule_cumulativeAlloc(m, i, j):
+            """This rule defines the running total of the allocations of an order_suborder {i} (gaps formulations with running totals): the running total at the previous time plus the allocations at time {j}.
+            The rules below then count the allocations before or after a time {j} from two running totals, instead of summing them for every time {j} again.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_cumulative_alloc(i, j) = var_cumulative_alloc(i, j - 1) + allocation(sum over employee_line)
+            """
+            position = code_time[j]
+            return m.var_cumulative_alloc[(i, j)] == get_cumulative_alloc(m, i, position - 1) + sum(
+                m.var_alloc[index] for index in self.allocation_index.get_allocations_at(code_order_suborder[i], position)
+                )
+        if has_running_totals:
+            self.m.constr_cumulativeAlloc = pyo.Constraint(self.m.set_gaps_index, rule=rule_cumulativeAlloc)
+
         ## DIFFERENCE BETWEEN BEFORE AND AFTER IS IN THE SECOND SUMMATION, THAT IS T <=/>= J (BEFORE/AFTER). 
         # BEFORE INDICATES IF THE ORDER_SUBORDER HAS BEEN ALLOCATED BEFORE SPECIFIC TIME
         def rule_gaps_before1(m, i, j):
@@ -568,17 +728,11 @@ class EWOptimisation:
                 Expression: 2 * [ allocation(sum over time {t} if t <= time {j} and over employee_line) ] - 1 <= upperbound * var_before
             """
             try:
-                return 2 * sum(
-                                sum(
-                                    m.var_alloc[(i, t, k)] 
-                                    for k in m.set_employee_line
-                                    ) 
-                                for t in m.set_time 
-                                if t <= j
-                    ) - 1 <= m.upperbound_of_employees_and_time * m.var_before[(i, j)]
+                return 2 * get_allocated_hours(m, i, self.time_grid.get_slice_before(j, inclusive=True)) - 1 <= m.upperbound_of_employees_and_time * m.var_before[(i, j)]
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_before1 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_before1)
+        if gaps_formulation != 'start_end': # The 'start_end' gaps formulation uses the start and end rules instead of these big-M rules, see below.
+            self.m.gaps_before1 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_before1)
 
         def rule_gaps_before2(m, i, j):
             """This rule is part of the 'gaps before constraints' series, that indicates when an order_suborder has been allocated before/during a particular time. 
@@ -596,16 +750,11 @@ class EWOptimisation:
                 Expression: var_before <= [ allocation(sum over time {t} if t <= time {j} and over employee_line) ]
             """
             try:
-                return m.var_before[(i, j)] <= sum(
-                                                sum(m.var_alloc[(i, t, k)] 
-                                                    for k in m.set_employee_line
-                                                    ) 
-                                                for t in m.set_time 
-                                                if t <= j
-                                                )
+                return m.var_before[(i, j)] <= get_allocated_hours(m, i, self.time_grid.get_slice_before(j, inclusive=True)) # The time intervals {t} <= {j}, and the employee_lines.
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_before2 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_before2)
+        if gaps_formulation != 'start_end': # The 'start_end' gaps formulation uses the start and end rules instead of these big-M rules, see below.
+            self.m.gaps_before2 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_before2)
 
         # AFTER INDICATES IF THE ORDER_SUBORDER HAS BEEN ALLOCATED AFTER A SPECIFIC TIME
         def rule_gaps_after1(m, i, j):
@@ -626,17 +775,11 @@ class EWOptimisation:
                 Expression: 2 * [ allocation(sum over time {t} if t >= time {j} and over employee_line) ] - 1 <= upperbound * var_after
             """
             try:
-                return 2 * sum(
-                                sum(
-                                    m.var_alloc[(i, t, k)] 
-                                    for k in m.set_employee_line
-                                    ) 
-                                for t in m.set_time 
-                                if t >= j
-                    ) - 1 <= m.upperbound_of_employees_and_time * m.var_after[(i, j)]
+                return 2 * get_allocated_hours(m, i, self.time_grid.get_slice_after(j, inclusive=True)) - 1 <= m.upperbound_of_employees_and_time * m.var_after[(i, j)]
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_after1 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_after1)
+        if gaps_formulation != 'start_end': # The 'start_end' gaps formulation uses the start and end rules instead of these big-M rules, see below.
+            self.m.gaps_after1 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_after1)
 
         def rule_gaps_after2(m, i, j):
             """This rule is part of the 'gaps after constraints' series, that indicates when an order_suborder has been allocated after/during a particular time. 
@@ -656,16 +799,11 @@ class EWOptimisation:
                 Expression: var_before <= [ allocation(sum over time {t} if t >= time {j} and over employee_line) ]
             """
             try:
-                return m.var_after[(i, j)] <= sum(
-                                                sum(m.var_alloc[(i, t, k)] 
-                                                    for k in m.set_employee_line
-                                                    ) 
-                                                for t in m.set_time 
-                                                if t >= j
-                                                )
+                return m.var_after[(i, j)] <= get_allocated_hours(m, i, self.time_grid.get_slice_after(j, inclusive=True)) # The time intervals {t} >= {j}, and the employee_lines.
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_after2 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_after2)
+        if gaps_formulation != 'start_end': # The 'start_end' gaps formulation uses the start and end rules instead of these big-M rules, see below.
+            self.m.gaps_after2 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_after2)
 
         # DURING INDICATES IF AT A CERTAIN TIME THE ORDER HAS BEEN STARTED AND HAS NOT YET BEEN FINISHED, THUS INDICATES ALL TIME INTERVALS BETWEEN START AND FINISH OF ORDER
         def rule_gaps_during1(m, i, j):
@@ -689,7 +827,8 @@ class EWOptimisation:
                 return m.var_during[(i, j)] <= m.var_before[(i, j)]
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_during1 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_during1)
+        if gaps_formulation != 'start_end': # Not needed with the 'start_end' gaps formulation, where var_during only has lower bounds, which the objective minimizes.
+            self.m.gaps_during1 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_during1)
 
         def rule_gaps_during2(m, i, j):
             """This rule is part of the 'gaps during constraints' series, that indicate the time intervals where an order_suborder has been started, but not yet finished. This is between the start and finish allocation of an order.
@@ -712,7 +851,8 @@ class EWOptimisation:
                 return m.var_during[(i, j)] <= m.var_after[(i, j)]
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_during2 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_during2)
+        if gaps_formulation != 'start_end': # Not needed with the 'start_end' gaps formulation, where var_during only has lower bounds, which the objective minimizes.
+            self.m.gaps_during2 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_during2)
 
         def rule_gaps_during3(m, i, j):
             """This rule is part of the 'gaps during constraints' series, that indicate the time intervals where an order_suborder has been started, but not yet finished. This is between the start and finish allocation of an order.
@@ -735,7 +875,7 @@ class EWOptimisation:
                 return m.var_during[(i, j)] >= m.var_before[(i, j)] + m.var_after[(i, j)] - 1
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_during3 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_during3)
+        self.m.gaps_during3 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_during3)
 
         # GAPS INDICATES IF BETWEEN THE START AND FINISH TIMES OF AN ORDER_SUBORDER, THE IS AN NOT ALLOCATION AT A CERTAIN TIME. THAT IS, THERE IS A GAP IN THE SCHEDULE. 
         def rule_gaps_gaps1(m, i, j):
@@ -756,10 +896,11 @@ class EWOptimisation:
                 Expression: allocation(sum over employee_line) <= upperbound * var_indicator_alloc_sum_employee_line
             """
             try:
-                return sum(m.var_alloc[(i, j, k)] for k in m.set_employee_line) <= m.upperbound_of_employee * m.var_indicator_alloc_sum_employee_line[(i, j)] # m.var_during[(i, j)] - sum(m.var_alloc[(i, k, j)] for k in m.set_employee_line) <= m.upperbound_of_employee * m.var_gaps[(i, j)]
+                return sum(m.var_alloc[index] for index in self.allocation_index.get_allocations_at(code_order_suborder[i], code_time[j])) <= m.upperbound_of_employee * m.var_indicator_alloc_sum_employee_line[(i, j)] # m.var_during[(i, j)] - sum(m.var_alloc[(i, k, j)] for k in m.set_employee_line) <= m.upperbound_of_employee * m.var_gaps[(i, j)]
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_gaps1 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_gaps1)
+        if gaps_formulation != 'start_end': # The 'start_end' gaps formulation uses the start and end rules instead of these big-M rules, see below.
+            self.m.gaps_gaps1 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_gaps1)
             
         def rule_gaps_gaps2(m, i, j):
             """This rule is part of the 'gaps constraints' series, that indicate the time intervals where the order_sub has not been allocated, but has been started, but not yet finished. 
@@ -779,10 +920,12 @@ class EWOptimisation:
                 Expression: allocation(sum over employee_line) >= var_indicator_alloc_sum_employee_line
             """
             try:
-                return sum(m.var_alloc[(i, j, k)] for k in m.set_employee_line) >= m.varvar_indicator_alloc_sum_employee_line_z[(i, j)] #m.var_during[(i, j)] - sum(m.var_alloc[(i, k, j)] for k in m.set_employee_line) >= 1 - m.upperbound_of_employee * (1 - m.var_gaps[(i, j)])
+                return sum(m.var_alloc[index] for index in self.allocation_index.get_allocations_at(code_order_suborder[i], code_time[j])) >= m.var_indicator_alloc_sum_employee_line[(i, j)] #m.var_during[(i, j)] - sum(m.var_alloc[(i, k, j)] for k in m.set_employee_line) >= 1 - m.upperbound_of_employee * (1 - m.var_gaps[(i, j)])
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_gaps2 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_gaps2)
+        # Only the 'start_end' gaps formulation has this rule. Before it, the rule referred to a variable that does not exist, so it was always skipped; the other formulations are kept that way.
+        if gaps_formulation == 'start_end':
+            self.m.gaps_gaps2 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_gaps2)
 
         def rule_gaps_gaps3(m, i, j):
             """This rule is part of the 'gaps constraints' series, that indicate the time intervals where the order_sub has not been allocated, but has been started, but not yet finished. 
@@ -807,7 +950,167 @@ class EWOptimisation:
                 return m.var_gaps[(i, j)] == m.var_during[(i, j)] - m.var_indicator_alloc_sum_employee_line[(i, j)] 
             except:
                 return pyo.Constraint.Skip
-        self.m.gaps_gaps3 = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, rule=rule_gaps_gaps3)
+        self.m.gaps_gaps3 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_gaps3)
+
+        # START AND END INDICATE THE FIRST AND LAST ALLOCATED TIME OF AN ORDER_SUBORDER ('start_end' GAPS FORMULATION), WITH PER-PERIOD START AND END INDICATORS INSTEAD OF BIG-M RULES.
+        # var_before(i, j) - var_before(i, j - 1) is the start indicator, which is 1 at the first allocated time, and var_after(i, j) - var_after(i, j + 1) is the end indicator.
+        # Both are between 0 and the indicator of the allocations at time {j}, such that var_before and var_after are fixed by the allocations and do not need to be binary.
+        # HELPER FUNCTION
+        def get_window_variable(variable, i, position):
+            """Gets a variable of the gaps of order_suborder {i} at a time position, for the start and end rules of the 'start_end' gaps formulation.
+            An order_suborder is not allocated outside its time window, so before its window it has not started and after its window it has ended.
+
+            Args:
+                variable (pyo.Var): var_before or var_after
+                i (str): order_suborder index
+                position (int): time position
+
+            Returns:
+                Expression: variable(i, time at the position), or 0 outside the time window.
+            """
+            code_i = code_order_suborder[i]
+            if not self.window_start_array[code_i] <= position < self.window_stop_array[code_i]:
+                return 0
+            return variable[(i, self.list_time[position])]
+
+        def rule_gaps_active(m, i, j, k):
+            """This rule is part of the 'start_end' gaps formulation, that indicates the time intervals at which an order_suborder {i} is allocated.
+
+            This specific rule makes sure that:
+            allocation <= var_indicator_alloc_sum_employee_line
+                More specifically:
+                    if the employee_line {k} is allocated
+                    then var_indicator_alloc_sum_employee_line = 1
+                Unlike gaps_gaps1, this holds per employee_line, so it also binds for fractional allocations.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+                k (str): employee_line index
+
+            Returns:
+                Expression: allocation <= var_indicator_alloc_sum_employee_line
+            """
+            return m.var_alloc[(i, j, k)] <= m.var_indicator_alloc_sum_employee_line[(i, j)]
+
+        def rule_gaps_start1(m, i, j):
+            """This rule is part of the 'start_end' gaps formulation, that indicates when an order_suborder {i} has been allocated before/during a particular time {j}.
+
+            This specific rule makes sure that:
+            var_before(i, j) >= var_before(i, j - 1)
+                More specifically: the start indicator is not negative, once order_suborder {i} has started it stays started.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_before(i, j) >= var_before(i, j - 1)
+            """
+            return m.var_before[(i, j)] >= get_window_variable(m.var_before, i, code_time[j] - 1)
+
+        def rule_gaps_start2(m, i, j):
+            """This rule is part of the 'start_end' gaps formulation, that indicates when an order_suborder {i} has been allocated before/during a particular time {j}.
+
+            This specific rule makes sure that:
+            var_before(i, j) - var_before(i, j - 1) <= var_indicator_alloc_sum_employee_line
+                More specifically:
+                    if order_suborder {i} is not allocated at time {j}
+                    then it cannot start at time {j}
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_before(i, j) - var_before(i, j - 1) <= var_indicator_alloc_sum_employee_line
+            """
+            return m.var_before[(i, j)] - get_window_variable(m.var_before, i, code_time[j] - 1) <= m.var_indicator_alloc_sum_employee_line[(i, j)]
+
+        def rule_gaps_start3(m, i, j):
+            """This rule is part of the 'start_end' gaps formulation, that indicates when an order_suborder {i} has been allocated before/during a particular time {j}.
+
+            This specific rule makes sure that:
+            var_before >= var_indicator_alloc_sum_employee_line
+                More specifically:
+                    if order_suborder {i} is allocated at time {j}
+                    then var_before = 1
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_before >= var_indicator_alloc_sum_employee_line
+            """
+            return m.var_before[(i, j)] >= m.var_indicator_alloc_sum_employee_line[(i, j)]
+
+        def rule_gaps_end1(m, i, j):
+            """This rule is part of the 'start_end' gaps formulation, that indicates when an order_suborder {i} has been allocated after/during a particular time {j}.
+
+            This specific rule makes sure that:
+            var_after(i, j) >= var_after(i, j + 1)
+                More specifically: the end indicator is not negative, before order_suborder {i} has ended it stays unfinished.
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_after(i, j) >= var_after(i, j + 1)
+            """
+            return m.var_after[(i, j)] >= get_window_variable(m.var_after, i, code_time[j] + 1)
+
+        def rule_gaps_end2(m, i, j):
+            """This rule is part of the 'start_end' gaps formulation, that indicates when an order_suborder {i} has been allocated after/during a particular time {j}.
+
+            This specific rule makes sure that:
+            var_after(i, j) - var_after(i, j + 1) <= var_indicator_alloc_sum_employee_line
+                More specifically:
+                    if order_suborder {i} is not allocated at time {j}
+                    then it cannot end at time {j}
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_after(i, j) - var_after(i, j + 1) <= var_indicator_alloc_sum_employee_line
+            """
+            return m.var_after[(i, j)] - get_window_variable(m.var_after, i, code_time[j] + 1) <= m.var_indicator_alloc_sum_employee_line[(i, j)]
+
+        def rule_gaps_end3(m, i, j):
+            """This rule is part of the 'start_end' gaps formulation, that indicates when an order_suborder {i} has been allocated after/during a particular time {j}.
+
+            This specific rule makes sure that:
+            var_after >= var_indicator_alloc_sum_employee_line
+                More specifically:
+                    if order_suborder {i} is allocated at time {j}
+                    then var_after = 1
+
+            Args:
+                m (pyo.ConcreteModel()): pyomo model
+                i (str): order_suborder index
+                j (datetime): time index
+
+            Returns:
+                Expression: var_after >= var_indicator_alloc_sum_employee_line
+            """
+            return m.var_after[(i, j)] >= m.var_indicator_alloc_sum_employee_line[(i, j)]
+        if gaps_formulation == 'start_end':
+            self.m.gaps_active = pyo.Constraint(self.m.set_alloc_index, rule=rule_gaps_active)
+            self.m.gaps_start1 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_start1)
+            self.m.gaps_start2 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_start2)
+            self.m.gaps_start3 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_start3)
+            self.m.gaps_end1 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_end1)
+            self.m.gaps_end2 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_end2)
+            self.m.gaps_end3 = pyo.Constraint(self.m.set_gaps_index, rule=rule_gaps_end3)
 
         self.model_created = True
         
@@ -820,6 +1123,8 @@ class EWOptimisation:
         Returns:
             output: Output of the solver.
         """
+        from icecream import ic # Debug dependency, only loaded when it is used.
+
         
         # Check whether the model has been formulated
         if not self.model_created: 
@@ -870,7 +1175,7 @@ class EWOptimisation:
         gaps_df.name = 'gaps'
         print(gaps_df)
 
-        var_val = {i: self.m.var_gaps[i].value for i in self.m.var_gaps}
+        var_val = gap_values
         #print(var_val)
         #var_val = var_val[var_val != 0.0]
         df = pd.DataFrame(index=var_val.keys(), data=var_val.values())
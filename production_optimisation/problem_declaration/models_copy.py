@@ -7,6 +7,7 @@ from icecream import ic
 import sys
 
 from data.dataframe import Dataframe
+from data.data_sparse_planning import Sparse_Planning
 
 from general_configuration import dfs, old_planning_limit
 
@@ -95,6 +96,11 @@ class EWOptimisation:
         self.manual_planning_df = self.managerDF.get_Dataframe('ManualPlanningDF').pandas_Dataframe
         self.combined_planning_df = self.managerDF.get_Dataframe('CombinedPlanningDF').pandas_Dataframe
 
+        # Sparse plannings, in which the allocation of a combination is looked up at once. See Sparse_Planning.
+        self.old_planning = Sparse_Planning.from_series(self.old_planning_df)
+        self.manual_planning = Sparse_Planning.from_series(self.manual_planning_df)
+        self.combined_planning = Sparse_Planning.from_series(self.combined_planning_df)
+
         # Get from solutionDF
         self.excel_file = self.managerDF.get_Dataframe('SolutionDF').pandas_ExcelFile 
 
@@ -506,12 +512,10 @@ class EWOptimisation:
                     Expression: new_allocation = old_allocation, if there was an old_allocation that is before the old_planning_limit, else the constraint is skipped.
                 """
                 if j <= pd.to_datetime(old_planning_limit, format='%d-%m-%Y %H:%M:%S'): # Only take into account the old schedule if the time {j} is smaller than the old_planning_limit, that represents the benchmark until which point the old planning must be taken into account.
-                    try:
-                        if self.old_planning_df.loc[i, j, k] == 1: # If there is an old allocation, then bind the new allocation to the old. 
-                            return m.var_alloc[(i, j, k)] == int(self.old_planning_df.loc[i, j, k])
-                        else: # If there is no old allocation, skip the constraint. (this can happen when {i} is scheduled, but not at time {j} or by employee_line {k})
-                            return pyo.Constraint.Skip
-                    except: # If there is not value for {i, j, k} in the old planning, then skip the constraint.
+                    allocation = self.old_planning.get_allocation((i, j, k)) # None if there is no value for {i, j, k} in the old planning.
+                    if allocation == 1: # If there is an old allocation, then bind the new allocation to the old. 
+                        return m.var_alloc[(i, j, k)] == int(allocation)
+                    else: # If there is no old allocation, skip the constraint. (this can happen when {i} is scheduled, but not at time {j} or by employee_line {k})
                         return pyo.Constraint.Skip
                 else:
                     return pyo.Constraint.Skip
@@ -530,12 +534,10 @@ class EWOptimisation:
                 Returns:
                     Expression: new_allocation = manual_planning, if there is an manual_allocation. 
                 """
-                try:
-                    if self.manual_planning_df.loc[i, j, k] == 1.0: # If there exists a manual_allocation, else skip the constraint. 
-                        return m.var_alloc[(i, j, k)] == int(self.manual_planning_df.loc[i, j, k])
-                    else:
-                        return pyo.Constraint.Skip
-                except:
+                allocation = self.manual_planning.get_allocation((i, j, k))
+                if allocation == 1.0: # If there exists a manual_allocation, else skip the constraint. 
+                    return m.var_alloc[(i, j, k)] == int(allocation)
+                else:
                     return pyo.Constraint.Skip
             #self.m.constr_manualPlanning = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_employee_line, rule=rule_manualPlanning)
 
@@ -554,12 +556,10 @@ class EWOptimisation:
                 Returns:
                     Expression: new_allocation = manual_allocation or old_allocation, if one is present, if both are present the manual_allocation will be followed. Old_allocations will only be implemented if they happen before the old_planning_limit.
                 """
-                try:
-                    if self.combined_planning_df.loc[i, j, k] == 1: # If either there is a manual_ or an old_planning present, otherwise skip the constraint.
-                        return m.var_alloc[(i, j, k)] == self.combined_planning_df.loc[i, j, k]
-                    else:
-                        return pyo.Constraint.Skip
-                except:
+                allocation = self.combined_planning.get_allocation((i, j, k))
+                if allocation == 1: # If either there is a manual_ or an old_planning present, otherwise skip the constraint.
+                    return m.var_alloc[(i, j, k)] == allocation
+                else:
                     return pyo.Constraint.Skip
             self.m.constr_planning = pyo.Constraint(self.m.set_order_suborder, self.m.set_time, self.m.set_employee_line, rule=rule_planning)
 
@@ -1,9 +1,12 @@
 from problem_declaration.models import EWOptimisation
 
+from data.data_sparse_planning import Sparse_Planning
 from general_configuration import feasability_dfs
 
 import pandas as pd
+import numpy as np
 import sys
+from typing import Union
 
 class SolvabilityTest:
     """This class contains several subclasses which perform checks on the data before solving, such that possible infeasibilities may already be found.
@@ -39,6 +42,7 @@ class SolvabilityTest:
 
             self.dataframes_class = ewOptimisation.dataframes_class
 
+            self.index_catalog = ewOptimisation.index_catalog
             self.list_order_suborder = ewOptimisation.list_order_suborder
             self.list_time = ewOptimisation.list_time
             self.list_employee_line = ewOptimisation.list_employee_line
@@ -55,13 +59,24 @@ class SolvabilityTest:
             self.required_hours_df = self.dataframes_class.get_dataframe_by_name('time_req_df').get_pandas_dataframe().copy()
             self.specific_production_line = self.dataframes_class.get_dataframe_by_name('specific_line_df').get_pandas_dataframe().copy()
 
+            # The integer codes of the index sets and the tables indexed by these codes, see Data_Codes. The checks look up the values by array indexing.
+            self.codes = ewOptimisation.codes
+            self.availability_array = ewOptimisation.availability_array # [time, employee_line]
+            self.skills_array = ewOptimisation.skills_array # [employee_line, suborder]
+            self.time_req_ub_array = ewOptimisation.time_req_ub_array # [order_suborder]
+            self.suborder_code_array = ewOptimisation.suborder_code_array # [order_suborder]
+            self.has_specific_line_array = ewOptimisation.has_specific_line_array # [order_suborder]
+            self.specific_line_code_array = ewOptimisation.specific_line_code_array # [order_suborder]
+            self.time_req_lb_array = ewOptimisation.time_req_lb_array # [order_suborder]
+            self.feasibility = ewOptimisation.feasibility # Bitsets of the feasible allocations, see Data_Feasibility.
+
         
         # HELPER FUNCTION
-        def group_df(self, dataframeToGroup : pd.DataFrame, groupingName: str) -> pd.DataFrame:
-            """This function groups the inputted dataframe, based on the index- and sumcolumns saved in the feasability_dfs dictionary. 
+        def group_df(self, dataframeToGroup : Union[pd.Series, Sparse_Planning], groupingName: str) -> pd.DataFrame:
+            """This function groups the inputted planning, based on the index- and sumcolumns saved in the feasability_dfs dictionary. 
 
             Args:
-                dataframeToGroup (pd.DataFrame): Dataframe to group
+                dataframeToGroup (Union[pd.Series, Sparse_Planning]): Planning to group
                 groupingName (str): name of grouping in the feasability_dfs dictionary
 
             Returns:
@@ -70,7 +85,7 @@ class SolvabilityTest:
             #FIXME: Possibly create a dataframe in dataframes for this. or do this in the cleaning? except if in other checks the sum is not needed, but the normal version.
             group_cols = feasability_dfs.get(groupingName)[1] # Columns to group the dataframe by
             sum_col = feasability_dfs.get(groupingName)[2] # Columns to sum the grouped dataframe by
-            groupedDataframe = dataframeToGroup.groupby(group_cols)[sum_col].sum()
+            groupedDataframe = Sparse_Planning.from_planning(dataframeToGroup).group_sum(group_cols).to_frame(sum_col[0])
 
             return groupedDataframe
 
@@ -90,6 +105,7 @@ class SolvabilityTest:
                 Required hours: Tests whether given allocations do not exceed the upperbound of their required time to finish
                 Specific lines: Tests whether allocations do not allocate an order_suborder to an empl_line that is not specified as the sole option for that order_suborder.
                 Timeline availability: Tests whether the total required time does not exceed the available time in the given timeline.
+                Feasible allocations: Tests whether every order_suborder has enough feasible allocations (available, skilled and allowed employee_lines) for its required time.
             """
             checks = [self.checkManualPlanning, self.checkOldPlanning, self.checkOldJOINEDManualPlanning]
 
@@ -130,20 +146,14 @@ class SolvabilityTest:
         def checkOldJOINEDManualPlanning(self):
             """This function checks the tests for the combined planning, that is both the .
             """
-            if not self.old_planning_df.empty and not self.manual_planning_df.empty:
-                planning = pd.concat([self.old_planning_df, self.manual_planning_df]).drop_duplicates(keep='first')
-            elif not self.old_planning_df.empty and self.manual_planning_df.empty:
-                planning = self.old_planning_df
-            elif self.old_planning_df.empty and not self.manual_planning_df.empty:
-                planning = self.manual_planning_df
-            else:
-                planning = pd.DataFrame
+            # If a combination is in both plannings, the manual allocation is kept. See Sparse_Planning.merge().
+            planning = Sparse_Planning.from_series(self.manual_planning_df).merge(Sparse_Planning.from_series(self.old_planning_df))
             
             name_planning = 'Old AND/OR Manual planning'
 
             self.check_planning_restrictions(planning_df=planning, name_planning=name_planning) 
         
-        def check_planning_restrictions(self, planning_df: pd.DataFrame, name_planning: str):
+        def check_planning_restrictions(self, planning_df: Union[pd.Series, Sparse_Planning], name_planning: str):
             """This function checks all restrictions for a given planning. The name of the planning is used when presenting the errors. 
             
             The tests performed are:
@@ -152,79 +162,69 @@ class SolvabilityTest:
                 Required hours: Tests whether given allocations do not exceed the upperbound of their required time to finish
                 Specific lines: Tests whether allocations do not allocate an order_suborder to an empl_line that is not specified as the sole option for that order_suborder.
                 Timeline availability: Tests whether the total required time does not exceed the available time in the given timeline.
+                Feasible allocations: Tests whether every order_suborder has enough feasible allocations (available, skilled and allowed employee_lines) for its required time.
 
             Args:
-                planning_df (pd.DataFrame): planning df from excel to check
+                planning_df (Union[pd.Series, Sparse_Planning]): planning from excel to check
                 name_planning (str): name of the planning (shown when an error happens to indicate where the problem lies)
             """
+            planning_df = Sparse_Planning.from_planning(planning_df) # Converted once for all checks.
             if not planning_df.empty:
                 self.checkAvailabilityForPlanning(planning_df=planning_df, name_planning=name_planning)
                 self.checkSkillForPlanning(planning_df=planning_df, name_planning=name_planning)
                 self.checkRequiredHoursPlannedUpperboundForPlanning(planning_df=planning_df, name_planning=name_planning)
                 self.checkSpecificLinesForPlanning(planning_df=planning_df, name_planning=name_planning)
                 self.checkAvailabilityOfNumberOfHoursNeeded(planning_df=planning_df, name_planning=name_planning)
+                self.checkFeasibleAllocationsOfHoursNeeded(planning_df=planning_df, name_planning=name_planning)
         
-        def checkAvailabilityForPlanning(self, planning_df: pd.DataFrame, name_planning: str):
+        def checkAvailabilityForPlanning(self, planning_df: Union[pd.Series, Sparse_Planning], name_planning: str):
             """This check makes sure that the planning follows the availability constraint. That is, for all employee_line's their maximum availability is not exceeded at any given time. 
 
             Args:
-                planning_df (pd.DataFrame): planning df from excel to check
+                planning_df (Union[pd.Series, Sparse_Planning]): planning from excel to check
                 name_planning (str): name of the planning (shown when an error happens to indicate where the problem lies)
 
             Raises:
                 ValueError: Indicates that an 'availability' error is present in the "name_planning", and reports for which records the errors are present.
             """
-            empl_lineTime_help = planning_df.copy().reset_index()
-            
             # Obtain the sum of allocations for each employee_line for each time.
-            empl_lineTime = self.group_df(empl_lineTime_help, 'empl_line_vs_Time')
+            empl_lineTime = self.group_df(planning_df, 'empl_line_vs_Time')
     
-            requirement_failed = False
-            failed_combinations = []
-
-            # loop through each employee_time and time and check whether any of these values has an allocation (value >=1), if so check whether this exceeds their availability.
-            for idx in empl_lineTime.index:
-                empl_line = idx[0]
-                time = idx[1]
-                if (empl_lineTime.loc[empl_line, time] >= 1).any(): # note the values are integers, since allocation is a binary.
-                    if not empl_lineTime.loc[empl_line, time].iloc[0] >= self.availability_df.loc[time, empl_line]: # Check whether the total allocations per empl_line per time exceeds their availability.
-                        requirement_failed = True 
-                        failed_combinations.append([empl_line, time]) # Add all (employee_line, time) combinations that exceed the availability.
+            # Check for all employee_line and time combinations whether any of these values has an allocation (value >=1), if so check whether this exceeds their availability.
+            allocations = empl_lineTime.iloc[:, 0].to_numpy() # note the values are integers, since allocation is a binary.
+            empl_line_codes = self.codes.encode('employee_line', empl_lineTime.index.get_level_values(0))
+            time_codes = self.codes.encode('time', empl_lineTime.index.get_level_values(1))
+            is_failed = (allocations >= 1) & ~(allocations >= self.availability_array[time_codes, empl_line_codes]) # Check whether the total allocations per empl_line per time exceeds their availability.
+
+            requirement_failed = is_failed.any()
+            failed_combinations = [list(idx) for idx in empl_lineTime.index[is_failed]] # All (employee_line, time) combinations that exceed the availability.
             
             if requirement_failed == True: # If there is an error in the inputted planning, return a error that indicates where these error lie. 
                 raise ValueError(f'"Empl_line should be available when planned" restriction not met in {name_planning}. \n The following combinations were the cause: \n\n {failed_combinations}. \n\n This means that for the above combinations, the planned employee or line is not available at the given time.')
 
-        def checkSkillForPlanning(self, planning_df: pd.DataFrame, name_planning: str):
+        def checkSkillForPlanning(self, planning_df: Union[pd.Series, Sparse_Planning], name_planning: str):
             """This check makes sure that there are no allocations where the employee_line is not skilled to perform the specific suborder.
 
             Args:
-                planning_df (pd.DataFrame): planning df from excel to check
+                planning_df (Union[pd.Series, Sparse_Planning]): planning from excel to check
                 name_planning (str): name of the planning (shown when an error happens to indicate where the problem lies)
 
             Raises:
                 ValueError: Indicates that a 'skill' error is present in the "name_planning", and reports for which records the errors are present.
             """
-            order_suborderEmpl_line_help = planning_df.copy().reset_index()
-            
             # Obtain the sum of allocations for each employeeline for each time.
-            order_suborderEmpl_line = self.group_df(order_suborderEmpl_line_help, 'order_suborder_vs_empl_line')
-
-            # For extracting the suborder for a unique order_suborder combination.
-            specific_order = self.specific_order_suborder_df
+            order_suborderEmpl_line = self.group_df(planning_df, 'order_suborder_vs_empl_line')
 
-            requirement_failed = False
-            failed_combinations = []
+            # The suborder for each order_suborder combination.
+            suborder_codes = self.suborder_code_array[self.codes.encode('order_suborder', order_suborderEmpl_line.index.get_level_values(0))]
+            empl_line_codes = self.codes.encode('employee_line', order_suborderEmpl_line.index.get_level_values(1))
 
-            # Loop through each employee and order_suborder to check whether any of these values violate the skill constraint.
-            for idx in order_suborderEmpl_line.index:
-                order_suborder = idx[0]
-                empl_line = idx[1]
-                suborder = specific_order.loc[order_suborder].iloc[1]
+            # Check for each employee and order_suborder whether the empl_line is skilled to perform the specific suborder.
+            allocations = order_suborderEmpl_line.iloc[:, 0].to_numpy()
+            is_failed = (self.skills_array[empl_line_codes, suborder_codes] == 0) & (allocations >= 1)
 
-                # Check whether the empl_line is skilled to perform a specific suborder.
-                if self.skills_df.loc[empl_line, suborder] == 0 and (order_suborderEmpl_line.loc[order_suborder, empl_line].iloc[0] >= 1).any():
-                    requirement_failed = True
-                    failed_combinations.append([order_suborder, empl_line]) # add the (order_suborder, employee_line) combinations that result in the errors.
+            requirement_failed = is_failed.any()
+            failed_combinations = [list(idx) for idx in order_suborderEmpl_line.index[is_failed]] # the (order_suborder, employee_line) combinations that result in the errors.
             
             if requirement_failed == True: # If there is an error in the inputted planning, return a error that indicates where these error lie. 
                 raise ValueError(f'"Empl_line should possess skills for planned suborder" restriction not met in {name_planning}. \n The following combinations were the cause: \n\n {failed_combinations}. \n\n This means that an employee is planned more than ones at a given moment. This could be due to being planned twice, once in manual_planning and once in the old_planning.')
@@ -233,77 +233,59 @@ class SolvabilityTest:
                 raise ValueError(f'"Hours planned per empl_line at given moment" restriction is not met in {name_planning}. \n The following combinations were the cause: \n\n {failed_combinations}. \n\n ')
 
         #FIXME: What if it is necessary to exceed it because of underestimation, how can one sucombe that?
-        def checkRequiredHoursPlannedUpperboundForPlanning(self, planning_df: pd.DataFrame, name_planning: str):
+        def checkRequiredHoursPlannedUpperboundForPlanning(self, planning_df: Union[pd.Series, Sparse_Planning], name_planning: str):
             """This check makes sure that the planning does not exceed the needed amount of hours upperbound. 
 
             Args:
-                planning_df (pd.DataFrame): planning df from excel to check
+                planning_df (Union[pd.Series, Sparse_Planning]): planning from excel to check
                 name_planning (str): name of the planning (shown when an error happens to indicate where the problem lies)
 
             Raises:
                 ValueError: Indicates that a 'required hours planned' error is present in the "name_planning", and reports for which records the errors are present.
             """
             # Possibly also add the old planning? because that is taken as an absolute aswell. 
-            hoursPlanned_help = planning_df.copy().reset_index()
-            
             # Obtain the sum of allocations for each employee_line for each time.
-            hoursPlanned = self.group_df(hoursPlanned_help, 'order_suborder_vs_allocation')
+            hoursPlanned = self.group_df(planning_df, 'order_suborder_vs_allocation')
             
-            requirement_failed = False
-            failed_combinations = []
-
-            # Loop through the different order_suborders and check the scheduled amount of hours vs the required.
-            for idx in hoursPlanned.index:
-                order_suborder = idx
-                upperbound = self.required_hours_df.loc[order_suborder].iloc[1]
-                hoursScheduled = hoursPlanned.loc[order_suborder]
-
-                if (hoursScheduled > upperbound).any(): # if the scheduled amount of hours is larger than the required amount, an error has occured.
-                    requirement_failed = True
-                    excess_hours = (hoursScheduled - upperbound).values.item()
-                    
-                    failed_combinations.append([order_suborder, f'X excess hours planned, with X={excess_hours}. There is a maximum of {upperbound} that can be scheduled.'])
+            # Check for the different order_suborders the scheduled amount of hours vs the required.
+            upperbounds = self.time_req_ub_array[self.codes.encode('order_suborder', hoursPlanned.index)]
+            hoursScheduled = hoursPlanned.iloc[:, 0].to_numpy()
+            is_failed = hoursScheduled > upperbounds # if the scheduled amount of hours is larger than the required amount, an error has occured.
+
+            requirement_failed = is_failed.any()
+            failed_combinations = [
+                [order_suborder, f'X excess hours planned, with X={excess_hours}. There is a maximum of {upperbound} that can be scheduled.']
+                for order_suborder, excess_hours, upperbound in zip(hoursPlanned.index[is_failed], (hoursScheduled - upperbounds)[is_failed].tolist(), upperbounds[is_failed])
+                ]
             
             if requirement_failed == True:
                 raise ValueError(f'"Hours planned for order_suborder less than or equal to upperbound" restriction is not met in {name_planning}. \n The following combinations were the cause: \n\n {failed_combinations}\n\n This means these orders are scheduled too many times, such that they have exceeded their required amount of hours.')
 
-        def checkSpecificLinesForPlanning(self, planning_df: pd.DataFrame, name_planning: str):
+        def checkSpecificLinesForPlanning(self, planning_df: Union[pd.Series, Sparse_Planning], name_planning: str):
             """This check makes sure that if an order_suborder must be performed on a specific line, that it will not be allocated to another. 
 
             Args:
-                planning_df (pd.DataFrame): planning df from excel to check
+                planning_df (Union[pd.Series, Sparse_Planning]): planning from excel to check
                 name_planning (str): name of the planning (shown when an error happens to indicate where the problem lies)
 
             Raises:
                 ValueError: Indicates that a 'specific line' error is present in the "name_planning", and reports for which records the errors are present.
             """
-            specificLinePlanned_help = planning_df.copy().reset_index()
-            
             # Obtain the sum of order_suborders planned for specific employee_lines
-            specificLinePlanned = self.group_df(specificLinePlanned_help, 'order_suborder_vs_empl_line')
-            group_cols = feasability_dfs.get('order_suborder_vs_empl_line')[1]
-            sum_col = feasability_dfs.get('order_suborder_vs_empl_line')[2]
-            specificLinePlanned: pd.DataFrame = specificLinePlanned_help.groupby(group_cols)[sum_col].sum()
+            specificLinePlanned = self.group_df(planning_df, 'order_suborder_vs_empl_line')
 
-            specific_line_df = self.specific_production_line
-            
-            requirement_failed = False
-            failed_combinations = []
-
-            # Loop through the (order_suborder, employee_line) combinations.
-            for idx in specificLinePlanned.index:
-                order_suborder = idx[0]
-                empl_line = idx[1]
-
-                if order_suborder in specific_line_df.index: # Check whether the order_suborder exists in the specific_line dataframe. That is, the order has a specific line on which it must be performed. 
-                    # if it does, obtain the specific line on which the order might need to be allocated.
-                    specific_line = specific_line_df.loc[order_suborder].iloc[0]
-                    if specific_line != '': 
-                        if specificLinePlanned.loc[order_suborder, empl_line].iloc[0] == 1: 
-                            if empl_line != specific_line: # If the empl_line is not equal to the required specific line
-                                requirement_failed = True
-
-                                failed_combinations.append([order_suborder, empl_line])
+            # Codes of the (order_suborder, employee_line) combinations. Order_suborders that are not in the index set have no specific line (-1), 
+            # employee_lines that are not in the index set are never equal to the specific line (-2).
+            order_suborder_codes = self.codes.encode('order_suborder', specificLinePlanned.index.get_level_values(0), missing_code=-1)
+            empl_line_codes = self.codes.encode('employee_line', specificLinePlanned.index.get_level_values(1), missing_code=-2)
+
+            # Check whether the order has a specific line on which it must be performed, and if so whether the planned empl_line is not equal to the required specific line.
+            has_specific_line = np.where(order_suborder_codes != -1, self.has_specific_line_array[order_suborder_codes], False)
+            specific_line_codes = self.specific_line_code_array[order_suborder_codes]
+            is_failed = has_specific_line & (specificLinePlanned.iloc[:, 0].to_numpy() == 1) & (empl_line_codes != specific_line_codes)
+
+            requirement_failed = is_failed.any()
+            failed_combinations = [list(idx) for idx in specificLinePlanned.index[is_failed]]
             
             if requirement_failed == True:
                 raise ValueError(f'"Specific line restriction" was not met in {name_planning}, The following combinations were the cause of the failed requirements: \n\n {failed_combinations}' )
@@ -312,11 +294,11 @@ class SolvabilityTest:
         # Testing restrictions for the model, which are not about the planning.
         def checkAvailabilityOfNumberOfHoursNeeded(self, planning_df: pd.DataFrame, name_planning: str): #FIXME: Add a way to get all the combinations that are possible, without 'counting' certain points double. That is, if someone does MAG, they cannot also preform SMD at that same moment => lower maximum per suborder. 
 
-            # create a df that gets the maximum amount of allocations per suborder
-            max_numberOfAllocationsPerSuborder_df = self.availability_df.dot(self.skills_df).sum(axis=0)
+            # create an array that gets the maximum amount of allocations per suborder (code), the (time, employee_line) combinations that are available and skilled.
+            max_numberOfAllocationsPerSuborder = self.feasibility.get_capacity_per_suborder()
 
             # the maximum of total allocations is:
-            max_numberOfAllocations = self.availability_df.sum(axis=0).sum(axis=0)
+            max_numberOfAllocations = self.feasibility.get_capacity()
 
             # find a way to make a list of not just the max per suborder, but for all possible combinations where employees are allocated once per time interval 
             allowedCombinationsList = []
@@ -335,11 +317,15 @@ class SolvabilityTest:
                 raise ValueError(f'"Hour availability in Planning" was not met in {name_planning}, The total sum of all required time intervals were the cause of the failed requirements')
 
             allowed = True
+            # Needed number of allocations per suborder (code)
+            reqTimePerSuborder_codes = np.zeros(self.codes.get_size('suborder'))
+            np.add.at(reqTimePerSuborder_codes, self.codes.encode('suborder', reqTimePerSuborder.index), reqTimePerSuborder.iloc[:, 0].to_numpy())
+
             # for combination in allowedCombinationsList:
-            for suborder in max_numberOfAllocationsPerSuborder_df.index:
+            for suborder_code, suborder in enumerate(self.codes.get_labels('suborder')):
                 if suborder != 'NONE':
                     # checks whether more time is required for a suborder than is possible in the given time ranges
-                    if max_numberOfAllocationsPerSuborder_df.loc[suborder] < reqTimePerSuborder.loc[suborder].iloc[0]:
+                    if max_numberOfAllocationsPerSuborder[suborder_code] < reqTimePerSuborder_codes[suborder_code]:
                         allowed = False
                         raise ValueError(f'"Hour availability in Planning" was not met in {name_planning}, The sum of all required time intervals were the cause of the failed requirements in the following suborder: {suborder}')
 
@@ -357,3 +343,26 @@ class SolvabilityTest:
 
         #Also add the check above, but then for people, such that needed planned hours per persion(that is specific_line) is enough. 
 
+        def checkFeasibleAllocationsOfHoursNeeded(self, planning_df: Union[pd.Series, Sparse_Planning], name_planning: str):
+            """This check makes sure that every order_suborder has enough feasible allocations for the lowerbound of its required time. An allocation is feasible if the
+            employee_line is available, skilled for the suborder and allowed to perform the order_suborder (line, employee or specific line), see Data_Feasibility.
+
+            Args:
+                planning_df (Union[pd.Series, Sparse_Planning]): planning from excel to check
+                name_planning (str): name of the planning (shown when an error happens to indicate where the problem lies)
+
+            Raises:
+                ValueError: Indicates that an order_suborder requires more hours than it has feasible allocations, and reports for which order_suborders.
+            """
+            # Number of feasible (time, employee_line) combinations per order_suborder (code).
+            capacities = self.feasibility.get_capacity_per_order_suborder()
+            is_failed = self.time_req_lb_array > capacities
+
+            requirement_failed = is_failed.any()
+            failed_combinations = [
+                [order_suborder, f'{required_hours} hours required, while there are only {capacity} feasible allocations.']
+                for order_suborder, required_hours, capacity in zip(self.codes.get_labels('order_suborder')[is_failed], self.time_req_lb_array[is_failed].tolist(), capacities[is_failed].tolist())
+                ]
+
+            if requirement_failed == True:
+                raise ValueError(f'"Feasible allocations for required hours" was not met in {name_planning}, The following order_suborders were the cause of the failed requirements: \n\n {failed_combinations}')
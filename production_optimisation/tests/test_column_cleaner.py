@@ -0,0 +1,60 @@
+"""Tests of the column-wise cleaning (data/column_cleaner.py) against the element-wise cleaning rules it replaces.
+
+The cleaned columns should be identical to those of .apply() with the element-wise rules, including their dtype.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.column_cleaner import Column_Cleaner
+
+timestamp = pd.Timestamp('2023-08-21 08:00:00')
+columns = {
+    'text': pd.Series(['mag', 'Smd', '', 'MONT']),
+    'mixed': pd.Series(['mag', 1.0, 2.5, None, '', 0, timestamp, np.nan], dtype=object),
+    'int': pd.Series([0, 1, 2]),
+    'float': pd.Series([1.0, np.nan, 0.0]),
+    'timestamp': pd.Series([timestamp, pd.NaT]),
+    'empty': pd.Series([], dtype=object),
+}
+
+
+# HELPER FUNCTIONS
+def uppercase_strings_element(element):
+    if isinstance(element, str):
+        return element.upper()
+    return element
+
+def clean_orders_element(element):
+    if element and pd.notna(element):
+        return uppercase_strings_element(element)
+    return None
+
+def clean_index_sets_element(element):
+    if element:
+        if pd.notna(element) and isinstance(element, str):
+            return element.upper()
+        elif pd.notna(element) and isinstance(element, pd.Timestamp):
+            return element
+        elif pd.notna(element) and isinstance(element, float):
+            return int(element)
+    else:
+        return element
+
+
+### TESTS
+@pytest.mark.parametrize('column', columns.keys())
+@pytest.mark.parametrize('clean_column, clean_element', [
+    (Column_Cleaner.uppercase_strings, uppercase_strings_element),
+    (Column_Cleaner.clean_orders_column, clean_orders_element),
+    (Column_Cleaner.clean_index_sets_column, clean_index_sets_element),
+    ])
+def test_column_is_cleaned_like_the_elements(column, clean_column, clean_element):
+    series = columns[column]
+
+    pd.testing.assert_series_equal(clean_column(series), series.apply(clean_element))
+
+def test_index_sets_dataframe_is_cleaned_like_the_elements():
+    index_sets = pd.DataFrame({'order_suborder': ['51124_mag', '51124_smd', ''], 'time': [timestamp, '', ''], 'number': [1.0, np.nan, 3.0]})
+
+    pd.testing.assert_frame_equal(Column_Cleaner.clean_index_sets_dataframe(index_sets), index_sets.applymap(clean_index_sets_element))
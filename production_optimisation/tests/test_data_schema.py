@@ -0,0 +1,108 @@
+"""Tests of typing the read sheets with a SheetSchema (data/data_schema.py) and of filling the empty cells of a Dataframe afterwards.
+
+An empty cell of a typed column stays missing (NaN, <NA> or NaT), a value that does not fit the dtype of its column raises a ValueError.
+"""
+import types
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.dataframe import Dataframe
+from data.data_schema import SheetSchema
+from general_configuration import dfs
+
+schema = SheetSchema(
+    dtypes={'text': 'object', 'category': 'category', 'int': 'int32', 'nullable_int': 'Int32', 'float': 'float64', 'date': 'datetime64[ns]'}
+    )
+
+
+# HELPER FUNCTION
+def create_sheet(**columns) -> pd.DataFrame:
+    """Creates a sheet like pandas reads it, where the empty cells are missing (NaN).
+    """
+    return pd.DataFrame(columns, dtype=object).infer_objects()
+
+
+### TESTS
+def test_empty_cells_per_dtype():
+    sheet = create_sheet(
+        text=['a', np.nan], category=['A', np.nan], int=[1, np.nan], nullable_int=[1, np.nan], float=[1.5, np.nan],
+        date=[pd.Timestamp('2023-08-21'), np.nan]
+        )
+
+    typed_sheet = schema.apply(sheet, fill_value='')
+
+    assert typed_sheet.dtypes.astype(str).to_dict() == {
+        'text': 'object', 'category': 'category', 'int': 'int32', 'nullable_int': 'Int32', 'float': 'float64', 'date': 'datetime64[ns]'
+        }
+    assert typed_sheet['text'].to_list() == ['a', '']
+    assert typed_sheet['category'].to_list() == ['A', '']
+    assert typed_sheet['int'].to_list() == [1, 0]
+    assert typed_sheet['nullable_int'][0] == 1 and typed_sheet['nullable_int'][1] is pd.NA
+    assert typed_sheet['float'][0] == 1.5 and np.isnan(typed_sheet['float'][1])
+    assert typed_sheet['date'][0] == pd.Timestamp('2023-08-21') and typed_sheet['date'][1] is pd.NaT
+
+def test_empty_strings_are_empty_cells():
+    sheet = create_sheet(int=[''], nullable_int=[''], float=[''], date=[''])
+
+    typed_sheet = SheetSchema(dtypes=schema.dtypes).apply(sheet)
+
+    assert typed_sheet['int'][0] == 0
+    assert typed_sheet['nullable_int'][0] is pd.NA
+    assert np.isnan(typed_sheet['float'][0])
+    assert typed_sheet['date'][0] is pd.NaT
+
+def test_nullable_int_column_with_text_is_kept_as_read():
+    sheet = create_sheet(nullable_int=[51124, 'A123', np.nan])
+
+    typed_sheet = SheetSchema(dtypes={'nullable_int': 'Int32'}).apply(sheet)
+
+    assert typed_sheet['nullable_int'].dtype == object
+    assert typed_sheet['nullable_int'][:2].to_list() == [51124, 'A123']
+
+@pytest.mark.parametrize('dtype', ['int32', 'Int32'])
+def test_no_whole_number_raises(dtype):
+    with pytest.raises(ValueError):
+        SheetSchema(dtypes={'column': dtype}).apply(create_sheet(column=[1, 1.5]))
+
+@pytest.mark.parametrize('dtype', ['int32', 'float64'])
+def test_text_in_number_column_raises(dtype):
+    with pytest.raises(ValueError):
+        SheetSchema(dtypes={'column': dtype}).apply(create_sheet(column=[1, 'one']))
+
+def test_bad_date_raises():
+    sheet = create_sheet(Date_deadline=[pd.Timestamp('2023-08-21'), '21-08-2023 x'])
+
+    with pytest.raises(ValueError, match='Date_deadline'):
+        SheetSchema(dtypes={'Date_deadline': 'datetime64[ns]'}).apply(sheet)
+
+def test_uppercase_and_keep_case():
+    sheet = create_sheet(Sub_order=['mag', np.nan], Description=['Keep this', np.nan])
+
+    typed_sheet = SheetSchema(uppercase=True, keep_case=['Description']).apply(sheet, fill_value='')
+
+    assert typed_sheet['Sub_order'].to_list() == ['MAG', '']
+    assert typed_sheet['Description'].to_list() == ['Keep this', '']
+
+def test_changed_dataframe_keeps_the_empty_cells_of_typed_columns():
+    orders_sheet_name = dfs['orders_df'][0]
+    orders_df = Dataframe(types.SimpleNamespace(io=None), orders_sheet_name, orders_sheet_name)
+    sheet = create_sheet(
+        Unique_Code=['51124_MAG', '51124_SMD'], Sub_order=['MAG', np.nan], On_line=[1, np.nan], Revenue=[np.nan, 100.0],
+        Manual_urgency=[np.nan, 1], Date_deadline=[pd.Timestamp('2023-08-21'), np.nan]
+        )
+
+    orders_df.change_pandas_dataframe(orders_df.schema.apply(sheet))
+    changed_sheet = orders_df.get_pandas_dataframe()
+
+    assert changed_sheet['Sub_order'].to_list() == ['MAG', '']
+    assert np.isnan(changed_sheet['On_line'][1]) and np.isnan(changed_sheet['Revenue'][0])
+    assert changed_sheet['Manual_urgency'][0] is pd.NA
+    assert changed_sheet['Date_deadline'][1] is pd.NaT
+
+def test_changed_dataframe_without_schema_is_filled():
+    dataframe = Dataframe(types.SimpleNamespace(io=None), 'penalty', None)
+
+    dataframe.change_pandas_dataframe(pd.DataFrame({'column': [1.0, np.nan]}))
+
+    assert dataframe.get_pandas_dataframe()['column'].to_list() == [1.0, 2.0]
@@ -0,0 +1,78 @@
+"""Tests of combining the old and manual planning (Data_Builder.build_old_and_manual_planning_df and CombinedPlanningDataframe.build).
+
+Every combination of the old and manual planning is kept, and a combination that is in both plannings gets the manual allocation. Combining used
+to drop duplicate allocation values instead of duplicate combinations, so two manual allocations of 1 (like PERS1 and PERS2 in the example workbook)
+became one.
+"""
+import types
+import pandas as pd
+
+from data.dataframe import Dataframe
+from data.dataframes import Dataframes
+from data.data_builder import Data_Builder
+from data.data import CombinedPlanningDataframe
+
+index_names = ['order_suborder', 'time', 'empl_line']
+first_time = pd.Timestamp('2023-08-21 08:00:00')
+after_limit = pd.Timestamp('2023-08-22 08:00:00') # After the old_planning_limit (21-08-2023 14:00:00).
+
+
+# HELPER FUNCTION
+def create_planning(allocations: list) -> pd.Series:
+    """Creates a planning from (order_suborder, time, empl_line, allocation) tuples, like the plannings that are read.
+    """
+    index = pd.MultiIndex.from_tuples([allocation[:3] for allocation in allocations], names=index_names)
+    return pd.Series([allocation[3] for allocation in allocations], index=index, name='allocation', dtype='float64')
+
+def build_old_and_manual_planning(old_planning: pd.Series, manual_planning: pd.Series) -> pd.Series:
+    excel_file = types.SimpleNamespace(io=None) # The plannings are not read, only their name is used.
+    dataframes = []
+    for name, planning in [('manual_planning_df', manual_planning), ('old_planning_df', old_planning)]:
+        dataframe = Dataframe(excel_file, name, None)
+        dataframe.change_pandas_dataframe(planning)
+        dataframes.append(dataframe)
+    dataframes_class = Dataframes(dataframes)
+
+    Data_Builder(dataframes_class).build_old_and_manual_planning_df()
+    return dataframes_class.get_dataframe_by_name('old_and_manual_planning_df').get_pandas_dataframe()
+
+def build_combined_planning(old_planning: pd.Series, manual_planning: pd.Series) -> pd.Series:
+    plannings = {'OldPlanningDF': old_planning, 'ManualPlanningDF': manual_planning}
+    managerDF = types.SimpleNamespace(
+        get_Dataframe=lambda dfs_to_get: [types.SimpleNamespace(pandas_Dataframe=plannings[name]) for name in dfs_to_get]
+        )
+    combined_planning = CombinedPlanningDataframe(None, 'CombinedPlanningDF', _bool_read_df=False, _bool_build_df=True)
+    combined_planning.build(managerDF)
+    return combined_planning.pandas_Dataframe
+
+
+### TESTS
+def test_every_manual_allocation_is_kept():
+    manual_planning = create_planning([('51124_MAG', first_time, 'PERS1', 1.0), ('51124_MAG', first_time, 'PERS2', 1.0)])
+    old_planning = create_planning([('51124_MAG', first_time, 'PERS1', 1.0), ('51124_MAG', first_time, 'PERS2', 1.0)])
+
+    for combined_planning in [build_old_and_manual_planning(old_planning, manual_planning), build_combined_planning(old_planning, manual_planning)]:
+        assert isinstance(combined_planning, pd.Series)
+        assert combined_planning.to_dict() == {('51124_MAG', first_time, 'PERS1'): 1.0, ('51124_MAG', first_time, 'PERS2'): 1.0}
+
+def test_manual_allocation_has_priority():
+    manual_planning = create_planning([('51124_MAG', first_time, 'PERS1', 0.0)])
+    old_planning = create_planning([('51124_MAG', first_time, 'PERS1', 1.0), ('51124_SMD', first_time, 'PERS3', 1.0)])
+
+    for combined_planning in [build_old_and_manual_planning(old_planning, manual_planning), build_combined_planning(old_planning, manual_planning)]:
+        assert combined_planning.to_dict() == {('51124_MAG', first_time, 'PERS1'): 0.0, ('51124_SMD', first_time, 'PERS3'): 1.0}
+
+def test_old_allocations_after_the_limit_are_left_out():
+    manual_planning = create_planning([('51124_MAG', after_limit, 'PERS1', 1.0)])
+    old_planning = create_planning([('51124_MAG', first_time, 'PERS2', 1.0), ('51124_SMD', after_limit, 'PERS3', 1.0)])
+
+    for combined_planning in [build_old_and_manual_planning(old_planning, manual_planning), build_combined_planning(old_planning, manual_planning)]:
+        assert combined_planning.to_dict() == {('51124_MAG', after_limit, 'PERS1'): 1.0, ('51124_MAG', first_time, 'PERS2'): 1.0}
+
+def test_empty_plannings():
+    empty_planning = create_planning([])
+    manual_planning = create_planning([('51124_MAG', first_time, 'PERS1', 1.0)])
+
+    assert build_old_and_manual_planning(empty_planning, empty_planning).empty
+    assert build_old_and_manual_planning(empty_planning, manual_planning).to_dict() == {('51124_MAG', first_time, 'PERS1'): 1.0}
+    assert build_old_and_manual_planning(manual_planning, empty_planning).to_dict() == {('51124_MAG', first_time, 'PERS1'): 1.0}
@@ -0,0 +1,65 @@
+"""Tests of the positions of the time intervals in a Time_Grid (data/data_time_grid.py) and in the 'time' index set of the Index_Catalog.
+
+The slices and cut points of the grid should give the same time intervals as comparing every time interval, like the model did before (t < j, t <= j),
+for a regular grid (every hour) and for an irregular grid (working hours, with a gap overnight), and whatever the order of the given time intervals.
+"""
+import pandas as pd
+import pytest
+
+from data.data_time_grid import Time_Grid
+from data.data_index_catalog import Index_Catalog
+
+regular_times = pd.date_range('2023-08-21 08:00:00', periods=10, freq='H')
+irregular_times = pd.date_range('2023-08-21 08:00:00', periods=5, freq='H').append(pd.date_range('2023-08-22 08:00:00', periods=5, freq='H'))
+grids = {'regular': regular_times, 'irregular': irregular_times}
+
+
+### TESTS
+@pytest.mark.parametrize('times', grids.values(), ids=grids.keys())
+def test_slices_are_the_compared_times(times):
+    grid = Time_Grid.from_times(times)
+
+    for time in times:
+        assert grid.get_times_before(time) == [t for t in times if t < time]
+        assert grid.get_times_before(time, inclusive=True) == [t for t in times if t <= time]
+        assert grid.get_times_after(time) == [t for t in times if t > time]
+        assert grid.get_times_after(time, inclusive=True) == [t for t in times if t >= time]
+        assert grid.get_position(time) == times.get_loc(time)
+
+@pytest.mark.parametrize('times', grids.values(), ids=grids.keys())
+def test_cuts_are_the_number_of_compared_times(times):
+    grid = Time_Grid.from_times(times)
+    cut_times = [times[0] - pd.Timedelta(hours=1), times[2], times[2] + pd.Timedelta(minutes=30), pd.Timestamp('2023-08-21 20:00:00'), times[-1] + pd.Timedelta(days=1)]
+
+    assert grid.get_cuts(cut_times, side='left').tolist() == [sum(t < cut_time for t in times) for cut_time in cut_times]
+    assert grid.get_cuts(cut_times, side='right').tolist() == [sum(t <= cut_time for t in times) for cut_time in cut_times]
+    assert [grid.get_cut(cut_time) for cut_time in cut_times] == grid.get_cuts(cut_times).tolist()
+
+def test_frequency_of_the_grid():
+    assert Time_Grid.from_times(regular_times).step == pd.Timedelta(hours=1)
+    assert Time_Grid.from_times(irregular_times).step is None
+
+    with pytest.raises(KeyError):
+        Time_Grid.from_times(regular_times).get_position(regular_times[0] + pd.Timedelta(minutes=30))
+
+def test_old_planning_limit():
+    grid = Time_Grid.from_times(irregular_times, old_planning_limit='21-08-2023 14:00:00')
+
+    assert grid.old_planning_end == 5
+    assert [grid.is_in_old_planning(time) for time in irregular_times] == [time <= pd.Timestamp('2023-08-21 14:00:00') for time in irregular_times]
+
+@pytest.mark.parametrize('times', grids.values(), ids=grids.keys())
+def test_unsorted_times_are_sorted(times):
+    unsorted_times = times[::-1].to_list()
+
+    grid = Time_Grid.from_times(unsorted_times)
+    catalog = Index_Catalog.from_index_sets({'time': unsorted_times})
+
+    assert grid.time_list == times.to_list()
+    assert catalog.get_index_set('time') == times.to_list()
+    assert catalog.time_grid.time_list == catalog.get_index_set('time')
+    assert [catalog.get_position('time', time) for time in times] == [catalog.time_grid.get_position(time) for time in times]
+
+def test_duplicate_times_raise():
+    with pytest.raises(ValueError):
+        Time_Grid.from_times(regular_times.append(regular_times[:1]))